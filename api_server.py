@@ -0,0 +1,489 @@
+"""
+API JSON (HEADLESS)
+HTTP server ringan (stdlib, tanpa dependensi tambahan) untuk integrasi
+portal mitra: parsing CV, mapping PON (top-k & batch), soal asesmen,
+penilaian, dan pencocokan lowongan.
+
+Memakai modul & cache yang sama dengan UI Streamlit: index PON per proses
+(load_pon_index), MAPPING_CACHE, automaton skill, cache sheet, dan
+session Gemini bersama. Tanpa rerun script, jadi overhead per request kecil.
+
+Endpoint:
+    GET  /health                 status & index yang siap
+    GET  /metrics                metrik format Prometheus
+    POST /v1/parse-cv            {"text"} | {"file_base64","filename"} | body PDF/DOCX mentah
+    POST /v1/map                 {"cv_text"|"profile_text"|"talent_id", "top_k", "metode"}
+                                 batch: {"profiles": [cv_text | {"cv_text"|"profile_text"|"talent_id"}, ...],
+                                         "top_k", "metode"}
+    POST /v1/questions           {"okupasi_id", "jumlah", "deadline_s"} -> question_set_id + soal (tanpa kunci) + sumber
+    POST /v1/grade               {"question_set_id"|"questions", "answers": {"q1": "..."}}
+    POST /v1/match-vacancies     {"cv_text"|"profile_text", "top_k"}
+
+Jalankan:
+    python api_server.py --port 8600
+    DTP_API_TOKEN=rahasia python api_server.py   # wajib header Authorization: Bearer rahasia
+"""
+
+import argparse
+import base64
+import hmac
+import io
+import json
+import secrets
+import socket
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import metrics
+from config import (
+    API_TOKEN, EXCEL_PATH, GEMINI_DEADLINE_ASESMEN, GEMINI_MAX_WAIT_ASESMEN, JUMLAH_SOAL, SHEET_LOWONGAN,
+    SHEET_PON, SOAL_LATENCY_BUDGET
+)
+
+# Batas ukuran request
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH = 10_000
+MAX_TOP_K = 50
+MAX_SOAL = 50
+
+# Jumlah set soal yang disimpan untuk /v1/grade
+QUESTION_STORE_SIZE = 10_000
+
+METODE_DEFAULT = "tfidf"
+
+MIME_PDF = "application/pdf"
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class ApiError(Exception):
+    """Error yang dikembalikan ke klien apa adanya, dengan status HTTP"""
+
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class QuestionStore:
+    """Set soal terakhir (LRU) beserta kunci jawaban, supaya kunci tidak dikirim ke klien"""
+
+    def __init__(self, max_entries=QUESTION_STORE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, okupasi_id, questions):
+        set_id = secrets.token_urlsafe(12)
+        with self._lock:
+            self._entries[set_id] = {"okupasi_id": okupasi_id, "questions": questions}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return set_id
+
+    def get(self, set_id):
+        with self._lock:
+            return self._entries.get(set_id)
+
+
+QUESTION_STORE = QuestionStore()
+
+
+# ========================================
+# HELPER
+# ========================================
+def _json_default(obj):
+    # Skalar numpy / Timestamp dari sheet
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+def _field(body, nama, tipe=str, wajib=True, default=None):
+    nilai = body.get(nama, default)
+    if nilai is None:
+        if wajib:
+            raise ApiError(400, f"Field '{nama}' wajib diisi")
+        return default
+    if not isinstance(nilai, tipe) or (isinstance(nilai, bool) and tipe is not bool):
+        raise ApiError(400, f"Field '{nama}' harus bertipe {tipe.__name__}")
+    return nilai
+
+
+def _top_k(body, default=1):
+    top_k = _field(body, "top_k", int, wajib=False, default=default)
+    if not 1 <= top_k <= MAX_TOP_K:
+        raise ApiError(400, f"top_k harus 1..{MAX_TOP_K}")
+    return top_k
+
+
+def _profile_text(body):
+    """
+    profile_text apa adanya, atau cv_text / profil lengkap talent_id (CV + pendidikan,
+    pekerjaan, skill dari profile_join) diubah lewat extract_profile_entities
+    """
+    from cv_parser import extract_profile_entities
+    from profile_join import store_document
+    from profile_store import get_profile_store
+
+    if body.get("profile_text") is not None:
+        return _field(body, "profile_text")
+    if body.get("talent_id") is not None:
+        dokumen = store_document(get_profile_store(), _field(body, "talent_id"))
+        if dokumen is None:
+            raise ApiError(404, "talent_id tidak ditemukan")
+        return extract_profile_entities(dokumen, EXCEL_PATH)
+    return extract_profile_entities(_field(body, "cv_text"), EXCEL_PATH)
+
+
+def _index(metode):
+    from pon_index import METODE_MAPPING, load_pon_index
+
+    if metode not in METODE_MAPPING:
+        raise ApiError(400, f"metode harus salah satu dari {sorted(METODE_MAPPING)}")
+    # Perubahan sheet PON ikut diterapkan (index hashing: delta per baris)
+    return load_pon_index(EXCEL_PATH, metode)
+
+
+def _okupasi(index, hasil):
+    rows = []
+    for okupasi_id, skor in hasil:
+        row = index.row_for(okupasi_id)
+        rows.append({
+            "okupasi_id": okupasi_id,
+            "okupasi": None if row is None else row.get("Okupasi"),
+            "skor": round(float(skor), 6),
+        })
+    return rows
+
+
+# ========================================
+# HANDLER ENDPOINT
+# ========================================
+def handle_health(_body):
+    from pon_index import loaded_indexes
+
+    from gemini_client import get_limiter
+
+    return {
+        "status": "ok",
+        "dataset": EXCEL_PATH,
+        "index_siap": sorted(metode for _, metode in loaded_indexes()),
+        "gemini": get_limiter().status(),
+    }
+
+
+def handle_parse_cv(body):
+    from cv_parser import extract_profile_entities, extract_text_from_docx, extract_text_from_pdf, parse_cv_data
+    from skill_extractor import load_skill_extractor
+
+    if "_raw" in body:
+        data, jenis = body["_raw"], body["_mime"]
+    elif body.get("file_base64") is not None:
+        try:
+            data = base64.b64decode(_field(body, "file_base64"), validate=True)
+        except ValueError:
+            raise ApiError(400, "file_base64 tidak valid")
+        nama_file = _field(body, "filename", wajib=False, default="").lower()
+        jenis = MIME_DOCX if nama_file.endswith(".docx") else MIME_PDF
+    else:
+        data, jenis = None, None
+
+    if data is None:
+        teks = _field(body, "text")
+    else:
+        try:
+            ekstrak = extract_text_from_docx if jenis == MIME_DOCX else extract_text_from_pdf
+            teks = ekstrak(io.BytesIO(data))
+        except Exception as e:
+            raise ApiError(422, f"Gagal membaca dokumen: {e}")
+
+    hasil = parse_cv_data(teks)
+    if not body.get("include_text"):
+        hasil.pop("full_text", None)
+    hasil["profile_text"] = extract_profile_entities(teks, EXCEL_PATH)
+    hasil["skills"] = load_skill_extractor(EXCEL_PATH).extract(teks)
+    return hasil
+
+
+def handle_map(body):
+    from pon_index import MAPPING_CACHE
+    from skill_extractor import load_skill_extractor, skill_gap
+
+    index = _index(_field(body, "metode", wajib=False, default=METODE_DEFAULT))
+
+    # Batch: satu transform + similarity untuk semua profil, tanpa cache per profil.
+    # Tiap profil diproses sama seperti mapping tunggal (string = cv_text).
+    if body.get("profiles") is not None:
+        profiles = _field(body, "profiles", list)
+        if len(profiles) > MAX_BATCH:
+            raise ApiError(400, f"Maksimal {MAX_BATCH} profil per batch")
+        if not all(isinstance(p, (str, dict)) for p in profiles):
+            raise ApiError(400, "profiles harus list of string / objek")
+        top_k = _top_k(body)
+        profiles = [_profile_text({"cv_text": p} if isinstance(p, str) else p) for p in profiles]
+        df_pon, ids = index.df_pon, index.okupasi_ids
+        nama = df_pon['Okupasi'].to_numpy() if 'Okupasi' in df_pon.columns else ids
+        hasil = index.search_batch(profiles, top_k) if profiles else []
+        return {
+            "metode": index.metode,
+            "version": index.version,
+            "results": [
+                [{"okupasi_id": ids[i], "okupasi": nama[i], "skor": round(s, 6)} for i, s in baris]
+                for baris in hasil
+            ],
+        }
+
+    profile_text = _profile_text(body)
+    top_k = _top_k(body)
+    hasil = MAPPING_CACHE.lookup(index, profile_text, top_k=top_k)
+    metrics.record_startup("first_mapping")
+    results = _okupasi(index, hasil)
+    pon_row = index.row_for(results[0]["okupasi_id"]) if results else None
+    if pon_row is not None:
+        results[0]["skill_gap"] = skill_gap(load_skill_extractor(EXCEL_PATH), pon_row, profile_text)
+    return {"metode": index.metode, "version": index.version, "results": results}
+
+
+def handle_questions(body):
+    from assessment import generate_questions
+    from data_loader import read_sheet_cached
+    from gemini_client import Deadline, DeadlineExceeded, RateLimitExceeded
+
+    okupasi_id = _field(body, "okupasi_id")
+    jumlah = _field(body, "jumlah", int, wajib=False, default=JUMLAH_SOAL)
+    if not 1 <= jumlah <= MAX_SOAL:
+        raise ApiError(400, f"jumlah harus 1..{MAX_SOAL}")
+    # Deadline dari klien (detik), dibatasi deadline server
+    batas = body.get("deadline_s", GEMINI_DEADLINE_ASESMEN)
+    if isinstance(batas, bool) or not isinstance(batas, (int, float)) or batas <= 0:
+        raise ApiError(400, "Field 'deadline_s' harus angka > 0")
+    deadline = Deadline(min(batas, GEMINI_DEADLINE_ASESMEN))
+
+    df_pon = read_sheet_cached(EXCEL_PATH, SHEET_PON)
+    pon_data = df_pon[df_pon['OkupasiID'] == okupasi_id]
+    if pon_data.empty:
+        raise ApiError(404, f"Okupasi {okupasi_id} tidak ditemukan")
+
+    try:
+        questions, sumber = generate_questions(
+            pon_data.iloc[0], jumlah, max_wait=GEMINI_MAX_WAIT_ASESMEN, budget=SOAL_LATENCY_BUDGET,
+            deadline=deadline,
+        )
+    except DeadlineExceeded as e:
+        raise ApiError(504, f"Gagal generate soal sebelum deadline: {e}")
+    except RateLimitExceeded as e:
+        raise ApiError(503, str(e), retry_after=max(1, round(e.eta)))
+    except Exception as e:
+        raise ApiError(502, f"Gagal generate soal: {e}")
+
+    set_id = QUESTION_STORE.put(okupasi_id, questions)
+    tampil = questions if body.get("include_answers") else [
+        {k: v for k, v in q.items() if k != "jawaban_benar"} for q in questions
+    ]
+    return {"question_set_id": set_id, "okupasi_id": okupasi_id, "sumber": sumber, "questions": tampil}
+
+
+def handle_grade(body):
+    from assessment import validate_assessment
+
+    answers = _field(body, "answers", dict)
+    if body.get("question_set_id") is not None:
+        entry = QUESTION_STORE.get(_field(body, "question_set_id"))
+        if entry is None:
+            raise ApiError(404, "question_set_id tidak dikenal atau sudah kedaluwarsa")
+        questions = entry["questions"]
+    else:
+        questions = _field(body, "questions", list)
+        if not all(isinstance(q, dict) and "id" in q and "jawaban_benar" in q for q in questions):
+            raise ApiError(400, "Setiap soal wajib punya 'id' dan 'jawaban_benar'")
+
+    skor, level = validate_assessment(answers, questions)
+    detail = [{"id": q["id"], "benar": answers.get(q["id"]) == q["jawaban_benar"]} for q in questions]
+    return {
+        "skor": skor,
+        "level": level,
+        "benar": sum(d["benar"] for d in detail),
+        "total": len(questions),
+        "detail": detail,
+    }
+
+
+def handle_match_vacancies(body):
+    from data_loader import read_sheet_cached
+    from skill_extractor import load_skill_extractor, match_vacancies
+
+    cv_text = body.get("cv_text") if body.get("cv_text") is not None else _field(body, "profile_text")
+    if not isinstance(cv_text, str):
+        raise ApiError(400, "cv_text harus string")
+    df_lowongan = read_sheet_cached(EXCEL_PATH, SHEET_LOWONGAN)
+    matches = match_vacancies(load_skill_extractor(EXCEL_PATH), df_lowongan, cv_text, top_k=_top_k(body, 3))
+    return {
+        "results": [
+            {"lowongan": row, "skor": round(skor, 4), "skill_cocok": cocok, "skill_kurang": kurang}
+            for row, skor, cocok, kurang in matches
+        ]
+    }
+
+
+ROUTES = {
+    ("GET", "/health"): ("health", handle_health),
+    ("POST", "/v1/parse-cv"): ("parse_cv", handle_parse_cv),
+    ("POST", "/v1/map"): ("map", handle_map),
+    ("POST", "/v1/questions"): ("questions", handle_questions),
+    ("POST", "/v1/grade"): ("grade", handle_grade),
+    ("POST", "/v1/match-vacancies"): ("match_vacancies", handle_match_vacancies),
+}
+
+
+# ========================================
+# SERVER
+# ========================================
+class ApiHandler(BaseHTTPRequestHandler):
+    # Keep-alive: klien batch memakai ulang koneksi
+    protocol_version = "HTTP/1.1"
+    server_version = "DTP-API/1.0"
+    quiet = False
+
+    def setup(self):
+        super().setup()
+        # Header & body ditulis terpisah; tanpa NODELAY tiap respons keep-alive tertahan ~40 ms
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload, content_type="application/json; charset=utf-8", headers=None):
+        if isinstance(payload, (dict, list)):
+            data = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        else:
+            data = payload.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for nama, nilai in (headers or {}).items():
+            self.send_header(nama, nilai)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+        metrics.incr(f"api.status.{status}")
+
+    def _authorized(self):
+        if not API_TOKEN:
+            return True
+        header = self.headers.get("Authorization", "")
+        token = header[7:] if header.startswith("Bearer ") else ""
+        return hmac.compare_digest(token, API_TOKEN)
+
+    def _read_body(self):
+        header = self.headers.get("Content-Length")
+        if header is None:
+            # Tanpa panjang (mis. Transfer-Encoding: chunked) body tidak bisa dibatasi sebelum dibaca
+            raise ApiError(411, "Header Content-Length wajib diisi")
+        try:
+            panjang = int(header)
+        except ValueError:
+            raise ApiError(400, "Header Content-Length tidak valid")
+        if panjang < 0:
+            raise ApiError(400, "Header Content-Length tidak valid")
+        if panjang > MAX_BODY_BYTES:
+            raise ApiError(413, f"Body melebihi {MAX_BODY_BYTES // (1024 * 1024)} MB")
+        data = self.rfile.read(panjang) if panjang else b""
+        if len(data) < panjang:
+            raise ApiError(400, "Body terpotong (kurang dari Content-Length)")
+        jenis = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if jenis in (MIME_PDF, MIME_DOCX):
+            return {"_raw": data, "_mime": jenis}
+        if not data:
+            return {}
+        try:
+            body = json.loads(data)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ApiError(400, f"JSON tidak valid: {e}")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Body harus objek JSON")
+        return body
+
+    def _reject(self, status, message):
+        # Body request belum dibaca: tutup koneksi supaya tidak terbaca sebagai request berikutnya
+        self.close_connection = True
+        self._send(status, {"error": message})
+
+    def _dispatch(self, method):
+        path = urlparse(self.path).path.rstrip("/") or "/"
+
+        if method == "GET" and path == "/metrics":
+            if not self._authorized():
+                return self._reject(401, "Token tidak valid")
+            return self._send(200, metrics.prometheus_text(), "text/plain; version=0.0.4; charset=utf-8")
+
+        route = ROUTES.get((method, path))
+        if route is None:
+            known = {p for _, p in ROUTES}
+            return self._reject(405 if path in known else 404, f"{method} {path} tidak tersedia")
+        nama, handler = route
+
+        if nama != "health" and not self._authorized():
+            return self._reject(401, "Token tidak valid")
+
+        try:
+            with metrics.timer(f"api.{nama}"):
+                try:
+                    body = self._read_body() if method == "POST" else {}
+                except ApiError as e:
+                    # Body ditolak / tidak utuh: sisa body jangan terbaca sebagai request berikutnya
+                    return self._reject(e.status, str(e))
+                hasil = handler(body)
+        except ApiError as e:
+            headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
+            return self._send(e.status, {"error": str(e)}, headers=headers)
+        except Exception as e:
+            self.log_error("Error %s: %r", path, e)
+            return self._send(500, {"error": f"Internal error: {e}"})
+        return self._send(200, hasil)
+
+
+def make_server(host="127.0.0.1", port=8600, quiet=False):
+    handler = type("Handler", (ApiHandler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--metode", nargs="+", default=[METODE_DEFAULT], choices=["tfidf", "lsa", "hashing"],
+                        help="Index PON yang disiapkan saat start (default: tfidf)")
+    parser.add_argument("--no-warmup", action="store_true", help="Langsung serve; cache diisi saat request pertama")
+    parser.add_argument("--quiet", action="store_true", help="Tanpa log per request")
+    args = parser.parse_args()
+
+    if not args.no_warmup:
+        from warmup import APP_MODULES, HEAVY_MODULES, warmup
+
+        modules = tuple(m for m in HEAVY_MODULES if m != "streamlit") + APP_MODULES
+        warmup(EXCEL_PATH, tuple(args.metode), modules=modules)
+
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"API siap di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+ASESMEN KOMPETENSI
+Prompt & parsing soal dari Gemini, pembersihan JSON respons AI,
+dan penilaian jawaban asesmen.
+
+Tanpa ketergantungan ke Streamlit, supaya bisa dipakai halaman,
+benchmark, maupun API.
+
+Prompt soal yang identik dan sedang berjalan digabung (single_flight.py):
+banyak sesi dengan okupasi sama cukup satu panggilan Gemini. Respons
+mentah dibagi, lalu setiap pemanggil mem-parsing dan mengacak urutan soal
+& opsi sendiri (shuffle_questions).
+
+Latensi soal dibatasi remote_or_local: panggilan Gemini jalan di thread
+terpisah, dan bila belum selesai dalam anggaran waktu (SOAL_LATENCY_BUDGET)
+atau gagal, soal template lokal (question_templates.py) langsung dipakai.
+Hasil Gemini yang datang terlambat diserahkan ke callback on_late.
+"""
+
+import json
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import metrics
+from config import EXCEL_PATH, JUMLAH_SOAL
+from data_loader import text_of
+from deadline import remaining
+from gemini_client import PRIORITY_ASSESSMENT, generate_content
+from metrics import timed
+from question_templates import SUMBER_LOKAL, load_local_generator
+from single_flight import SingleFlight, prompt_key
+
+# Batas bawah skor per level, urut dari tertinggi
+LEVEL_KOMPETENSI = (
+    (90, "Ahli"),
+    (70, "Menengah"),
+    (50, "Junior"),
+    (0, "Pemula"),
+)
+
+_ESCAPE_INVALID_RE = re.compile(r'\\(?![ntr"\\/bfuU])')
+_CONTROL_CHAR_RE = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+_OBJEK_BERDEMPET_RE = re.compile(r'\}\s*\{')
+_ARRAY_BERDEMPET_RE = re.compile(r'\]\s*"')
+
+# Ditempel di akhir prompt soal
+JSON_INSTRUCTION = """
+PENTING: Respons HARUS JSON valid.
+Format:
+{
+  "questions": [
+    {"id": "q1", "teks": "...", "opsi": ["A", "B", "C", "D"], "jawaban_benar": "A"}
+  ]
+}
+"""
+
+KOLOM_SOAL = ("id", "teks", "opsi", "jawaban_benar")
+
+# Panggilan soal yang sedang berjalan, per prompt (counter gemini_soal_shared/_leader)
+QUESTION_FLIGHT = SingleFlight("gemini_soal")
+
+SUMBER_GEMINI = "gemini"
+
+# Thread panggilan Gemini yang dibatasi anggaran latensi (remote_or_local)
+_REMOTE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="soal-remote")
+
+
+@timed()
+def sanitize_json_response(text: str) -> str:
+    """Bersihkan JSON dari karakter aneh"""
+    # Hapus escape sequence invalid
+    text = _ESCAPE_INVALID_RE.sub('', text)
+    text = text.replace("\\'", "'")
+
+    # Hapus control characters
+    text = _CONTROL_CHAR_RE.sub('', text)
+
+    # Fix missing commas
+    text = _OBJEK_BERDEMPET_RE.sub('},{', text)
+    text = _ARRAY_BERDEMPET_RE.sub('],"', text)
+
+    return text.strip()
+
+
+def level_for_score(skor):
+    """Skor 0-100 -> level kompetensi"""
+    for batas, level in LEVEL_KOMPETENSI:
+        if skor >= batas:
+            return level
+    return LEVEL_KOMPETENSI[-1][1]
+
+
+def validate_assessment(answers: dict, questions: list):
+    """
+    Validasi jawaban user
+    Return: (skor, level)
+    """
+    if not questions:
+        return 0, "Error"
+
+    correct = sum(
+        1 for q in questions
+        if q['id'] in answers and answers[q['id']] == q['jawaban_benar']
+    )
+
+    # Hitung skor
+    skor = int((correct / len(questions)) * 100)
+
+    return skor, level_for_score(skor)
+
+
+# ========================================
+# GENERATE SOAL
+# ========================================
+def build_question_prompt(okupasi_nama, unit_kompetensi, kuk_keywords, jumlah=JUMLAH_SOAL) -> str:
+    """Prompt soal pilihan ganda untuk satu okupasi PON"""
+    return f"""Anda adalah expert TIK Indonesia.
+
+Buat TEPAT {jumlah} soal pilihan ganda untuk:
+
+**Okupasi:** {okupasi_nama}
+**Unit Kompetensi:** {unit_kompetensi}
+**Keterampilan:** {kuk_keywords}
+
+**Kriteria:**
+1. Relevan dengan kompetensi
+2. Tingkat: Menengah-Ahli
+3. Skenario praktis
+4. TEPAT 4 opsi per soal
+5. 1 jawaban benar
+6. Bahasa Indonesia
+7. HINDARI karakter khusus
+
+**Format JSON:**
+{{
+  "questions": [
+    {{
+      "id": "q1",
+      "teks": "Pertanyaan...",
+      "opsi": ["Opsi A", "Opsi B", "Opsi C", "Opsi D"],
+      "jawaban_benar": "Opsi A"
+    }}
+  ]
+}}
+
+ATURAN:
+- {jumlah} soal (q1-q{jumlah})
+- Pisahkan dengan koma
+- jawaban_benar = salah satu opsi
+- Output HANYA JSON
+"""
+
+
+def strip_code_fence(content: str) -> str:
+    """Buang pagar markdown ```json ... ``` di sekitar respons"""
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
+
+
+def request_questions_text(prompt: str, priority=PRIORITY_ASSESSMENT, max_wait=None, on_wait=None,
+                           deadline=None) -> str:
+    """
+    Kirim prompt soal ke Gemini; return teks JSON tanpa pagar markdown.
+    priority/max_wait/on_wait/deadline diteruskan ke gemini_client.
+    Pemanggil serentak dengan prompt sama berbagi satu request; hanya
+    pemanggil pertama yang mengantre di limiter, menerima on_wait, dan
+    menentukan deadline request bersama itu. Pemanggil lain menunggu paling
+    lama sampai deadline-nya sendiri (DeadlineExceeded).
+    """
+    content, _ = QUESTION_FLIGHT.do(
+        prompt_key(prompt), generate_content,
+        prompt + JSON_INSTRUCTION, temperature=0.7, max_output_tokens=3000,
+        priority=priority, max_wait=max_wait, on_wait=on_wait, deadline=deadline,
+    )
+    return strip_code_fence(content)
+
+
+def extract_questions(response_text: str) -> list:
+    """
+    Respons Gemini -> list soal mentah.
+    Raise json.JSONDecodeError / ValueError jika format tidak dikenali.
+    """
+    response_json = json.loads(sanitize_json_response(response_text))
+    if isinstance(response_json, dict) and "questions" in response_json:
+        return response_json["questions"]
+    if isinstance(response_json, list):
+        return response_json
+    raise ValueError("Format tidak dikenali")
+
+
+def normalize_questions(questions: list, okupasi_nama: str, jumlah=JUMLAH_SOAL, cadangan=()) -> list:
+    """
+    Tepatkan jumlah soal (tambah soal cadangan / potong), validasi struktur,
+    lalu beri id q1..qN dan tipe. Raise ValueError jika struktur soal rusak.
+    `cadangan`: soal pengganti untuk kekurangan (mis. soal template lokal),
+    dipakai sebelum soal tambahan generik; disalin, dict aslinya tidak diubah.
+    """
+    questions = list(questions)
+    ada = {q.get("teks") for q in questions if isinstance(q, dict)}
+    questions.extend(dict(q) for q in cadangan if q["teks"] not in ada)
+    while len(questions) < jumlah:
+        questions.append({
+            "id": f"q{len(questions)+1}",
+            "teks": f"[Soal tambahan] Bagaimana menangani darurat di {okupasi_nama}?",
+            "opsi": ["Eskalasi", "Konsultasi", "Dokumentasi", "Trial"],
+            "jawaban_benar": "Konsultasi"
+        })
+    questions = questions[:jumlah]
+
+    for i, q in enumerate(questions):
+        if not isinstance(q, dict) or not all(k in q for k in KOLOM_SOAL):
+            raise ValueError(f"Soal {i+1} struktur tidak lengkap")
+        if len(q["opsi"]) != 4:
+            raise ValueError(f"Soal {i+1} tidak punya 4 opsi")
+        if q["jawaban_benar"] not in q["opsi"]:
+            raise ValueError(f"Soal {i+1}: Jawaban tidak di opsi")
+        q["id"] = f"q{i+1}"
+        q["tipe"] = "pilihan_ganda"
+    return questions
+
+
+def shuffle_questions(questions: list, rng=None) -> list:
+    """
+    Salinan soal dengan urutan soal & opsi diacak, id diberi ulang q1..qN.
+    jawaban_benar berupa teks opsi, jadi tetap valid setelah opsi diacak.
+    """
+    rng = rng or random
+    hasil = [dict(q, opsi=list(q["opsi"])) for q in questions]
+    rng.shuffle(hasil)
+    for i, q in enumerate(hasil):
+        rng.shuffle(q["opsi"])
+        q["id"] = f"q{i+1}"
+    return hasil
+
+
+def local_questions(okupasi_id, jumlah=JUMLAH_SOAL, file_path=EXCEL_PATH) -> list:
+    """Soal template lokal (tanpa AI); list kosong jika okupasi tidak ada di sheet PON"""
+    try:
+        return load_local_generator(file_path).questions(okupasi_id, jumlah)
+    except Exception:
+        return []
+
+
+def remote_or_local(remote, local, budget, on_late=None):
+    """
+    Jalankan remote() dengan batas waktu `budget` detik (None = tanpa batas).
+    Selesai tepat waktu -> (hasil, SUMBER_GEMINI). Lewat anggaran atau gagal ->
+    (local(), SUMBER_LOKAL) seketika; bila remote akhirnya berhasil, hasilnya
+    diteruskan ke on_late(hasil) dari thread remote. Jika local() kosong,
+    pemanggil tetap menunggu / menerima error remote.
+    """
+    future = _REMOTE_POOL.submit(remote)
+    try:
+        hasil = future.result(timeout=budget)
+        metrics.incr("soal_remote")
+        return hasil, SUMBER_GEMINI
+    except FutureTimeout:
+        penyebab, error = "soal_lokal_timeout", None
+    except Exception as e:
+        penyebab, error = "soal_lokal_error", e
+
+    cadangan = local()
+    if not cadangan:
+        if error is not None:
+            raise error
+        return future.result(), SUMBER_GEMINI
+    metrics.incr(penyebab)
+    if error is None and on_late is not None:
+        def _telat(f):
+            if not f.cancelled() and f.exception() is None:
+                metrics.incr("soal_remote_late")
+                on_late(f.result())
+        future.add_done_callback(_telat)
+    return cadangan, SUMBER_LOKAL
+
+
+@timed()
+def generate_questions(pon_row, jumlah=JUMLAH_SOAL, priority=PRIORITY_ASSESSMENT, max_wait=None,
+                       budget=None, on_late=None, deadline=None):
+    """
+    Soal asesmen (sudah diacak) untuk satu baris PON (dict / Series) lewat Gemini.
+    `budget`: anggaran latensi (detik) sebelum beralih ke soal template lokal.
+    `deadline`: batas total panggilan Gemini (juga membatasi budget).
+    Return: (soal, sumber) dengan sumber SUMBER_GEMINI / SUMBER_LOKAL
+    """
+    okupasi_nama = text_of(pon_row["Okupasi"])
+    prompt = build_question_prompt(
+        okupasi_nama, text_of(pon_row["Unit_Kompetensi"]), text_of(pon_row["Kuk_Keywords"]), jumlah
+    )
+    cadangan = local_questions(text_of(pon_row["OkupasiID"]), jumlah)
+
+    def remote():
+        questions = extract_questions(request_questions_text(prompt, priority, max_wait, deadline=deadline))
+        return normalize_questions(questions, okupasi_nama, jumlah, cadangan)
+
+    questions, sumber = remote_or_local(remote, lambda: cadangan, remaining(deadline, budget), on_late)
+    return shuffle_questions(questions), sumber
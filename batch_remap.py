@@ -0,0 +1,230 @@
+"""
+PEMETAAN ULANG MASSAL (BATCH MALAM)
+Setelah sheet PON atau index berubah, hasil mapping lama di
+Hasil_Pemetaan_Asesmen bisa usang. Script ini memetakan ulang seluruh
+talenta di profile store:
+
+- Profil dibaca per chunk dari satu snapshot SQLite (tidak seluruh tabel
+  sekaligus ke memori), lalu dilengkapi data pendidikan, pekerjaan, dan
+  skill hasil profile_join (satu pass groupby di awal).
+- Tiap chunk dipetakan di process pool dengan satu perkalian matriks
+  sparse (index.search_batch); index PON dan skill extractor dibangun
+  sekali per worker. Jumlah chunk yang sedang diproses dibatasi supaya
+  memori tetap rata.
+- Hanya talenta yang okupasinya berubah (atau belum punya hasil) yang
+  ditulis sebagai baris Hasil baru; penulisan hanya dari proses utama,
+  satu transaksi per chunk.
+- Progress (jumlah, baris/detik, ETA) dicetak per chunk; ringkasan akhir
+  berisi jumlah berubah / tetap / baru dan perpindahan okupasi terbanyak.
+
+Dijadwalkan lewat cron, misalnya tiap pukul 02.00:
+
+    0 2 * * * cd /srv/dtp && python batch_remap.py --metode tfidf --output data/cache/remap.json
+
+Pakai --dry-run untuk melihat statistik tanpa menulis ke store.
+"""
+
+import argparse
+import collections
+import datetime
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from config import EXCEL_PATH, PROFILE_DB_PATH, SHEET_TALENTA
+from profile_join import load_store_join
+
+CHUNK_SIZE = 500
+
+# Status per talenta
+TETAP = "unchanged"
+BERUBAH = "changed"
+BARU = "new"
+DILEWATI = "skipped"
+
+# State per proses worker: (file workbook, index PON, skill extractor)
+_worker = None
+
+
+def _init_worker(file_path, metode):
+    """Initializer pool: bangun index PON & skill extractor sekali per proses"""
+    global _worker
+    from pon_index import load_pon_index
+    from skill_extractor import load_skill_extractor
+
+    _worker = (file_path, load_pon_index(file_path, metode), load_skill_extractor(file_path))
+
+
+def map_chunk(rows):
+    """
+    Petakan satu chunk dari ProfileStore.iter_mapping_inputs.
+    Baris: (TalentID, Raw_CV_Text, Profil_Singkat, okupasi lama, skor lama, teks terstruktur).
+    Return: list (TalentID, status, okupasi lama, okupasi baru, skor, gap)
+    """
+    from cv_parser import extract_profile_entities
+    from skill_extractor import skill_gap
+
+    file_path, index, extractor = _worker
+    hasil, teks, posisi = [], [], []
+    for i, (talent_id, raw_cv, profil_singkat, lama, _, struktur) in enumerate(rows):
+        dasar = (raw_cv or "").strip() or (profil_singkat or "").strip()
+        sumber = ". ".join(t for t in (dasar, struktur) if t)
+        if not sumber:
+            hasil.append((talent_id, DILEWATI, lama, None, None, None))
+            continue
+        teks.append(extract_profile_entities(sumber, file_path))
+        posisi.append(i)
+        hasil.append(None)
+
+    if teks:
+        # Satu perkalian matriks untuk seluruh chunk
+        for i, profile_text, top in zip(posisi, teks, index.search_batch(teks, top_k=1)):
+            talent_id, _, _, lama, _, _ = rows[i]
+            if not top:
+                hasil[i] = (talent_id, DILEWATI, lama, None, None, None)
+                continue
+            okupasi_id = str(index.okupasi_ids[top[0][0]])
+            skor = round(float(top[0][1]), 4)
+            if lama == okupasi_id:
+                hasil[i] = (talent_id, TETAP, lama, okupasi_id, skor, None)
+                continue
+            # Skill gap hanya dihitung untuk baris yang akan ditulis
+            gap = skill_gap(extractor, index.row_for(okupasi_id), profile_text)
+            status = BARU if lama in (None, "") else BERUBAH
+            hasil[i] = (talent_id, status, lama, okupasi_id, skor, ", ".join(gap) if gap else "-")
+    return hasil
+
+
+class RemapStats:
+    """Penghitung progress & diff selama batch berjalan"""
+
+    def __init__(self, total):
+        self.total = total
+        self.status = collections.Counter()
+        self.transisi = collections.Counter()
+        self.ditulis = 0
+        self.t0 = time.perf_counter()
+
+    @property
+    def processed(self):
+        return sum(self.status.values())
+
+    def add(self, hasil):
+        for _, status, lama, baru, _, _ in hasil:
+            self.status[status] += 1
+            if status == BERUBAH:
+                self.transisi[(lama, baru)] += 1
+
+    def progress_line(self):
+        elapsed = time.perf_counter() - self.t0
+        laju = self.processed / elapsed if elapsed > 0 else 0.0
+        sisa = (self.total - self.processed) / laju if laju > 0 else 0.0
+        persen = 100.0 * self.processed / self.total if self.total else 100.0
+        return (f"{self.processed:>8,}/{self.total:,} ({persen:5.1f}%)  "
+                f"{laju:8.1f} talenta/s  ETA {sisa:6.1f} s  berubah {self.status[BERUBAH]:,}")
+
+    def to_dict(self, top=10):
+        elapsed = time.perf_counter() - self.t0
+        return {
+            "total": self.processed,
+            "unchanged": self.status[TETAP],
+            "changed": self.status[BERUBAH],
+            "new": self.status[BARU],
+            "skipped": self.status[DILEWATI],
+            "written": self.ditulis,
+            "elapsed_s": round(elapsed, 3),
+            "talents_per_s": round(self.processed / elapsed, 1) if elapsed > 0 else None,
+            "top_transitions": [
+                {"from": lama, "to": baru, "count": n}
+                for (lama, baru), n in self.transisi.most_common(top)
+            ],
+        }
+
+
+def _result_rows(hasil, tanggal):
+    return [{
+        "TalentID": talent_id,
+        "OkupasiID_Mapped": baru,
+        "Skor_Kecocokan_Awal": skor,
+        "Gap_Keterampilan": gap,
+        "Tanggal_Update": tanggal,
+    } for talent_id, status, _, baru, skor, gap in hasil if status in (BERUBAH, BARU)]
+
+
+def remap_all(store, file_path=EXCEL_PATH, metode="tfidf", chunk_size=CHUNK_SIZE,
+              workers=None, dry_run=False, log=print):
+    """
+    Petakan ulang semua talenta di `store`; tulis baris Hasil baru hanya untuk
+    okupasi yang berubah. workers=0: tanpa process pool. Return: RemapStats
+    """
+    stats = RemapStats(store.count(SHEET_TALENTA))
+    tanggal = datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+    def selesai(hasil):
+        stats.add(hasil)
+        if not dry_run:
+            stats.ditulis += store.append_results(_result_rows(hasil, tanggal))
+        log(stats.progress_line())
+
+    # Data terstruktur semua talenta: satu pass per tabel anak
+    struktur = load_store_join(store).structured_texts().to_dict()
+    chunks = (
+        [(*row, struktur.get(row[0], "")) for row in rows]
+        for rows in store.iter_mapping_inputs(chunk_size)
+    )
+    if workers == 0:
+        _init_worker(file_path, metode)
+        for rows in chunks:
+            selesai(map_chunk(rows))
+        return stats
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(file_path, metode)) as pool:
+        berjalan = set()
+        for rows in chunks:
+            # Batasi chunk di memori: tunggu sebagian selesai sebelum membaca lagi
+            if len(berjalan) >= 2 * workers:
+                beres, berjalan = wait(berjalan, return_when=FIRST_COMPLETED)
+                for future in beres:
+                    selesai(future.result())
+            berjalan.add(pool.submit(map_chunk, rows))
+        for future in wait(berjalan).done:
+            selesai(future.result())
+    return stats
+
+
+def main():
+    from pon_index import METODE_MAPPING
+    from profile_store import ProfileStore
+
+    parser = argparse.ArgumentParser(description="Pemetaan ulang massal semua talenta ke okupasi PON")
+    parser.add_argument("--db", default=PROFILE_DB_PATH, help="file SQLite profile store")
+    parser.add_argument("--excel", default=EXCEL_PATH, help="workbook / folder dataset PON")
+    parser.add_argument("--metode", choices=list(METODE_MAPPING), default="tfidf")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (0 = tanpa pool)")
+    parser.add_argument("--dry-run", action="store_true", help="hitung statistik tanpa menulis")
+    parser.add_argument("--output", help="simpan ringkasan JSON ke file ini")
+    args = parser.parse_args()
+
+    store = ProfileStore(args.db)
+    stats = remap_all(store, args.excel, args.metode, args.chunk_size, args.workers, args.dry_run)
+    ringkasan = dict(stats.to_dict(), metode=args.metode, dry_run=args.dry_run)
+
+    print(f"Selesai: {ringkasan['total']:,} talenta dalam {ringkasan['elapsed_s']:.2f} s "
+          f"({ringkasan['talents_per_s']} talenta/s)")
+    print(f"  tetap {ringkasan['unchanged']:,}, berubah {ringkasan['changed']:,}, "
+          f"baru {ringkasan['new']:,}, dilewati {ringkasan['skipped']:,}, ditulis {ringkasan['written']:,}")
+    for t in ringkasan["top_transitions"]:
+        print(f"  {t['from']} -> {t['to']}: {t['count']:,}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(ringkasan, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
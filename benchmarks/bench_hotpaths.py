@@ -0,0 +1,215 @@
+"""
+BENCHMARK JALUR PANAS (OFFLINE)
+Load workbook, ekstrak PDF/DOCX, parsing CV, fit vectorizer & mapping PON
+(1 / 100 / 10k profil), sanitize JSON, dan validasi asesmen.
+
+Hasil disimpan ke JSON; bandingkan dengan run sebelumnya untuk menandai regresi.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_hotpaths --output bench_baru.json
+    python -m benchmarks.bench_hotpaths --output bench_baru.json --baseline bench_lama.json
+    python -m benchmarks.bench_hotpaths --compare bench_lama.json bench_baru.json
+    python -m benchmarks.bench_hotpaths --excel data/synthetic/scale_1/parquet
+Exit code 1 jika ada regresi melewati --threshold.
+"""
+
+import argparse
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from assessment import sanitize_json_response, validate_assessment
+from benchmarks.samples import (
+    make_cv_text, make_docx, make_gemini_payload, make_pdf, make_profiles, make_questions
+)
+from config import (
+    EXCEL_PATH, SHEET_HASIL, SHEET_LOWONGAN, SHEET_PEKERJAAN, SHEET_PENDIDIKAN,
+    SHEET_PON, SHEET_SKILL, SHEET_TALENTA
+)
+from cv_parser import extract_profile_entities, extract_text_from_docx, extract_text_from_pdf, parse_cv_data
+from data_loader import read_sheet
+from pon_index import build_pon_index
+from semantic_index import LsaPonIndex
+
+SEMUA_SHEET = (
+    SHEET_TALENTA, SHEET_PENDIDIKAN, SHEET_PEKERJAAN, SHEET_SKILL,
+    SHEET_PON, SHEET_LOWONGAN, SHEET_HASIL,
+)
+
+# Ukuran dokumen (jumlah paragraf pengalaman) dan jumlah profil mapping
+UKURAN_DOKUMEN = (5, 50, 500)
+UKURAN_PROFIL = (1, 100, 10_000)
+UKURAN_PAYLOAD = (5, 500, 5_000)
+UKURAN_SOAL = (5, 100, 10_000)
+
+
+def measure(fn, repeat=5, min_time=0.2, warmup=1):
+    """
+    Jalankan fn minimal `repeat` kali dan minimal `min_time` detik.
+    Return statistik per panggilan dalam milidetik.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    mulai = time.perf_counter()
+    while len(samples) < repeat or (time.perf_counter() - mulai) < min_time:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= 1000:
+            break
+    ms = np.array(samples) * 1000
+    return {
+        "n": len(samples),
+        "median_ms": round(float(np.median(ms)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "min_ms": round(float(ms.min()), 4),
+    }
+
+
+def run_benchmarks(quick=False, file_path=EXCEL_PATH, log=print):
+    hasil = {}
+
+    def bench(nama, fn, **kwargs):
+        hasil[nama] = measure(fn, **kwargs)
+        log(f"{nama:<40} median {hasil[nama]['median_ms']:>12.3f} ms  (n={hasil[nama]['n']})")
+
+    # 1. Workbook
+    bench("workbook.read_all_sheets", lambda: [read_sheet(file_path, s) for s in SEMUA_SHEET],
+          repeat=3, min_time=0)
+
+    # 2-3. Ekstraksi dokumen & parsing CV
+    rng = random.Random(42)
+    for n in UKURAN_DOKUMEN:
+        teks = make_cv_text(rng, n)
+        pdf, docx_bytes = make_pdf(teks), make_docx(teks)
+        bench(f"extract_pdf.paragraf_{n}", lambda b=pdf: extract_text_from_pdf(io.BytesIO(b)), repeat=3)
+        bench(f"extract_docx.paragraf_{n}", lambda b=docx_bytes: extract_text_from_docx(io.BytesIO(b)), repeat=3)
+        bench(f"parse_cv_data.paragraf_{n}", lambda t=teks: parse_cv_data(t))
+        bench(f"extract_profile_entities.paragraf_{n}", lambda t=teks: extract_profile_entities(t, file_path))
+
+    # 4. Vectorizer & mapping
+    df_pon = read_sheet(file_path, SHEET_PON)
+    ukuran_profil = tuple(min(n, 1_000) for n in UKURAN_PROFIL) if quick else UKURAN_PROFIL
+    profiles = [extract_profile_entities(t, file_path) for t in make_profiles(max(ukuran_profil))]
+
+    bench("fit.tfidf", lambda: build_pon_index("tfidf", df_pon), repeat=3)
+    bench("fit.hashing", lambda: build_pon_index("hashing", df_pon), repeat=3)
+    bench("fit.lsa", lambda: LsaPonIndex.fit(df_pon, profiles[:1_000]), repeat=3, min_time=0)
+
+    indexes = {
+        "tfidf": build_pon_index("tfidf", df_pon),
+        "hashing": build_pon_index("hashing", df_pon),
+        "lsa": LsaPonIndex.fit(df_pon, profiles[:1_000]),
+    }
+    for metode, index in indexes.items():
+        for n in ukuran_profil:
+            batch = profiles[:n]
+            bench(f"map.{metode}.profil_{n}", lambda b=batch, ix=index: ix.search_batch(b, 1),
+                  repeat=3 if n > 100 else 5, min_time=0 if n > 100 else 0.2)
+
+    # 5. Sanitize JSON
+    for n in UKURAN_PAYLOAD:
+        payload = make_gemini_payload(n)
+        bench(f"sanitize_json.soal_{n}", lambda p=payload: sanitize_json_response(p))
+
+    # 6. Validasi asesmen
+    for n in UKURAN_SOAL:
+        answers, questions = make_questions(n)
+        bench(f"validate_assessment.soal_{n}", lambda a=answers, q=questions: validate_assessment(a, q))
+
+    return hasil
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(baseline, current, threshold):
+    """
+    Bandingkan median per benchmark. Return: (baris laporan, daftar regresi)
+    Regresi = median naik lebih dari `threshold` (rasio, 0.25 = 25%).
+    """
+    baris, regresi = [], []
+    for nama, stat in current["results"].items():
+        lama = baseline["results"].get(nama)
+        if not lama or not lama["median_ms"]:
+            baris.append(f"{nama:<40} {'-':>12} {stat['median_ms']:>12.3f}   (baru)")
+            continue
+        rasio = stat["median_ms"] / lama["median_ms"]
+        tanda = ""
+        if rasio > 1 + threshold:
+            tanda = "  <-- REGRESI"
+            regresi.append(nama)
+        elif rasio < 1 - threshold:
+            tanda = "  (lebih cepat)"
+        baris.append(f"{nama:<40} {lama['median_ms']:>12.3f} {stat['median_ms']:>12.3f} {rasio:>7.2f}x{tanda}")
+    return baris, regresi
+
+
+def _cetak_perbandingan(baseline, current, threshold):
+    baris, regresi = compare(baseline, current, threshold)
+    print(f"\n{'benchmark':<40} {'lama (ms)':>12} {'baru (ms)':>12} {'rasio':>8}")
+    print("\n".join(baris))
+    if regresi:
+        print(f"\n{len(regresi)} regresi (> {threshold:.0%}): {', '.join(regresi)}")
+    else:
+        print("\nTidak ada regresi.")
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Simpan hasil JSON ke file ini")
+    parser.add_argument("--baseline", help="Hasil JSON run sebelumnya untuk dibandingkan")
+    parser.add_argument("--compare", nargs=2, metavar=("LAMA", "BARU"), help="Bandingkan dua file hasil tanpa menjalankan benchmark")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Ambang regresi median (default 0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="Batasi mapping ke 1.000 profil")
+    parser.add_argument("--excel", default=EXCEL_PATH,
+                        help="Workbook atau folder parquet/csv (mis. hasil benchmarks.generate_dataset)")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            lama = json.load(f)
+        with open(args.compare[1]) as f:
+            baru = json.load(f)
+        sys.exit(1 if _cetak_perbandingan(lama, baru, args.threshold) else 0)
+
+    laporan = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "dataset": args.excel,
+        },
+        "results": run_benchmarks(quick=args.quick, file_path=args.excel),
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(laporan, f, indent=2)
+        print(f"\nHasil disimpan ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            lama = json.load(f)
+        sys.exit(1 if _cetak_perbandingan(lama, laporan, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+BENCHMARK: TF-IDF vs LSA UNTUK MAPPING PON
+Bandingkan waktu build, latensi query, throughput batch, dan kesepakatan top-k.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_semantic --top-k 3 --repeat 200
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from config import EXCEL_PATH, SHEET_PON, SHEET_TALENTA
+from data_loader import read_sheet, text_column
+from pon_index import build_pon_index
+
+
+def load_profiles():
+    """Profil uji: teks profil singkat + CV dari sheet Talenta"""
+    df_talenta = read_sheet(EXCEL_PATH, SHEET_TALENTA)
+    kolom = [c for c in ['Profil_Singkat', 'Raw_CV_Text'] if c in df_talenta.columns]
+    teks = [text_column(df_talenta, c) for c in kolom]
+    return teks[0].str.cat(teks[1:], sep=' ').tolist()
+
+
+def bench_metode(metode, df_pon, profiles, top_k, repeat):
+    t0 = time.perf_counter()
+    index = build_pon_index(metode, df_pon, profiles)
+    build_s = time.perf_counter() - t0
+
+    latencies = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        index.search(profiles[i % len(profiles)], top_k)
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    hasil = index.search_batch(profiles, top_k)
+    batch_s = time.perf_counter() - t0
+
+    lat_ms = np.array(latencies) * 1000
+    return hasil, {
+        "build_s": round(build_s, 4),
+        "query_p50_ms": round(float(np.percentile(lat_ms, 50)), 3),
+        "query_p95_ms": round(float(np.percentile(lat_ms, 95)), 3),
+        "batch_profiles_per_s": round(len(profiles) / batch_s, 1) if batch_s else None,
+    }
+
+
+def top_k_agreement(hasil_a, hasil_b, top_k):
+    """Top-1 sama & rata-rata irisan top-k (0-1) antar dua metode"""
+    top1 = np.mean([a[0][0] == b[0][0] for a, b in zip(hasil_a, hasil_b)])
+    overlap = np.mean([
+        len({i for i, _ in a} & {i for i, _ in b}) / top_k
+        for a, b in zip(hasil_a, hasil_b)
+    ])
+    return {"top1_agreement": round(float(top1), 3), f"overlap_at_{top_k}": round(float(overlap), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200, help="Jumlah query tunggal untuk ukur latensi")
+    parser.add_argument("--output", help="Simpan hasil JSON ke file ini")
+    args = parser.parse_args()
+
+    df_pon = read_sheet(EXCEL_PATH, SHEET_PON)
+    profiles = load_profiles()
+
+    hasil_tfidf, stat_tfidf = bench_metode("tfidf", df_pon, profiles, args.top_k, args.repeat)
+    hasil_lsa, stat_lsa = bench_metode("lsa", df_pon, profiles, args.top_k, args.repeat)
+
+    laporan = {
+        "n_okupasi": len(df_pon),
+        "n_profil": len(profiles),
+        "top_k": args.top_k,
+        "tfidf": stat_tfidf,
+        "lsa": stat_lsa,
+        "agreement": top_k_agreement(hasil_tfidf, hasil_lsa, args.top_k),
+    }
+
+    teks = json.dumps(laporan, indent=2)
+    print(teks)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(teks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+GENERATOR DATA SINTETIS DTP
+Bangkitkan ketujuh sheet config.py (Talenta, Riwayat_Pendidikan, Riwayat_Pekerjaan,
+Keterampilan_Sertifikasi, PON_TIK_Master, Lowongan_Industri, Hasil_Pemetaan_Asesmen)
+dengan kardinalitas & relasi realistis, deterministik lewat seed.
+
+Skala 1x = 100.000 talenta & 5.000 lowongan; tabel anak mengikuti rasio per talenta.
+Talenta dibangkitkan per chunk (seed turunan per chunk), jadi skala 100x
+tetap berjalan dengan memori konstan untuk CSV/Parquet.
+
+Output per format di --output-dir:
+- csv/<sheet>.csv dan parquet/<sheet>.parquet (bisa dibaca data_loader.read_sheet)
+- DTP_Database.xlsx dengan layout asli (header baris ke-2, kolom A kosong).
+  Excel dibatasi 1.048.576 baris per sheet: xlsx dilewati jika ada sheet melebihi batas.
+
+Jalankan dari root repo:
+    python -m benchmarks.generate_dataset --scale 1
+    python -m benchmarks.generate_dataset --scale 10 --formats csv parquet
+    DTP_EXCEL_PATH=data/synthetic/scale_1/DTP_Database.xlsx streamlit run home.py
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from assessment import level_for_score
+from config import (
+    EXCEL_PATH, GAZETTEER_PATH, SHEET_HASIL, SHEET_LOWONGAN, SHEET_PEKERJAAN,
+    SHEET_PENDIDIKAN, SHEET_PON, SHEET_SKILL, SHEET_TALENTA
+)
+from data_loader import read_sheet
+from skill_extractor import split_skill_list
+
+BASE_TALENTA = 100_000
+BASE_LOWONGAN = 5_000
+DEFAULT_OKUPASI = 300
+
+# Talenta per chunk; bagian dari seed turunan, jangan diubah antar run yang dibandingkan
+CHUNK_TALENTA = 20_000
+
+# Batas baris worksheet Excel (termasuk baris kosong + header)
+XLSX_MAX_ROWS = 1_048_576 - 2
+
+FORMATS = ("xlsx", "csv", "parquet")
+
+KOLOM = {
+    SHEET_TALENTA: ["TalentID", "Nama", "Email", "Lokasi", "Profil_Singkat", "LinkedIn_URL", "Raw_CV_Text"],
+    SHEET_PENDIDIKAN: ["PendidikanID", "TalentID", "Institusi", "Jenjang", "Jurusan", "Tahun_Lulus"],
+    SHEET_PEKERJAAN: ["PengalamanID", "TalentID", "Perusahaan", "Posisi", "Deskripsi", "Tanggal_Mulai", "Tanggal_Selesai"],
+    SHEET_SKILL: ["SkillID", "TalentID", "Nama_Skill_Sertifikasi", "Tipe", "Lembaga_Penerbit", "Level"],
+    SHEET_PON: ["OkupasiID", "Area_Fungsi", "Okupasi", "Unit_Kompetensi", "Kuk_Keywords"],
+    SHEET_LOWONGAN: ["LowonganID", "Perusahaan", "Posisi", "Deskripsi_Pekerjaan", "Keterampilan_Dibutuhkan", "Lokasi"],
+    SHEET_HASIL: ["HasilID", "TalentID", "OkupasiID_Mapped", "Skor_Kecocokan_Awal", "Skor_Asesmen",
+                  "Level_Kompetensi", "Gap_Keterampilan", "Tanggal_Update"],
+}
+
+NAMA_DEPAN = (
+    "Budi Citra Doni Eka Fajar Gita Hadi Indah Joko Kartika Lukman Maya Nanda Oki Putri "
+    "Rizky Sari Teguh Umi Vina Wahyu Yusuf Zahra Agus Bayu Dewi Fitri Gilang Hana Irfan "
+    "Jihan Kevin Lestari Made Nur Oktaviani Prasetyo Rahma Siti Tono Wulan Yoga Ayu Bima"
+).split()
+NAMA_BELAKANG = (
+    "Santoso Lestari Firmansyah Putra Saputra Wijaya Hidayat Kusuma Pratama Nugroho "
+    "Siregar Nasution Simanjuntak Wibowo Setiawan Halim Gunawan Hakim Rahman Utami "
+    "Permana Susanto Purnomo Sembiring Tanjung Harahap Manurung Sitompul Daulay Pane"
+).split()
+INSTITUSI = (
+    "Universitas Gadjah Mada", "Institut Teknologi Bandung", "Universitas Indonesia",
+    "Institut Teknologi Sepuluh Nopember", "Universitas Brawijaya", "Universitas Diponegoro",
+    "Universitas Airlangga", "Universitas Padjadjaran", "Universitas Bina Nusantara",
+    "Telkom University", "Universitas Hasanuddin", "Universitas Sumatera Utara",
+    "Politeknik Negeri Jakarta", "Politeknik Elektronika Negeri Surabaya", "Universitas Udayana",
+)
+JENJANG = ("D3", "S1", "S2")
+JURUSAN = (
+    "Teknik Informatika", "Sistem Informasi", "Ilmu Komputer", "Matematika", "Statistika",
+    "Teknik Elektro", "Desain Komunikasi Visual", "Desain Produk", "Manajemen", "Teknik Industri",
+)
+KATA_PERUSAHAAN = (
+    "Data Jaya Aman Digital Nusantara Solusi Kreatif Cepat Maju Teknologi Inovasi Sinergi "
+    "Mitra Cerdas Global Prima Sentosa Bersama Karya Cipta Andalan Bank Retail Logistik"
+).split()
+SERTIFIKASI = (
+    ("AWS Certified Solutions Architect", "AWS"),
+    ("Google Data Analytics", "Google (Coursera)"),
+    ("CompTIA A+", "CompTIA"),
+    ("Certified Ethical Hacker", "EC-Council"),
+    ("Cisco CCNA", "Cisco"),
+    ("Professional Scrum Master", "Scrum.org"),
+    ("Microsoft Azure Fundamentals", "Microsoft"),
+    ("Google UX Design", "Google (Coursera)"),
+)
+LEVEL_SKILL = ("Pemula", "Menengah", "Ahli")
+TINGKAT = ("Junior", "Middle", "Senior", "Lead", "Principal")
+DOMAIN = ("Fintech", "E-commerce", "Pemerintahan", "Kesehatan", "Logistik", "Edutech", "Telekomunikasi", "Media")
+DESKRIPSI_KERJA = (
+    "Bertanggung jawab atas {s1} dan {s2} untuk produk utama perusahaan.",
+    "Mengembangkan {s1} serta berkolaborasi dengan tim {area}.",
+    "Menangani {s1}, {s2}, dan dokumentasi teknis harian.",
+    "Memimpin inisiatif {s1} di divisi {area}.",
+)
+
+
+# ========================================
+# MASTER: PON, LOKASI, PERUSAHAAN
+# ========================================
+def _kode_area(okupasi_id):
+    bagian = str(okupasi_id).split("-")
+    return bagian[1] if len(bagian) > 2 else "XX"
+
+
+def build_pon(base_pon: pd.DataFrame, n_okupasi: int, rng) -> pd.DataFrame:
+    """Baris PON asli dipertahankan, sisanya varian tingkat/domain dengan subset KUK"""
+    base = base_pon[KOLOM[SHEET_PON]].astype(str).reset_index(drop=True)
+    rows = base.to_dict("records")[:n_okupasi]
+    nomor = {}
+    for oid in base["OkupasiID"]:
+        kode = _kode_area(oid)
+        nomor[kode] = max(nomor.get(kode, 0), int(str(oid).rsplit("-", 1)[-1] or 0))
+
+    while len(rows) < n_okupasi:
+        src = base.iloc[int(rng.integers(len(base)))]
+        kode = _kode_area(src["OkupasiID"])
+        nomor[kode] = nomor.get(kode, 0) + 1
+        unit = split_skill_list(src["Unit_Kompetensi"])
+        kuk = split_skill_list(src["Kuk_Keywords"])
+        rng.shuffle(kuk)
+        nama = src["Okupasi"].replace("Junior ", "").replace("Senior ", "")
+        rows.append({
+            "OkupasiID": f"PON-{kode}-{nomor[kode]:02d}",
+            "Area_Fungsi": src["Area_Fungsi"],
+            "Okupasi": f"{rng.choice(TINGKAT)} {nama} ({rng.choice(DOMAIN)})",
+            "Unit_Kompetensi": ", ".join(unit),
+            "Kuk_Keywords": ", ".join(kuk[:max(2, len(kuk) - int(rng.integers(0, 2)))]),
+        })
+    return pd.DataFrame(rows, columns=KOLOM[SHEET_PON])
+
+
+def build_lokasi(rng):
+    """Nama kota/kabupaten + bobot: kota besar jauh lebih sering muncul"""
+    gaz = pd.read_csv(GAZETTEER_PATH)
+    gaz = gaz[gaz["tipe"].isin(["kota", "kabupaten"])].reset_index(drop=True)
+    bobot = np.where(gaz["tipe"] == "kota", 5.0, 1.0) * rng.lognormal(0.0, 0.7, len(gaz))
+    besar = gaz["nama"].str.contains("Jakarta|Bandung|Surabaya|Yogyakarta|Medan|Semarang|Makassar|Denpasar")
+    bobot = np.where(besar, bobot * 40, bobot)
+    return gaz["nama"].to_numpy(), bobot / bobot.sum()
+
+
+def build_perusahaan(rng, n=2_000):
+    kata = np.array(KATA_PERUSAHAAN)
+    a = rng.choice(kata, n)
+    b = rng.choice(kata, n)
+    return np.array([f"PT. {x} {y}" if x != y else f"PT. {x}" for x, y in zip(a, b)])
+
+
+class Master:
+    """Data referensi bersama semua chunk"""
+
+    def __init__(self, base_pon, n_okupasi, seed):
+        rng = np.random.default_rng([seed, 0])
+        self.pon = build_pon(base_pon, n_okupasi, rng)
+        self.lokasi, self.bobot_lokasi = build_lokasi(rng)
+        self.perusahaan = build_perusahaan(rng)
+        # Popularitas okupasi ~ Zipf: beberapa okupasi mendominasi
+        pop = 1.0 / np.arange(1, len(self.pon) + 1) ** 0.8
+        rng.shuffle(pop)
+        self.bobot_okupasi = pop / pop.sum()
+        self.skill_okupasi = [
+            split_skill_list(f"{r.Unit_Kompetensi}, {r.Kuk_Keywords}") or ["Komunikasi"]
+            for r in self.pon.itertuples()
+        ]
+
+
+# ========================================
+# GENERATOR PER CHUNK
+# ========================================
+def _ids(prefix, start, n, width):
+    return [f"{prefix}-{i:0{width}d}" for i in range(start + 1, start + n + 1)]
+
+
+def _tanggal(rng, n, awal="2010-01-01", akhir="2025-06-30"):
+    lo = np.datetime64(awal, "D").astype(np.int64)
+    hi = np.datetime64(akhir, "D").astype(np.int64)
+    return rng.integers(lo, hi, n).astype("datetime64[D]")
+
+
+def generate_talenta_chunk(master, start, n, offsets, widths, seed, chunk_no):
+    """
+    Talenta [start, start+n) beserta anak-anaknya.
+    offsets: dict sheet -> jumlah baris sebelum chunk ini (untuk ID berurutan)
+    """
+    rng = np.random.default_rng([seed, 1, chunk_no])
+    talent_ids = _ids("TAL", start, n, widths["TAL"])
+    okupasi_idx = rng.choice(len(master.pon), n, p=master.bobot_okupasi)
+    depan = rng.choice(NAMA_DEPAN, n)
+    belakang = rng.choice(NAMA_BELAKANG, n)
+    lokasi = rng.choice(master.lokasi, n, p=master.bobot_lokasi)
+    tahun_exp = rng.integers(0, 15, n)
+    okupasi_nama = master.pon["Okupasi"].to_numpy()[okupasi_idx]
+    area = master.pon["Area_Fungsi"].to_numpy()[okupasi_idx]
+
+    # Skill per talenta: 2-10 dari vocabulary okupasinya
+    n_skill = np.clip(rng.poisson(3, n) + 2, 2, 10)
+    skills_talenta = []
+    for i in range(n):
+        vocab = master.skill_okupasi[okupasi_idx[i]]
+        k = min(int(n_skill[i]), len(vocab))
+        skills_talenta.append([vocab[j] for j in rng.choice(len(vocab), k, replace=False)])
+
+    # --- Keterampilan_Sertifikasi
+    skill_rows = []
+    for i, skills in enumerate(skills_talenta):
+        for s in skills:
+            skill_rows.append((talent_ids[i], s, "Keterampilan", "(null)", LEVEL_SKILL[min(2, tahun_exp[i] // 4)]))
+        if rng.random() < 0.25:
+            nama, lembaga = SERTIFIKASI[int(rng.integers(len(SERTIFIKASI)))]
+            skill_rows.append((talent_ids[i], nama, "Sertifikasi", lembaga, "(null)"))
+    df_skill = pd.DataFrame(skill_rows, columns=KOLOM[SHEET_SKILL][1:])
+    df_skill.insert(0, "SkillID", _ids("SKILL", offsets[SHEET_SKILL], len(df_skill), widths["SKILL"]))
+
+    # --- Riwayat_Pendidikan: 1-3 per talenta
+    n_pend = rng.choice([1, 2, 3], n, p=[0.6, 0.3, 0.1])
+    idx = np.repeat(np.arange(n), n_pend)
+    m = len(idx)
+    tahun_lulus = (2025 - tahun_exp[idx] - rng.integers(0, 3, m)).astype(int)
+    df_pend = pd.DataFrame({
+        "PendidikanID": _ids("PEND", offsets[SHEET_PENDIDIKAN], m, widths["PEND"]),
+        "TalentID": np.array(talent_ids)[idx],
+        "Institusi": rng.choice(INSTITUSI, m),
+        "Jenjang": rng.choice(JENJANG, m, p=[0.2, 0.65, 0.15]),
+        "Jurusan": rng.choice(JURUSAN, m),
+        "Tahun_Lulus": tahun_lulus,
+    })
+
+    # --- Riwayat_Pekerjaan: 0-6 per talenta, pekerjaan terakhir sering masih berjalan
+    n_kerja = np.clip(rng.poisson(np.minimum(tahun_exp, 8) / 3 + 0.8), 0, 6)
+    idx = np.repeat(np.arange(n), n_kerja)
+    m = len(idx)
+    mulai = _tanggal(rng, m)
+    selesai = mulai + rng.integers(180, 1500, m).astype("timedelta64[D]")
+    terakhir = np.r_[idx[1:] != idx[:-1], True] if m else np.array([], dtype=bool)
+    masih = terakhir & (rng.random(m) < 0.6)
+    deskripsi = []
+    for j, i in enumerate(idx):
+        s = skills_talenta[i]
+        pola = DESKRIPSI_KERJA[j % len(DESKRIPSI_KERJA)]
+        deskripsi.append(pola.format(s1=s[j % len(s)], s2=s[(j + 1) % len(s)], area=area[i]))
+    df_kerja = pd.DataFrame({
+        "PengalamanID": _ids("KERJA", offsets[SHEET_PEKERJAAN], m, widths["KERJA"]),
+        "TalentID": np.array(talent_ids)[idx],
+        "Perusahaan": rng.choice(master.perusahaan, m),
+        "Posisi": okupasi_nama[idx],
+        "Deskripsi": deskripsi,
+        "Tanggal_Mulai": pd.to_datetime(mulai),
+        "Tanggal_Selesai": pd.Series(pd.to_datetime(selesai), dtype=object).where(~masih, "(null)"),
+    })
+
+    # --- Talenta
+    nama = [f"{a} {b}" for a, b in zip(depan, belakang)]
+    slug = [f"{a}{b}{k}".lower() for a, b, k in zip(depan, belakang, range(start + 1, start + n + 1))]
+    profil = [
+        f"{okupasi_nama[i]} dengan {tahun_exp[i]} tahun pengalaman. Menguasai {', '.join(skills_talenta[i][:3])}."
+        for i in range(n)
+    ]
+    kerja_per_talenta = df_kerja.groupby("TalentID", sort=False)["Deskripsi"].agg(" ".join)
+    cv = [
+        f"{nama[i]}\n{slug[i]}@example.com | linkedin.com/in/{slug[i]}\n{lokasi[i]}\n"
+        f"{profil[i]} Pengalaman: {kerja_per_talenta.get(talent_ids[i], '-')} "
+        f"Skill: {', '.join(skills_talenta[i])}."
+        for i in range(n)
+    ]
+    df_talenta = pd.DataFrame({
+        "TalentID": talent_ids,
+        "Nama": nama,
+        "Email": [f"{s}@example.com" for s in slug],
+        "Lokasi": lokasi,
+        "Profil_Singkat": profil,
+        "LinkedIn_URL": [f"/in/{s}" for s in slug],
+        "Raw_CV_Text": cv,
+    })
+
+    # --- Hasil_Pemetaan_Asesmen: ~70% talenta sudah dipetakan
+    sudah = np.flatnonzero(rng.random(n) < 0.7)
+    m = len(sudah)
+    benar = rng.random(m) < 0.85
+    mapped = np.where(benar, okupasi_idx[sudah], rng.integers(0, len(master.pon), m))
+    skor_asesmen = np.clip(rng.normal(68, 15, m), 0, 100).round().astype(int)
+    df_hasil = pd.DataFrame({
+        "HasilID": _ids("HASIL", offsets[SHEET_HASIL], m, widths["HASIL"]),
+        "TalentID": np.array(talent_ids)[sudah],
+        "OkupasiID_Mapped": master.pon["OkupasiID"].to_numpy()[mapped],
+        "Skor_Kecocokan_Awal": np.round(np.where(benar, rng.uniform(0.3, 0.9, m), rng.uniform(0.05, 0.4, m)), 4),
+        "Skor_Asesmen": skor_asesmen,
+        "Level_Kompetensi": [level_for_score(s) for s in skor_asesmen],
+        "Gap_Keterampilan": [
+            ", ".join(s for s in master.skill_okupasi[k] if s not in skills_talenta[i])[:200] or "-"
+            for i, k in zip(sudah, mapped)
+        ],
+        "Tanggal_Update": pd.to_datetime(_tanggal(rng, m, "2024-01-01", "2025-06-30")),
+    })
+
+    return {
+        SHEET_TALENTA: df_talenta,
+        SHEET_PENDIDIKAN: df_pend,
+        SHEET_PEKERJAAN: df_kerja,
+        SHEET_SKILL: df_skill,
+        SHEET_HASIL: df_hasil,
+    }
+
+
+def generate_lowongan(master, n, seed, width):
+    rng = np.random.default_rng([seed, 2])
+    okupasi_idx = rng.choice(len(master.pon), n, p=master.bobot_okupasi)
+    perusahaan = rng.choice(master.perusahaan, n)
+    keterampilan = []
+    for k in okupasi_idx:
+        vocab = master.skill_okupasi[k]
+        pilih = rng.choice(len(vocab), min(len(vocab), int(rng.integers(3, 6))), replace=False)
+        keterampilan.append(", ".join(vocab[j] for j in pilih))
+    posisi = master.pon["Okupasi"].to_numpy()[okupasi_idx]
+    return pd.DataFrame({
+        "LowonganID": _ids("LOW", 0, n, width),
+        "Perusahaan": perusahaan,
+        "Posisi": posisi,
+        "Deskripsi_Pekerjaan": [f"Dibutuhkan {p} untuk tim {a} di {c}." for p, a, c in zip(
+            posisi, master.pon["Area_Fungsi"].to_numpy()[okupasi_idx], perusahaan)],
+        "Keterampilan_Dibutuhkan": keterampilan,
+        "Lokasi": rng.choice(master.lokasi, n, p=master.bobot_lokasi),
+    })
+
+
+# ========================================
+# WRITER
+# ========================================
+class _Writers:
+    """Tulis chunk ke CSV / Parquet / xlsx secara streaming, per sheet"""
+
+    def __init__(self, output_dir, formats, tulis_xlsx):
+        self.output_dir = output_dir
+        self.formats = formats
+        self.parquet = {}
+        self.csv_started = set()
+        self.wb = None
+        self.ws = {}
+        if "csv" in formats:
+            os.makedirs(os.path.join(output_dir, "csv"), exist_ok=True)
+        if "parquet" in formats:
+            os.makedirs(os.path.join(output_dir, "parquet"), exist_ok=True)
+        if tulis_xlsx:
+            from openpyxl import Workbook
+            self.wb = Workbook(write_only=True)
+            for sheet in KOLOM:
+                ws = self.wb.create_sheet(sheet)
+                ws.append([])
+                ws.append([None] + KOLOM[sheet])
+                self.ws[sheet] = ws
+
+    def write(self, sheet, df):
+        if "csv" in self.formats:
+            path = os.path.join(self.output_dir, "csv", f"{sheet}.csv")
+            df.to_csv(path, mode="a" if sheet in self.csv_started else "w",
+                      header=sheet not in self.csv_started, index=False)
+            self.csv_started.add(sheet)
+        if "parquet" in self.formats:
+            self._write_parquet(sheet, df)
+        if self.wb is not None:
+            ws = self.ws[sheet]
+            for row in df.itertuples(index=False, name=None):
+                ws.append((None,) + tuple(v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in row))
+
+    def _write_parquet(self, sheet, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Kolom campuran (tanggal / "(null)") disimpan sebagai string
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].map(lambda v: v.strftime("%Y-%m-%d %H:%M:%S") if isinstance(v, pd.Timestamp) else v).astype(str)
+        writer = self.parquet.get(sheet)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if writer is None:
+            path = os.path.join(self.output_dir, "parquet", f"{sheet}.parquet")
+            writer = self.parquet[sheet] = pq.ParquetWriter(path, table.schema)
+        writer.write_table(table.cast(writer.schema))
+
+    def close(self):
+        for writer in self.parquet.values():
+            writer.close()
+        if self.wb is not None:
+            self.wb.save(os.path.join(self.output_dir, "DTP_Database.xlsx"))
+
+
+def _width(n):
+    return max(3, len(str(n)))
+
+
+def generate(scale=1.0, seed=42, formats=FORMATS, output_dir=None, n_okupasi=DEFAULT_OKUPASI,
+             base_workbook=EXCEL_PATH, log=print):
+    """Bangkitkan dataset; return dict sheet -> jumlah baris"""
+    n_talenta = max(1, int(round(BASE_TALENTA * scale)))
+    n_lowongan = max(1, int(round(BASE_LOWONGAN * scale)))
+    output_dir = output_dir or os.path.join("data", "synthetic", f"scale_{scale:g}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    master = Master(read_sheet(base_workbook, SHEET_PON), n_okupasi, seed)
+
+    # Perkiraan baris terbanyak (pekerjaan/skill ~6 per talenta) untuk cek batas xlsx
+    tulis_xlsx = "xlsx" in formats and n_talenta * 7 <= XLSX_MAX_ROWS
+    if "xlsx" in formats and not tulis_xlsx:
+        log(f"⚠️  xlsx dilewati: ~{n_talenta * 7:,} baris melebihi batas Excel {XLSX_MAX_ROWS:,} baris/sheet")
+
+    widths = {p: _width(n_talenta * 12) for p in ("SKILL", "PEND", "KERJA", "HASIL")}
+    widths["TAL"] = _width(n_talenta)
+    writers = _Writers(output_dir, formats, tulis_xlsx)
+    counts = dict.fromkeys(KOLOM, 0)
+
+    t0 = time.perf_counter()
+    writers.write(SHEET_PON, master.pon)
+    counts[SHEET_PON] = len(master.pon)
+    df_low = generate_lowongan(master, n_lowongan, seed, _width(n_lowongan))
+    writers.write(SHEET_LOWONGAN, df_low)
+    counts[SHEET_LOWONGAN] = len(df_low)
+
+    for chunk_no, start in enumerate(range(0, n_talenta, CHUNK_TALENTA)):
+        n = min(CHUNK_TALENTA, n_talenta - start)
+        frames = generate_talenta_chunk(master, start, n, counts, widths, seed, chunk_no)
+        for sheet, df in frames.items():
+            writers.write(sheet, df)
+            counts[sheet] += len(df)
+        log(f"  talenta {start + n:>12,} / {n_talenta:,}  ({time.perf_counter() - t0:.1f}s)")
+
+    writers.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Kelipatan skala dasar (1 = 100k talenta)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--okupasi", type=int, default=DEFAULT_OKUPASI, help="Jumlah okupasi PON")
+    parser.add_argument("--output-dir", help="Default: data/synthetic/scale_<scale>")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    counts = generate(args.scale, args.seed, args.formats, args.output_dir, args.okupasi)
+    print(f"\nSelesai dalam {time.perf_counter() - t0:.1f}s ({datetime.now():%Y-%m-%d %H:%M})")
+    for sheet, n in counts.items():
+        print(f"  {sheet:<28} {n:>12,} baris")
+
+
+if __name__ == "__main__":
+    main()
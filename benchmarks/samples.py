@@ -0,0 +1,126 @@
+"""
+DATA SAMPEL BENCHMARK
+CV sintetis (teks, PDF, DOCX) dan payload JSON berukuran naik bertahap,
+deterministik lewat seed supaya hasil antar run bisa dibandingkan.
+"""
+
+import io
+import json
+import random
+
+import docx
+
+KALIMAT = [
+    "Berpengalaman membangun REST API dengan Python, FastAPI dan PostgreSQL.",
+    "Mengelola pipeline CI/CD menggunakan Jenkins, Docker dan Kubernetes di AWS.",
+    "Melakukan analisis data penjualan dengan SQL, Pandas dan Power BI.",
+    "Mendesain ulang aplikasi mobile di Figma, termasuk user research dan prototyping.",
+    "Monitoring keamanan jaringan 24/7 menggunakan SIEM dan analisis log.",
+    "Membuat model machine learning dengan scikit-learn dan TensorFlow.",
+    "Menulis test script otomatis dengan Selenium, Cypress dan Postman.",
+    "Mengkonfigurasi router Mikrotik, VLAN dan subnetting untuk kantor cabang.",
+    "Led a team of five engineers delivering microservices on Google Cloud.",
+    "Implemented state management and responsive layout with ReactJS and TypeScript.",
+]
+
+KOTA = ["Jakarta Selatan", "Bandung", "Surabaya", "Yogyakarta", "Medan", "Makassar", "Denpasar"]
+
+
+def make_cv_text(rng: random.Random, n_paragraf: int) -> str:
+    """CV sintetis: baris nama, kontak, lalu n paragraf pengalaman"""
+    nama = f"Talenta Uji {rng.randint(1, 99999)}"
+    header = [
+        nama,
+        f"{nama.lower().replace(' ', '.')}@contoh.id | linkedin.com/in/talenta-{rng.randint(1, 9999)}",
+        f"Domisili: {rng.choice(KOTA)}",
+    ]
+    paragraf = [" ".join(rng.choices(KALIMAT, k=4)) for _ in range(n_paragraf)]
+    return "\n".join(header + paragraf)
+
+
+def make_profiles(n: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [make_cv_text(rng, rng.randint(1, 4)) for _ in range(n)]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str, baris_per_halaman: int = 50) -> bytes:
+    """PDF minimal (Helvetica, satu kolom teks) tanpa dependensi penulis PDF"""
+    lines = []
+    for paragraf in text.split("\n"):
+        while len(paragraf) > 95:
+            potong = paragraf.rfind(" ", 0, 95)
+            potong = potong if potong > 0 else 95
+            lines.append(paragraf[:potong])
+            paragraf = paragraf[potong:].lstrip()
+        lines.append(paragraf)
+    halaman = [lines[i:i + baris_per_halaman] for i in range(0, len(lines), baris_per_halaman)] or [[]]
+
+    objects = []  # isi objek ke-(i+1)
+    n = len(halaman)
+    # 1: catalog, 2: pages, 3: font, lalu per halaman: page + content
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, isi in enumerate(halaman):
+        teks = "".join(f"({_pdf_escape(b)}) '\n" for b in isi)
+        stream = f"BT /F1 10 Tf 14 TL 40 800 Td\n{teks}ET".encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(text: str) -> bytes:
+    doc = docx.Document()
+    for paragraf in text.split("\n"):
+        doc.add_paragraph(paragraf)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def make_questions(n: int, seed: int = 42):
+    """Soal asesmen + jawaban acak (setengah benar)"""
+    rng = random.Random(seed)
+    questions = [
+        {"id": i + 1, "pertanyaan": f"Soal {i + 1}", "pilihan": {k: k for k in "ABCD"},
+         "jawaban_benar": rng.choice("ABCD")}
+        for i in range(n)
+    ]
+    answers = {q["id"]: q["jawaban_benar"] if rng.random() < 0.5 else "A" for q in questions}
+    return answers, questions
+
+
+def make_gemini_payload(n_soal: int, seed: int = 42) -> str:
+    """Respons JSON 'kotor' ala LLM: escape invalid, control char, koma hilang antar objek"""
+    rng = random.Random(seed)
+    objek = []
+    for i in range(n_soal):
+        soal = json.dumps({
+            "id": i + 1,
+            "pertanyaan": f"Apa fungsi utama {rng.choice(['Docker', 'SQL', 'REST API'])}?",
+            "pilihan": {"A": "Opsi A", "B": "Opsi B", "C": "Opsi C", "D": "Opsi D"},
+            "jawaban_benar": rng.choice("ABCD"),
+        }, ensure_ascii=False)
+        # Sisipkan kotoran yang biasa muncul: \' , \d, dan control char mentah
+        objek.append(soal.replace("?", "?\\' \x07").replace("Opsi A", "Opsi \\d A"))
+    return "[" + "\n".join(objek) + "]"
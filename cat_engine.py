@@ -0,0 +1,187 @@
+"""
+ASESMEN ADAPTIF (CAT, MODEL IRT 2PL)
+Peluang menjawab benar soal i pada kemampuan theta:
+
+    P_i(theta) = 1 / (1 + exp(-a_i * (theta - b_i)))
+
+a = daya beda (discrimination), b = tingkat kesulitan (difficulty).
+
+- Estimasi kemampuan: EAP di grid theta [-4, 4] dengan prior N(0, 1);
+  tetap terdefinisi walau semua jawaban benar / salah. Standard error =
+  simpangan baku posterior.
+- Soal berikutnya: informasi Fisher a^2 P (1 - P) terbesar di theta saat ini,
+  dari soal yang belum dijawab.
+- Berhenti: SE <= CAT_SE_TARGET (minimal CAT_MIN_ITEMS soal), CAT_MAX_ITEMS
+  tercapai, atau soal di bank habis.
+- Kalibrasi: a & b diestimasi dari kumpulan jawaban dengan marginal maximum
+  likelihood (EM di grid theta, prior lemah pada a & b), jadi tidak bergantung
+  pada estimasi theta per sesi yang masih kasar.
+
+Modul ini murni numpy; penyimpanan soal & jawaban ada di item_bank.py.
+"""
+
+import math
+
+import numpy as np
+
+from assessment import level_for_score
+from config import CAT_MAX_ITEMS, CAT_MIN_ITEMS, CAT_SE_TARGET
+
+THETA_GRID = np.linspace(-4.0, 4.0, 81)
+_PRIOR = np.exp(-0.5 * THETA_GRID ** 2)
+
+# Parameter soal baru (belum dikalibrasi) dan batasnya
+DEFAULT_A = 1.0
+DEFAULT_B = 0.0
+A_RANGE = (0.2, 3.0)
+B_RANGE = (-4.0, 4.0)
+
+# Prior kalibrasi: a ~ N(1, 0.5^2), b ~ N(0, 1.5^2)
+_A_PRIOR = (1.0, 0.5)
+_B_PRIOR = (0.0, 1.5)
+
+
+def prob_correct(theta, a, b):
+    """P(benar) model 2PL; theta/a/b boleh array (broadcast)"""
+    return 1.0 / (1.0 + np.exp(-np.asarray(a) * (np.asarray(theta) - np.asarray(b))))
+
+
+def information(theta, a, b):
+    """Informasi Fisher soal 2PL di theta"""
+    p = prob_correct(theta, a, b)
+    return np.asarray(a) ** 2 * p * (1.0 - p)
+
+
+def estimate_theta(responses):
+    """
+    EAP dari [(a, b, benar)]. Return: (theta, se); tanpa jawaban = prior (0, 1)
+    """
+    if not responses:
+        return 0.0, 1.0
+    a, b, u = (np.array(x, dtype=float) for x in zip(*responses))
+    p = prob_correct(THETA_GRID[:, None], a[None, :], b[None, :])
+    p = np.clip(p, 1e-9, 1 - 1e-9)
+    log_lik = (u * np.log(p) + (1 - u) * np.log(1 - p)).sum(axis=1)
+    post = _PRIOR * np.exp(log_lik - log_lik.max())
+    post /= post.sum()
+    theta = float((THETA_GRID * post).sum())
+    se = float(math.sqrt(((THETA_GRID - theta) ** 2 * post).sum()))
+    return theta, se
+
+
+def select_item(items, theta, answered=()):
+    """Soal (dict dengan a, b, item_id) berinformasi terbesar di theta; None jika habis"""
+    answered = set(answered)
+    sisa = [it for it in items if it["item_id"] not in answered]
+    if not sisa:
+        return None
+    info = information(theta, [it["a"] for it in sisa], [it["b"] for it in sisa])
+    return sisa[int(np.argmax(info))]
+
+
+def should_stop(n_answered, se, items_left, se_target=CAT_SE_TARGET,
+                min_items=CAT_MIN_ITEMS, max_items=CAT_MAX_ITEMS):
+    """Aturan berhenti CAT"""
+    if n_answered >= max_items or items_left == 0:
+        return True
+    return n_answered >= min_items and se <= se_target
+
+
+def theta_to_score(theta):
+    """Theta -> skor 0-100 (persentil normal baku), selaras dengan LEVEL_KOMPETENSI"""
+    return int(round(100 * 0.5 * (1 + math.erf(theta / math.sqrt(2)))))
+
+
+def result_for(theta):
+    """(skor, level) dari estimasi kemampuan akhir"""
+    skor = theta_to_score(theta)
+    return skor, level_for_score(skor)
+
+
+# ========================================
+# KALIBRASI
+# ========================================
+def fit_item(thetas, correct, trials=None, a=DEFAULT_A, b=DEFAULT_B, iterations=25):
+    """
+    Estimasi (a, b) satu soal: di setiap theta ada `correct` jawaban benar dari
+    `trials` percobaan (default 1, yaitu data mentah 0/1; bisa pecahan untuk
+    jumlah harapan EM). Fisher scoring (Hessian harapan, selalu definit
+    negatif) pada log-likelihood + prior. Return: (a, b)
+    """
+    theta = np.asarray(thetas, dtype=float)
+    u = np.asarray(correct, dtype=float)
+    n = np.ones_like(u) if trials is None else np.asarray(trials, dtype=float)
+    (a_mu, a_sd), (b_mu, b_sd) = _A_PRIOR, _B_PRIOR
+    for _ in range(iterations):
+        z = theta - b
+        p = prob_correct(theta, a, b)
+        w = n * p * (1 - p)
+        r = u - n * p
+        grad = np.array([
+            (r * z).sum() - (a - a_mu) / a_sd ** 2,
+            -a * r.sum() - (b - b_mu) / b_sd ** 2,
+        ])
+        h_ab = a * (w * z).sum()
+        hess = np.array([
+            [-(w * z * z).sum() - 1 / a_sd ** 2, h_ab],
+            [h_ab, -(a * a * w).sum() - 1 / b_sd ** 2],
+        ])
+        try:
+            step = np.linalg.solve(hess, grad)
+        except np.linalg.LinAlgError:
+            break
+        # Redam langkah besar supaya tidak melompat keluar rentang wajar
+        step *= min(1.0, 1.0 / max(abs(step).max(), 1e-12))
+        a = float(np.clip(a - step[0], *A_RANGE))
+        b = float(np.clip(b - step[1], *B_RANGE))
+        if abs(step).max() < 1e-4:
+            break
+    return a, b
+
+
+def calibrate(items, responses, min_responses=20, cycles=20):
+    """
+    Kalibrasi marginal maximum likelihood (EM Bock-Aitkin di THETA_GRID):
+    items {item_id: (a, b)}, responses [(sesi, item_id, benar)].
+    E-step: posterior theta tiap sesi; M-step: (a, b) tiap soal dengan
+    >= min_responses jawaban dari jumlah benar/percobaan harapan per titik grid.
+    Return: {item_id: (a, b, n_jawaban)}
+    """
+    ids = list(items)
+    posisi = {item_id: k for k, item_id in enumerate(ids)}
+    data = [(sesi, posisi[item_id], int(benar)) for sesi, item_id, benar in responses if item_id in posisi]
+    n_jawaban = np.zeros(len(ids), dtype=int)
+    if not data:
+        return {item_id: (*items[item_id], 0) for item_id in ids}
+
+    sesi_id = {}
+    s_idx = np.array([sesi_id.setdefault(s, len(sesi_id)) for s, _, _ in data])
+    i_idx = np.array([k for _, k, _ in data])
+    u = np.array([x for _, _, x in data], dtype=float)
+    np.add.at(n_jawaban, i_idx, 1)
+    a = np.array([items[i][0] for i in ids], dtype=float)
+    b = np.array([items[i][1] for i in ids], dtype=float)
+    log_prior = np.log(_PRIOR)
+
+    for _ in range(cycles):
+        # E-step: log-likelihood tiap sesi di setiap titik grid
+        p = np.clip(prob_correct(THETA_GRID[None, :], a[i_idx, None], b[i_idx, None]), 1e-9, 1 - 1e-9)
+        ll = np.zeros((len(sesi_id), len(THETA_GRID)))
+        np.add.at(ll, s_idx, u[:, None] * np.log(p) + (1 - u[:, None]) * np.log(1 - p))
+        post = ll + log_prior
+        post = np.exp(post - post.max(axis=1, keepdims=True))
+        post /= post.sum(axis=1, keepdims=True)
+
+        # Jumlah percobaan & benar harapan per soal per titik grid
+        trials = np.zeros((len(ids), len(THETA_GRID)))
+        benar = np.zeros_like(trials)
+        np.add.at(trials, i_idx, post[s_idx])
+        np.add.at(benar, i_idx, u[:, None] * post[s_idx])
+
+        # M-step
+        a_lama, b_lama = a.copy(), b.copy()
+        for k in np.flatnonzero(n_jawaban >= min_responses):
+            a[k], b[k] = fit_item(THETA_GRID, benar[k], trials[k], a[k], b[k])
+        if max(abs(a - a_lama).max(), abs(b - b_lama).max()) < 1e-3:
+            break
+    return {item_id: (float(a[k]), float(b[k]), int(n_jawaban[k])) for k, item_id in enumerate(ids)}
@@ -0,0 +1,126 @@
+"""
+RIWAYAT CHAT
+Penyimpanan percakapan Career Assistant di SQLite lokal, per percakapan
+(id acak yang ikut di URL halaman rekomendasi).
+
+Halaman hanya menyimpan jendela pesan terbaru di session_state; pesan
+lama dibaca per halaman saat diminta. Karena tersimpan di disk,
+percakapan bisa dilanjutkan setelah reconnect / refresh browser dan
+tidak menambah RAM server seiring panjangnya chat.
+
+Mode WAL: pembaca (render halaman) tidak tertahan oleh penulis.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from config import CHAT_DB_PATH, CHAT_RETENTION_DAYS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_message (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation TEXT NOT NULL,
+    talent_id TEXT,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_conversation ON chat_message (conversation, id);
+CREATE INDEX IF NOT EXISTS idx_chat_created ON chat_message (created);
+"""
+
+
+def _row_to_message(row):
+    msg_id, role, content, timestamp = row
+    return {"id": msg_id, "role": role, "content": content, "timestamp": timestamp}
+
+
+class ChatStore:
+    """Pesan chat per percakapan; satu koneksi SQLite per thread"""
+
+    def __init__(self, path=CHAT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        con = self._connect()
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(_SCHEMA)
+
+    def _connect(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=10)
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    def append(self, conversation, role, content, timestamp="", talent_id=None):
+        """Simpan satu pesan; return: dict pesan (dengan id)"""
+        con = self._connect()
+        with con:
+            cur = con.execute(
+                "INSERT INTO chat_message (conversation, talent_id, role, content, timestamp, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (conversation, talent_id, role, content, timestamp, time.time()),
+            )
+        return {"id": cur.lastrowid, "role": role, "content": content, "timestamp": timestamp}
+
+    def recent(self, conversation, limit):
+        """`limit` pesan terakhir, urut lama -> baru"""
+        rows = self._connect().execute(
+            "SELECT id, role, content, timestamp FROM chat_message "
+            "WHERE conversation = ? ORDER BY id DESC LIMIT ?",
+            (conversation, limit),
+        ).fetchall()
+        return [_row_to_message(r) for r in reversed(rows)]
+
+    def before(self, conversation, before_id, limit):
+        """Satu halaman pesan sebelum id `before_id`, urut lama -> baru"""
+        rows = self._connect().execute(
+            "SELECT id, role, content, timestamp FROM chat_message "
+            "WHERE conversation = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (conversation, before_id, limit),
+        ).fetchall()
+        return [_row_to_message(r) for r in reversed(rows)]
+
+    def has_before(self, conversation, before_id):
+        """Masih ada pesan lebih lama dari `before_id`?"""
+        return self._connect().execute(
+            "SELECT 1 FROM chat_message WHERE conversation = ? AND id < ? LIMIT 1",
+            (conversation, before_id),
+        ).fetchone() is not None
+
+    def clear(self, conversation):
+        """Hapus seluruh pesan satu percakapan (tombol reset)"""
+        con = self._connect()
+        with con:
+            con.execute("DELETE FROM chat_message WHERE conversation = ?", (conversation,))
+
+    def purge(self, older_than_days=CHAT_RETENTION_DAYS):
+        """Hapus pesan yang lebih tua dari `older_than_days` hari; return: jumlah baris"""
+        con = self._connect()
+        with con:
+            cur = con.execute(
+                "DELETE FROM chat_message WHERE created < ?",
+                (time.time() - older_than_days * 86400,),
+            )
+        return cur.rowcount
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_chat_store():
+    """Store bersama satu proses; pesan kedaluwarsa dibersihkan saat dibuat"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = ChatStore()
+                store.purge()
+                _store = store
+    return _store
@@ -0,0 +1,194 @@
+"""
+DETEKSI CV NEAR-DUPLICATE (MINHASH + LSH)
+Unggahan massal mitra sering berisi CV yang dikirim ulang atau hanya
+diedit sedikit. Daripada mem-parsing, memetakan, dan mengases ulang,
+CV baru dicocokkan ke profil yang sudah tersimpan:
+
+- Teks CV dinormalisasi (huruf kecil, token kata) lalu dipotong menjadi
+  shingle SHINGLE_SIZE kata berurutan.
+- Signature MinHash NUM_PERM nilai: minimum (a*h + b) mod p per
+  permutasi, dihitung vektor dengan numpy. Peluang dua nilai sama =
+  Jaccard similarity kedua himpunan shingle.
+- LSH: signature dibagi BANDS band x ROWS baris; CV yang sama persis di
+  minimal satu band menjadi kandidat. Kandidat diverifikasi dengan
+  estimasi Jaccard dari signature (>= DUPLICATE_THRESHOLD).
+
+Query = satu signature + BANDS lookup dict, jauh di bawah 1 ms. Signature
+disimpan di tabel cv_signature pada file profile store, jadi index
+dibangun ulang dari disk tanpa menghitung ulang semua CV.
+"""
+
+import re
+import threading
+import zlib
+
+import numpy as np
+
+import metrics
+from config import SHEET_TALENTA
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+# Estimasi Jaccard minimum untuk dianggap CV yang sama (diedit sedikit)
+DUPLICATE_THRESHOLD = 0.7
+
+# Prime Mersenne 2^31-1: a*h < 2^62 sehingga aman di uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN_RE = re.compile(r"\w+")
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS cv_signature (TalentID TEXT PRIMARY KEY, signature BLOB NOT NULL)"
+
+
+def shingles(text: str, size=SHINGLE_SIZE):
+    """Himpunan hash 32-bit dari shingle `size` kata (teks pendek: per kata)"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < size:
+        grams = tokens
+    else:
+        grams = (" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+    return {zlib.crc32(g.encode("utf-8")) for g in grams}
+
+
+class MinHasher:
+    """Permutasi hash (a, b) tetap per seed, supaya signature bisa disimpan & dibandingkan"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str):
+        """Signature MinHash (uint32[num_perm]); None jika teks tidak punya token"""
+        h = shingles(text)
+        if not h:
+            return None
+        x = np.fromiter(h, dtype=np.uint64, count=len(h)) % _PRIME
+        return ((np.outer(x, self._a) + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimasi Jaccard dari dua signature"""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class LshIndex:
+    """Index LSH di memori: band -> {isi band: set key}"""
+
+    def __init__(self, bands=BANDS, rows=ROWS):
+        self.bands = bands
+        self.rows = rows
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, sig):
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key, sig):
+        """Tambah / ganti signature untuk key"""
+        with self._lock:
+            self._remove(key)
+            self._signatures[key] = sig
+            for bucket, band in zip(self._buckets, self._band_keys(sig)):
+                bucket.setdefault(band, set()).add(key)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        lama = self._signatures.pop(key, None)
+        if lama is None:
+            return
+        for bucket, band in zip(self._buckets, self._band_keys(lama)):
+            isi = bucket.get(band)
+            if isi is not None:
+                isi.discard(key)
+                if not isi:
+                    del bucket[band]
+
+    def query(self, sig, threshold=DUPLICATE_THRESHOLD, exclude=None):
+        """Key dengan estimasi Jaccard >= threshold, urut dari paling mirip: [(key, skor)]"""
+        with self._lock:
+            kandidat = set()
+            for bucket, band in zip(self._buckets, self._band_keys(sig)):
+                kandidat.update(bucket.get(band, ()))
+            kandidat.discard(exclude)
+            hasil = [(key, similarity(sig, self._signatures[key])) for key in kandidat]
+        return sorted((h for h in hasil if h[1] >= threshold), key=lambda h: -h[1])
+
+
+class CvDuplicateIndex:
+    """LSH atas semua profil di profile store (key: TalentID), signature disimpan di SQLite"""
+
+    def __init__(self, store, hasher=None):
+        self.store = store
+        self.hasher = hasher or MinHasher()
+        self.lsh = LshIndex()
+        with store.transaction() as con:
+            con.execute(_SCHEMA)
+        self._load()
+
+    def _load(self):
+        """Muat signature tersimpan; hitung & simpan untuk profil yang belum punya"""
+        con = self.store._connect()
+        for talent_id, blob in con.execute("SELECT TalentID, signature FROM cv_signature"):
+            self.lsh.add(talent_id, np.frombuffer(blob, dtype=np.uint32))
+
+        baru = []
+        for talent_id, teks in con.execute(
+            f'SELECT t.TalentID, t.Raw_CV_Text FROM "{SHEET_TALENTA}" t '
+            "LEFT JOIN cv_signature s ON s.TalentID = t.TalentID "
+            "WHERE s.TalentID IS NULL AND t.Raw_CV_Text IS NOT NULL"
+        ).fetchall():
+            sig = self.hasher.signature(teks)
+            if sig is not None:
+                self.lsh.add(talent_id, sig)
+                baru.append((talent_id, sig.tobytes()))
+        if baru:
+            with self.store.transaction() as tx:
+                tx.executemany("INSERT OR REPLACE INTO cv_signature VALUES (?, ?)", baru)
+
+    def find(self, cv_text, exclude=None):
+        """
+        Profil tersimpan yang near-duplicate dengan CV ini.
+        Return: (TalentID, skor) paling mirip, atau None
+        """
+        with metrics.timer("cv_dedup.find"):
+            sig = self.hasher.signature(cv_text)
+            hasil = self.lsh.query(sig, exclude=exclude) if sig is not None else []
+        metrics.incr("cv_duplicate" if hasil else "cv_unique")
+        return hasil[0] if hasil else None
+
+    def add(self, talent_id, cv_text):
+        """Index / perbarui signature satu profil (setelah disimpan ke store)"""
+        sig = self.hasher.signature(cv_text or "")
+        if sig is None:
+            self.lsh.remove(talent_id)
+            return
+        self.lsh.add(talent_id, sig)
+        with self.store.transaction() as con:
+            con.execute("INSERT OR REPLACE INTO cv_signature VALUES (?, ?)", (talent_id, sig.tobytes()))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_cv_index():
+    """Index bersama satu proses di atas get_profile_store()"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from profile_store import get_profile_store
+
+                _index = CvDuplicateIndex(get_profile_store())
+    return _index
@@ -0,0 +1,100 @@
+"""
+CV PARSER
+Ekstrak teks dari file CV (PDF/DOCX), parsing data dasar (email, nama,
+LinkedIn, lokasi), dan teks profil untuk mapping PON.
+
+Tanpa ketergantungan ke Streamlit, supaya bisa dipakai halaman,
+benchmark, maupun API. pypdf & python-docx baru di-import saat
+file dengan format tersebut diekstrak.
+"""
+
+import io
+import re
+
+from config import EXCEL_PATH
+from gazetteer import extract_lokasi
+from metrics import timed
+from skill_extractor import load_skill_extractor
+from text_analyzer import tokenize
+
+_EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+_LINKEDIN_RE = re.compile(r'linkedin\.com/in/([\w-]+)', re.IGNORECASE)
+
+
+@timed()
+def extract_text_from_pdf(file_io):
+    """Ekstrak teks dari PDF"""
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_io)
+    return "".join(page.extract_text() or "" for page in reader.pages)
+
+
+@timed()
+def extract_text_from_docx(file_io):
+    """Ekstrak teks dari DOCX"""
+    import docx
+
+    doc = docx.Document(file_io)
+    return "".join(para.text + "\n" for para in doc.paragraphs)
+
+
+MIME_PDF = "application/pdf"
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def extract_text_from_upload(data: bytes, mime_type: str) -> str:
+    """Bytes file unggahan (PDF / DOCX / teks) -> teks CV"""
+    if mime_type == MIME_PDF:
+        return extract_text_from_pdf(io.BytesIO(data))
+    if mime_type == MIME_DOCX:
+        return extract_text_from_docx(io.BytesIO(data))
+    return data.decode("utf-8")
+
+
+@timed()
+def parse_cv_data(cv_text):
+    """
+    AI sederhana untuk parsing CV menggunakan Regex
+    Ekstrak: email, nama, lokasi, LinkedIn
+    """
+    data = {
+        "email": "",
+        "nama": "",
+        "linkedin": "",
+        "lokasi": "",
+        "full_text": cv_text
+    }
+
+    # 1. Ekstrak Email
+    email_match = _EMAIL_RE.search(cv_text)
+    if email_match:
+        data["email"] = email_match.group(0)
+
+    # 2. Ekstrak LinkedIn
+    linkedin_match = _LINKEDIN_RE.search(cv_text)
+    if linkedin_match:
+        data["linkedin"] = f"https://www.linkedin.com/in/{linkedin_match.group(1)}"
+
+    # 3. Ekstrak Nama (baris pertama biasanya)
+    first_line = cv_text.split('\n', 1)[0].strip()
+    if first_line and '@' not in first_line and len(first_line.split()) < 5:
+        data["nama"] = first_line.title()
+
+    # 4. Ekstrak Lokasi (gazetteer offline: provinsi, kabupaten/kota & alias)
+    data["lokasi"] = extract_lokasi(cv_text)
+
+    return data
+
+
+def extract_profile_entities(raw_cv: str, file_path=EXCEL_PATH):
+    """
+    Named Entity Recognition sederhana
+    Skill dari vocabulary PON/lowongan/sertifikasi (frasa utuh, mis. "machine learning")
+    di depan, lalu kata-kata penting: stopword ID/EN dibuang, istilah teknis pendek
+    (SQL, AWS, Go, UI) tetap ada. Urutan kemunculan dipertahankan.
+    """
+    skills = load_skill_extractor(file_path).extract_counts(raw_cv)
+    words = dict.fromkeys(tokenize(raw_cv))
+    profile_text = ' '.join(list(skills) + list(words))
+    return profile_text
@@ -0,0 +1,235 @@
+"""
+DATA LOADER
+Baca sheet dari workbook DTP tanpa ketergantungan ke Streamlit,
+supaya bisa dipakai halaman, script batch, maupun benchmark.
+
+`file_path` boleh berupa workbook .xlsx atau folder berisi
+<sheet>.parquet / <sheet>.csv (format cepat dari benchmarks.generate_dataset).
+
+Setiap sheet punya skema (SCHEMAS): hanya kolom yang dideklarasikan yang
+dibaca, kolom berulang (Lokasi, Okupasi, Level, ...) bertipe category,
+skor & tahun numerik nullable, tanggal datetime64, sisanya string.
+Sel kosong / "(null)" tetap NA (bukan string kosong): pemakai memakai
+text_of() / text_column() bila butuh teks.
+
+Bandingkan memori sebelum & sesudah skema:
+
+    python data_loader.py [data/DTP_Database.xlsx]
+"""
+
+import argparse
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from config import (
+    EXCEL_PATH, SHEET_HASIL, SHEET_LOWONGAN, SHEET_PEKERJAAN, SHEET_PENDIDIKAN,
+    SHEET_PON, SHEET_SKILL, SHEET_TALENTA
+)
+from metrics import register_cache
+
+STRING = "string"
+CATEGORY = "category"
+INT = "Int64"
+FLOAT = "Float64"
+DATETIME = "datetime64"
+
+# Skema per sheet: kolom -> tipe, urut sesuai sheet
+SCHEMAS = {
+    SHEET_TALENTA: {
+        "TalentID": STRING, "Nama": STRING, "Email": STRING, "Lokasi": CATEGORY,
+        "Profil_Singkat": STRING, "LinkedIn_URL": STRING, "Raw_CV_Text": STRING,
+    },
+    SHEET_PENDIDIKAN: {
+        "PendidikanID": STRING, "TalentID": STRING, "Institusi": CATEGORY, "Jenjang": CATEGORY,
+        "Jurusan": CATEGORY, "Tahun_Lulus": INT,
+    },
+    SHEET_PEKERJAAN: {
+        "PengalamanID": STRING, "TalentID": STRING, "Perusahaan": STRING, "Posisi": CATEGORY,
+        "Deskripsi": STRING, "Tanggal_Mulai": DATETIME, "Tanggal_Selesai": DATETIME,
+    },
+    SHEET_SKILL: {
+        "SkillID": STRING, "TalentID": STRING, "Nama_Skill_Sertifikasi": CATEGORY, "Tipe": CATEGORY,
+        "Lembaga_Penerbit": CATEGORY, "Level": CATEGORY,
+    },
+    SHEET_PON: {
+        "OkupasiID": STRING, "Area_Fungsi": CATEGORY, "Okupasi": CATEGORY,
+        "Unit_Kompetensi": STRING, "Kuk_Keywords": STRING,
+    },
+    SHEET_LOWONGAN: {
+        "LowonganID": STRING, "Perusahaan": STRING, "Posisi": CATEGORY, "Deskripsi_Pekerjaan": STRING,
+        "Keterampilan_Dibutuhkan": STRING, "Lokasi": CATEGORY,
+    },
+    SHEET_HASIL: {
+        "HasilID": STRING, "TalentID": STRING, "OkupasiID_Mapped": CATEGORY,
+        "Skor_Kecocokan_Awal": FLOAT, "Skor_Asesmen": FLOAT, "Level_Kompetensi": CATEGORY,
+        "Gap_Keterampilan": STRING, "Tanggal_Update": DATETIME,
+    },
+}
+
+# Penanda nilai kosong di workbook (selain sel kosong)
+NA_VALUES = ["(null)"]
+
+
+def read_sheet(file_path, sheet_name, columns=None):
+    """
+    Baca satu sheet (header di baris ke-2) sesuai skemanya; kolom di-strip,
+    nilai kosong tetap NA. `columns`: subset kolom skema yang dibutuhkan.
+    Sheet tanpa skema dibaca semua kolomnya.
+    """
+    schema = SCHEMAS.get(sheet_name)
+    wanted = set(columns or (schema or ()))
+    usecols = (lambda c: str(c).strip() in wanted) if wanted else None
+
+    if os.path.isdir(file_path):
+        df = _read_table_dir(file_path, sheet_name, usecols)
+    else:
+        df = pd.read_excel(file_path, sheet_name=sheet_name, header=1, usecols=usecols,
+                           na_values=NA_VALUES)
+    df.columns = df.columns.str.strip()
+    return apply_schema(df, sheet_name)
+
+
+def apply_schema(df, sheet_name):
+    """Ubah tipe kolom sesuai SCHEMAS[sheet_name]; kolom yang tidak ada dilewati"""
+    schema = SCHEMAS.get(sheet_name)
+    if not schema:
+        return df
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        if dtype == DATETIME:
+            if not pd.api.types.is_datetime64_any_dtype(s):
+                # Parquet/CSV bisa berisi campuran "YYYY-MM-DD" & "YYYY-MM-DD HH:MM:SS" dan "(null)"
+                s = pd.to_datetime(s.where(~s.isin(NA_VALUES)), errors="coerce", format="mixed")
+            df[col] = s
+        elif dtype in (INT, FLOAT):
+            angka = pd.to_numeric(s, errors="coerce").astype(FLOAT)
+            df[col] = angka.round().astype(INT) if dtype == INT else angka
+        else:
+            s = s.astype(STRING).str.strip().replace(NA_VALUES + [""], pd.NA)
+            df[col] = s.astype(CATEGORY) if dtype == CATEGORY else s
+    return df
+
+
+def text_of(value):
+    """Nilai sel sebagai teks; NA / None jadi string kosong"""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return ""
+    if isinstance(value, float) and value != value:
+        return ""
+    return str(value)
+
+
+def text_column(df, col):
+    """Kolom sebagai Series string tanpa NA (NA jadi string kosong)"""
+    return df[col].astype(STRING).fillna("")
+
+
+def source_signature(file_path, sheet_name=None):
+    """
+    Versi sumber data untuk kunci cache: (mtime_ns, ukuran) workbook, atau per
+    file tabel di folder dataset (hanya file sheet_name jika diberikan). mtime
+    folder tidak berubah saat file di dalamnya ditulis ulang, jadi tidak dipakai.
+    """
+    if not os.path.isdir(file_path):
+        st = os.stat(file_path)
+        return (st.st_mtime_ns, st.st_size)
+    hasil = []
+    for folder in (file_path, os.path.join(file_path, "parquet"), os.path.join(file_path, "csv")):
+        if not os.path.isdir(folder):
+            continue
+        for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+            nama, ext = os.path.splitext(entry.name)
+            if ext in (".parquet", ".csv") and sheet_name in (None, nama) and entry.is_file():
+                st = entry.stat()
+                hasil.append((os.path.relpath(entry.path, file_path), st.st_mtime_ns, st.st_size))
+    return tuple(hasil)
+
+
+def read_sheet_cached(file_path, sheet_name):
+    """
+    read_sheet dengan cache per proses (key: path, sheet, source_signature).
+    DataFrame dipakai bersama antar pemanggil: jangan dimutasi, .copy() dulu.
+    """
+    return _read_cached(file_path, sheet_name, source_signature(file_path, sheet_name))
+
+
+@lru_cache(maxsize=32)
+def _read_cached(file_path, sheet_name, signature):
+    return read_sheet(file_path, sheet_name)
+
+
+register_cache("sheet", lambda: _read_cached.cache_info()[:2])
+
+
+def _read_table_dir(folder, sheet_name, usecols=None):
+    """Cari <sheet>.parquet lalu <sheet>.csv di folder (atau subfolder parquet/ & csv/)"""
+    for sub, ext in (("parquet", "parquet"), ("csv", "csv")):
+        for path in (os.path.join(folder, f"{sheet_name}.{ext}"), os.path.join(folder, sub, f"{sheet_name}.{ext}")):
+            if not os.path.exists(path):
+                continue
+            if ext == "csv":
+                return pd.read_csv(path, usecols=usecols, na_values=NA_VALUES)
+            if usecols is not None:
+                import pyarrow.parquet as pq
+
+                kolom = [c for c in pq.read_schema(path).names if usecols(c)]
+                return pd.read_parquet(path, columns=kolom)
+            return pd.read_parquet(path)
+    raise FileNotFoundError(f"Sheet '{sheet_name}' tidak ditemukan di {folder}")
+
+
+# ========================================
+# LAPORAN MEMORI
+# ========================================
+def sheet_memory(df):
+    """Memori DataFrame (byte), termasuk isi string"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _read_sheet_lama(file_path, sheet_name):
+    """Cara baca sebelum ada skema: semua kolom, object, NaN jadi ''"""
+    if os.path.isdir(file_path):
+        df = _read_table_dir(file_path, sheet_name)
+    else:
+        df = pd.read_excel(file_path, sheet_name=sheet_name, header=1)
+    df.columns = df.columns.str.strip()
+    return df.astype(object).fillna('')
+
+
+def memory_report(file_path=EXCEL_PATH, sheets=tuple(SCHEMAS)):
+    """Memori per sheet tanpa vs dengan skema: [{sheet, rows, before, after}] (byte)"""
+    laporan = []
+    for sheet in sheets:
+        lama = _read_sheet_lama(file_path, sheet)
+        baru = read_sheet(file_path, sheet)
+        laporan.append({
+            "sheet": sheet,
+            "rows": len(baru),
+            "before": sheet_memory(lama),
+            "after": sheet_memory(baru),
+        })
+    return laporan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memori per sheet sebelum & sesudah skema")
+    parser.add_argument("file_path", nargs="?", default=EXCEL_PATH, help="workbook / folder dataset")
+    args = parser.parse_args()
+
+    total_lama = total_baru = 0
+    print(f"{'sheet':<28} {'baris':>10} {'sebelum':>12} {'sesudah':>12} {'hemat':>7}")
+    for r in memory_report(args.file_path):
+        total_lama += r["before"]
+        total_baru += r["after"]
+        hemat = 1 - r["after"] / r["before"] if r["before"] else 0.0
+        print(f"{r['sheet']:<28} {r['rows']:>10,} {r['before'] / 1024:>10.1f}KB {r['after'] / 1024:>10.1f}KB {hemat:>6.0%}")
+    hemat = 1 - total_baru / total_lama if total_lama else 0.0
+    print(f"{'TOTAL':<28} {'':>10} {total_lama / 1024:>10.1f}KB {total_baru / 1024:>10.1f}KB {hemat:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
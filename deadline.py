@@ -0,0 +1,54 @@
+"""
+DEADLINE PER PERMINTAAN
+Batas waktu absolut satu permintaan user, dibuat di halaman / handler API
+lalu diteruskan ke semua lapisan di bawahnya (assessment -> gemini_client
+-> rate limiter & HTTP). Setiap lapisan memakai sisa waktu, bukan timeout
+tetap sendiri, jadi total latensi yang dirasakan user tidak pernah melebihi
+deadline walaupun melewati antrian, retry, atau hedged request.
+
+    deadline = Deadline(GEMINI_DEADLINE_CHAT)
+    generate_content(prompt, deadline=deadline)
+"""
+
+import time
+
+
+class DeadlineExceeded(Exception):
+    """Sisa waktu permintaan tidak cukup untuk melanjutkan"""
+
+
+class RequestCancelled(Exception):
+    """Permintaan dihentikan pemanggil (mis. kalah dari hedged request)"""
+
+
+class Deadline:
+    """Titik waktu absolut (time.monotonic) batas sebuah permintaan"""
+
+    __slots__ = ("expires",)
+
+    def __init__(self, seconds):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        """Sisa waktu (detik, >= 0)"""
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0.0
+
+    def cap(self, seconds=None):
+        """min(seconds, sisa waktu); seconds None = sisa waktu"""
+        sisa = self.remaining()
+        return sisa if seconds is None else min(seconds, sisa)
+
+    def check(self, minimum=0.0):
+        """Raise DeadlineExceeded jika sisa waktu <= minimum detik"""
+        sisa = self.remaining()
+        if sisa <= minimum:
+            raise DeadlineExceeded(f"Sisa waktu {sisa:.1f} detik tidak cukup")
+        return sisa
+
+
+def remaining(deadline, default=None):
+    """Sisa waktu deadline yang boleh None (tanpa batas -> default)"""
+    return default if deadline is None else deadline.cap(default)
@@ -0,0 +1,269 @@
+"""
+EXPORT DATA (STREAMING, MEMORI KONSTAN)
+Baca baris dari data store per chunk lalu tulis langsung ke file,
+tanpa pernah membangun DataFrame atau workbook utuh di memori.
+
+Sumber:
+- Tabel talenta & hasil (STORE_SHEETS): profile store SQLite, SELECT per
+  chunk, jadi profil yang disimpan lewat aplikasi ikut terekspor
+- Sheet referensi lain (PON, lowongan): workbook dibaca streaming, folder
+  dataset (parquet/csv) lewat data_loader.read_sheet
+
+Format:
+- xlsx   : xlsxwriter constant_memory jika terpasang, selain itu openpyxl write-only
+- csv    : satu CSV per tabel di dalam ZIP (paling cepat)
+- parquet: satu Parquet per tabel di dalam ZIP (butuh pyarrow)
+"""
+
+import csv
+import io
+import os
+import tempfile
+import zipfile
+from itertools import islice
+
+from openpyxl import Workbook, load_workbook
+
+from config import (
+    EXCEL_PATH, SHEET_TALENTA, SHEET_PENDIDIKAN,
+    SHEET_PEKERJAAN, SHEET_SKILL, SHEET_HASIL
+)
+from data_loader import read_sheet
+from profile_store import STORE_SHEETS, columns, get_profile_store
+
+# Tabel yang diekspor dari dashboard
+EXPORT_SHEETS = [
+    SHEET_TALENTA, SHEET_PENDIDIKAN, SHEET_PEKERJAAN, SHEET_SKILL, SHEET_HASIL
+]
+
+# Jumlah baris per chunk saat streaming
+CHUNK_SIZE = 5000
+
+# Header tabel ada di baris ke-2 workbook (sama dengan header=1 di pandas)
+HEADER_ROW = 2
+
+FORMAT_EXPORT = {
+    "xlsx": ("DTP_Export.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("DTP_Export_csv.zip", "application/zip"),
+    "parquet": ("DTP_Export_parquet.zip", "application/zip"),
+}
+
+
+# ========================================
+# SUMBER DATA: BACA PER CHUNK
+# ========================================
+def _batched(iterable, size):
+    """Potong iterator menjadi list berukuran `size`"""
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def stream_excel_sheet(file_path, sheet_name, chunk_size=CHUNK_SIZE):
+    """
+    Baca sheet Excel dalam mode read-only, per chunk.
+    Kolom tanpa header (mis. kolom A kosong) dibuang.
+    Return: (header, iterator chunk list-of-tuple)
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    rows = wb[sheet_name].iter_rows(min_row=HEADER_ROW, values_only=True)
+    header_raw = next(rows, ())
+
+    keep = [i for i, h in enumerate(header_raw) if h is not None and str(h).strip()]
+    header = [str(header_raw[i]).strip() for i in keep]
+
+    def chunks():
+        try:
+            for batch in _batched(rows, chunk_size):
+                yield [tuple(r[i] if i < len(r) else None for i in keep) for r in batch]
+        finally:
+            wb.close()
+
+    return header, chunks()
+
+
+def stream_reference_sheet(file_path, sheet_name, chunk_size=CHUNK_SIZE):
+    """
+    Sheet referensi dari workbook (streaming) atau folder dataset (data_loader).
+    NA jadi None. Return: (header, iterator chunk list-of-tuple)
+    """
+    if not os.path.isdir(file_path):
+        return stream_excel_sheet(file_path, sheet_name, chunk_size)
+
+    df = read_sheet(file_path, sheet_name)
+
+    def chunks():
+        for start in range(0, len(df), chunk_size):
+            part = df.iloc[start:start + chunk_size].astype(object)
+            part = part.where(part.notna(), None)
+            yield list(part.itertuples(index=False, name=None))
+
+    return list(df.columns), chunks()
+
+
+def stream_table(store, file_path, sheet_name, chunk_size=CHUNK_SIZE):
+    """Tabel profil dari profile store, selain itu sheet referensi"""
+    if sheet_name in STORE_SHEETS:
+        return columns(sheet_name), store.iter_rows(sheet_name, chunk_size)
+    return stream_reference_sheet(file_path, sheet_name, chunk_size)
+
+
+# ========================================
+# WRITER
+# ========================================
+def write_xlsx(dest, tables):
+    """
+    Tulis tabel ke satu workbook, baris demi baris.
+    tables: list of (nama_sheet, header, chunks)
+    """
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        wb = xlsxwriter.Workbook(dest, {"constant_memory": True, "remove_timezone": True})
+        for name, header, chunks in tables:
+            ws = wb.add_worksheet(name[:31])
+            ws.write_row(0, 0, header)
+            r = 1
+            for chunk in chunks:
+                for row in chunk:
+                    ws.write_row(r, 0, row)
+                    r += 1
+        wb.close()
+        return
+
+    wb = Workbook(write_only=True)
+    for name, header, chunks in tables:
+        ws = wb.create_sheet(name[:31])
+        ws.append(header)
+        for chunk in chunks:
+            for row in chunk:
+                ws.append(row)
+    wb.save(dest)
+
+
+def write_csv_zip(dest, tables):
+    """Tulis setiap tabel sebagai CSV di dalam satu ZIP"""
+    with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, header, chunks in tables:
+            with zf.open(f"{name}.csv", "w") as raw:
+                f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for chunk in chunks:
+                    writer.writerows(chunk)
+                f.flush()
+                f.detach()
+
+
+def _arrow_schema(header, first_chunk):
+    """Tentukan tipe kolom dari chunk pertama: angka/tanggal jika konsisten, sisanya string"""
+    import datetime
+    import pyarrow as pa
+
+    fields = []
+    for i, name in enumerate(header):
+        values = [row[i] for row in first_chunk if row[i] is not None and row[i] != ""]
+        if values and all(isinstance(v, bool) for v in values):
+            tipe = pa.bool_()
+        elif values and all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            tipe = pa.int64()
+        elif values and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+            tipe = pa.float64()
+        elif values and all(isinstance(v, datetime.datetime) for v in values):
+            tipe = pa.timestamp("us")
+        else:
+            tipe = pa.string()
+        fields.append(pa.field(name, tipe))
+    return pa.schema(fields)
+
+
+def _arrow_batch(schema, chunk):
+    """Ubah chunk ke RecordBatch sesuai schema; nilai yang tidak cocok jadi null"""
+    import pyarrow as pa
+
+    arrays = []
+    for i, field in enumerate(schema):
+        column = [row[i] for row in chunk]
+        if pa.types.is_string(field.type):
+            column = [None if v is None else str(v) for v in column]
+        try:
+            arrays.append(pa.array(column, type=field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+            arrays.append(pa.array(
+                [_coerce_or_none(v, field.type) for v in column], type=field.type
+            ))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _coerce_or_none(value, tipe):
+    """Konversi satu nilai ke tipe Arrow, None jika gagal"""
+    import pyarrow as pa
+
+    try:
+        return pa.scalar(value, type=tipe).as_py()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return None
+
+
+def write_parquet_zip(dest, tables):
+    """Tulis setiap tabel sebagai Parquet (per chunk = row group) di dalam satu ZIP"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Export Parquet butuh paket 'pyarrow'")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, header, chunks in tables:
+            part_path = os.path.join(tmp_dir, f"{name}.parquet")
+            writer = None
+            for chunk in chunks:
+                if writer is None:
+                    writer = pq.ParquetWriter(part_path, _arrow_schema(header, chunk))
+                writer.write_batch(_arrow_batch(writer.schema, chunk))
+            if writer is None:
+                writer = pq.ParquetWriter(part_path, _arrow_schema(header, []))
+            writer.close()
+
+            # Pindahkan ke ZIP lalu hapus, agar disk sementara tidak menumpuk
+            zf.write(part_path, f"{name}.parquet")
+            os.remove(part_path)
+
+
+_WRITERS = {
+    "xlsx": write_xlsx,
+    "csv": write_csv_zip,
+    "parquet": write_parquet_zip,
+}
+
+
+# ========================================
+# ENTRY POINT
+# ========================================
+def export_tables(fmt, file_path=EXCEL_PATH, sheet_names=EXPORT_SHEETS, chunk_size=CHUNK_SIZE, store=None):
+    """
+    Export tabel ke file sementara di disk. Tabel profil dari `store`
+    (default: profile store bersama), sheet lain dari file_path.
+    Return: file object biner (posisi 0). File sudah di-unlink,
+            jadi otomatis hilang saat file object ditutup.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+
+    store = store or get_profile_store()
+    tables = (
+        (name, *stream_table(store, file_path, name, chunk_size))
+        for name in sheet_names
+    )
+
+    tmp = tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False)
+    tmp.close()
+    try:
+        _WRITERS[fmt](tmp.name, tables)
+        f = open(tmp.name, "rb")
+    finally:
+        os.remove(tmp.name)
+    return f
@@ -0,0 +1,225 @@
+"""
+GAZETTEER LOKASI INDONESIA (OFFLINE)
+Provinsi & kabupaten/kota beserta alias dan koordinat, tanpa geocoding online.
+
+Dipakai oleh:
+- parse_cv_data (halaman Profil Talenta) untuk mengenali lokasi di teks CV
+- Dashboard Nasional untuk join lokasi -> koordinat peta
+"""
+
+import csv
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config import GAZETTEER_PATH
+
+# Prioritas saat satu nama dipakai beberapa wilayah (mis. Kota & Kabupaten Bandung)
+_PRIORITAS_TIPE = ("kota", "kabupaten", "provinsi")
+
+# Awalan yang boleh ditulis sebelum nama wilayah
+_AWALAN = {
+    "kota": ("kota",),
+    "kabupaten": ("kabupaten", "kab"),
+    "provinsi": ("provinsi", "prov", "propinsi"),
+}
+
+# Nama wilayah yang juga kata umum: hanya cocok jika ditulis kapital di teks
+_KATA_AMBIGU = {
+    "agam", "alor", "aru", "badung", "banjar", "barru", "batang", "batu",
+    "batu bara", "bangka", "belu", "bima", "bone", "bula", "bungo", "buol",
+    "buru", "ende", "kampar", "karo", "kaur", "kepi", "kotabaru", "kuta",
+    "kudus", "landak", "lebak", "lima puluh kota", "lingga", "luwu", "malaka",
+    "malang", "maros", "metro", "muna", "mura", "padang", "pagar alam",
+    "paser", "pati", "poso", "pulang pisau", "puncak", "raha", "rote",
+    "sabang", "sarmi", "serang", "siak", "sigi", "soe", "solo", "sula",
+    "tanah datar", "tanah laut", "tanah merah", "tebing tinggi", "tebo",
+    "tegal", "teluk dalam", "toba", "tual", "wajo", "wates", "weda",
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_key(text) -> str:
+    """Normalisasi nama lokasi: huruf kecil, hanya kata, spasi tunggal"""
+    return " ".join(_TOKEN_RE.findall(str(text).lower()))
+
+
+class Gazetteer:
+    """
+    Indeks alias lokasi -> wilayah.
+
+    Pencocokan teks memakai lookup n-gram kata pada dict alias,
+    jadi satu CV dipindai sekali (linear terhadap jumlah kata).
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.labels = np.array([r["label"] for r in rows], dtype=object)
+        self.provinsi = np.array([r["provinsi"] for r in rows], dtype=object)
+        self.lat = np.array([r["lat"] for r in rows], dtype=float)
+        self.lon = np.array([r["lon"] for r in rows], dtype=float)
+
+        # alias (ternormalisasi) -> (index wilayah, wajib kapital?)
+        self.alias_index = {}
+        self._build_alias_index()
+
+        self._max_ngram = max(len(k.split()) for k in self.alias_index)
+        self._first_tokens = {k.split()[0] for k in self.alias_index}
+
+    def _add_alias(self, alias, idx):
+        key = normalize_key(alias)
+        if not key or key in self.alias_index:
+            return
+        ketat = key in _KATA_AMBIGU or len(key) <= 3 or alias.isupper()
+        self.alias_index[key] = (idx, ketat)
+
+    def _build_alias_index(self):
+        # 1. Alias manual dari CSV (prioritas tertinggi)
+        for idx, row in enumerate(self.rows):
+            for alias in row["alias"]:
+                self._add_alias(alias, idx)
+
+        # 2. Nama dengan awalan (Kota X, Kabupaten X, Provinsi X) selalu unik
+        for idx, row in enumerate(self.rows):
+            for awalan in _AWALAN[row["tipe"]]:
+                self._add_alias(f"{awalan} {row['nama']}", idx)
+
+        # 3. Nama polos, kota didahulukan
+        for tipe in _PRIORITAS_TIPE:
+            for idx, row in enumerate(self.rows):
+                if row["tipe"] == tipe:
+                    self._add_alias(row["nama"], idx)
+
+    # ----------------------------------------
+    # Lookup & pencocokan teks
+    # ----------------------------------------
+    def lookup(self, text):
+        """Cari wilayah dari nama/alias persis. Return: index atau None"""
+        hit = self.alias_index.get(normalize_key(text))
+        return hit[0] if hit else None
+
+    def find_all(self, text: str):
+        """
+        Temukan semua penyebutan lokasi di teks (leftmost-longest).
+        Return: list of (start, end, index_wilayah)
+        """
+        tokens = [(m.start(), m.end(), m.group(0)) for m in _TOKEN_RE.finditer(text)]
+        lowered = [t[2].lower() for t in tokens]
+        hasil = []
+
+        i = 0
+        while i < len(tokens):
+            if lowered[i] not in self._first_tokens:
+                i += 1
+                continue
+
+            matched = False
+            for n in range(min(self._max_ngram, len(tokens) - i), 0, -1):
+                hit = self.alias_index.get(" ".join(lowered[i:i + n]))
+                if hit is None:
+                    continue
+                idx, ketat = hit
+                surface = tokens[i][2]
+                if ketat and not (surface[0].isupper() or surface.isupper()):
+                    continue
+                hasil.append((tokens[i][0], tokens[i + n - 1][1], idx))
+                i += n
+                matched = True
+                break
+
+            if not matched:
+                i += 1
+
+        return hasil
+
+    def find_first(self, text: str):
+        """Return: index wilayah pertama yang disebut di teks, atau None"""
+        hasil = self.find_all(text)
+        return hasil[0][2] if hasil else None
+
+    def resolve(self, value):
+        """Nama persis dulu, jika gagal cari penyebutan di dalam teks"""
+        idx = self.lookup(value)
+        if idx is None:
+            idx = self.find_first(str(value))
+        return idx
+
+    # ----------------------------------------
+    # Join vektor: kolom lokasi -> koordinat
+    # ----------------------------------------
+    def geocode(self, lokasi: pd.Series) -> pd.DataFrame:
+        """
+        Geocode satu kolom lokasi sekaligus.
+        Hanya nilai unik yang di-resolve, lalu hasilnya disebar dengan indexing numpy.
+        Return: DataFrame (lokasi, provinsi, lat, lon) dengan index yang sama
+        """
+        values = lokasi.astype("string").fillna("")
+        kode, unik = pd.factorize(values)
+
+        idx_unik = np.array(
+            [-1 if (i := self.resolve(v)) is None else i for v in unik],
+            dtype=np.int64,
+        )
+        idx = idx_unik[kode] if len(unik) else np.full(len(values), -1)
+        ketemu = idx >= 0
+        aman = np.where(ketemu, idx, 0)
+
+        return pd.DataFrame(
+            {
+                "lokasi": np.where(ketemu, self.labels[aman], None),
+                "provinsi": np.where(ketemu, self.provinsi[aman], None),
+                "lat": np.where(ketemu, self.lat[aman], np.nan),
+                "lon": np.where(ketemu, self.lon[aman], np.nan),
+            },
+            index=lokasi.index,
+        )
+
+
+def _read_rows(path):
+    """Baca CSV gazetteer dan tentukan label tampilan setiap wilayah"""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = [
+            {
+                "tipe": r["tipe"].strip(),
+                "nama": r["nama"].strip(),
+                "provinsi": r["provinsi"].strip(),
+                "lat": float(r["lat"]),
+                "lon": float(r["lon"]),
+                "alias": [a.strip() for a in (r["alias"] or "").split("|") if a.strip()],
+            }
+            for r in csv.DictReader(f)
+        ]
+
+    # Label: nama polos, kecuali dipakai juga oleh wilayah berprioritas lebih tinggi
+    dipakai = set()
+    for tipe in _PRIORITAS_TIPE:
+        for row in rows:
+            if row["tipe"] != tipe:
+                continue
+            if row["nama"] in dipakai:
+                row["label"] = f"{tipe.title()} {row['nama']}"
+            else:
+                row["label"] = row["nama"]
+                dipakai.add(row["nama"])
+    return rows
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer(path: str = GAZETTEER_PATH) -> Gazetteer:
+    """Load gazetteer sekali per proses"""
+    return Gazetteer(_read_rows(path))
+
+
+def extract_lokasi(text: str) -> str:
+    """Lokasi pertama yang disebut di teks (label wilayah), atau string kosong"""
+    gaz = load_gazetteer()
+    idx = gaz.find_first(text)
+    return gaz.labels[idx] if idx is not None else ""
+
+
+def geocode_lokasi(lokasi: pd.Series) -> pd.DataFrame:
+    """Shortcut: geocode kolom lokasi dengan gazetteer bawaan"""
+    return load_gazetteer().geocode(lokasi)
@@ -0,0 +1,333 @@
+"""
+GEMINI CLIENT
+Satu requests.Session per proses dengan connection pool, dipakai bersama
+halaman asesmen & rekomendasi. Koneksi TLS ke API dipakai ulang antar
+request, bukan dibuka baru setiap panggilan.
+
+requests baru di-import saat session pertama dibuat; warmup.py membuka
+koneksi lebih dulu supaya request user pertama tidak membayar handshake.
+
+Setiap panggilan lewat rate limiter bersama (rate_limiter.py): antre sesuai
+prioritas, dan gagal cepat dengan RateLimitExceeded bila antrian terlalu
+panjang atau API membalas 429.
+
+Deadline & hedging:
+- `deadline` (deadline.Deadline) dari halaman membatasi antrian limiter dan
+  timeout HTTP dengan sisa waktunya, bukan timeout tetap.
+- Request yang belum selesai setelah persentil GEMINI_HEDGE_PERCENTILE
+  latensi (tahap gemini.http) dikirimi duplikat (hedge) bila limiter punya
+  slot saat itu juga. Hasil pertama yang berhasil dipakai; yang kalah
+  ditarik dari antrian, atau hasilnya dibuang bila sudah di jalan (HTTP
+  tidak bisa diputus, tapi timeout-nya tetap dibatasi deadline).
+- Deadline mepet / habis: respons terakhir untuk prompt yang sama
+  (cache LRU) atau `fallback` pemanggil; tanpa keduanya DeadlineExceeded.
+- Counter gemini_requests / gemini_hedged / gemini_hedge_won, gauge
+  gemini_hedge_rate & gemini_hedge_win_rate.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import metrics
+from config import (
+    GEMINI_API_KEY, GEMINI_BASE_URL, GEMINI_BURST, GEMINI_HEDGE_DELAY_DEFAULT, GEMINI_HEDGE_MIN_DELAY,
+    GEMINI_HEDGE_MIN_SAMPLES, GEMINI_HEDGE_PERCENTILE, GEMINI_LIMITER_DB, GEMINI_MAX_CONCURRENT,
+    GEMINI_MIN_REMAINING, GEMINI_MODEL, GEMINI_RATE_PER_MINUTE, GEMINI_RESPONSE_CACHE_SIZE
+)
+from deadline import Deadline, DeadlineExceeded, RequestCancelled  # noqa: F401 (re-export)
+from rate_limiter import (  # noqa: F401 (re-export untuk pemanggil)
+    PRIORITY_ASSESSMENT, PRIORITY_BACKGROUND, PRIORITY_CHAT, RateLimitExceeded, build_limiter
+)
+from single_flight import prompt_key
+
+# Koneksi maksimum yang disimpan di pool (≈ panggilan Gemini paralel)
+POOL_SIZE = 10
+
+# Timeout maksimum (detik) per request generateContent bila tanpa deadline;
+# dengan deadline dipakai sisa waktunya. Connect dibatasi terpisah
+TIMEOUT = 60
+CONNECT_TIMEOUT = 5
+
+# Jeda default setelah 429 tanpa header Retry-After (detik)
+RETRY_AFTER_DEFAULT = 30
+
+# Interval maksimum pemanggil memeriksa hasil / sinyal antrian (detik)
+POLL_INTERVAL = 0.25
+
+_session = None
+_session_lock = threading.Lock()
+_limiter = None
+
+# Thread request HTTP (request utama + hedge); pemanggil hanya menunggu hasil
+_pool = ThreadPoolExecutor(max_workers=POOL_SIZE * 2, thread_name_prefix="gemini")
+
+# Respons terakhir per prompt (cadangan saat deadline mepet)
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_session():
+    """Session bersama (dibuat saat pertama dipakai)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+                session.headers.update({"Content-Type": "application/json"})
+                _session = session
+    return _session
+
+
+def get_limiter():
+    """Rate limiter bersama (dibuat saat pertama dipakai, parameter dari config)"""
+    global _limiter
+    if _limiter is None:
+        with _session_lock:
+            if _limiter is None:
+                _limiter = build_limiter(
+                    GEMINI_RATE_PER_MINUTE, GEMINI_BURST, GEMINI_MAX_CONCURRENT, GEMINI_LIMITER_DB
+                )
+    return _limiter
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After", RETRY_AFTER_DEFAULT))
+    except ValueError:
+        return RETRY_AFTER_DEFAULT
+
+
+def _cache_get(key):
+    with _cache_lock:
+        hasil = _cache.get(key)
+        if hasil is not None:
+            _cache.move_to_end(key)
+        return hasil
+
+
+def _cache_put(key, text):
+    with _cache_lock:
+        _cache[key] = text
+        _cache.move_to_end(key)
+        while len(_cache) > GEMINI_RESPONSE_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def hedge_delay():
+    """Jeda sebelum hedge: persentil latensi gemini.http, default bila sampel belum cukup"""
+    p = metrics.quantile("gemini.http", GEMINI_HEDGE_PERCENTILE, GEMINI_HEDGE_MIN_SAMPLES)
+    return max(GEMINI_HEDGE_MIN_DELAY, GEMINI_HEDGE_DELAY_DEFAULT if p is None else p)
+
+
+def hedge_stats():
+    """
+    Jumlah request, hedge yang benar-benar dikirim, hedge yang ditolak limiter
+    (tidak ada slot saat itu), dan kemenangan hedge beserta rasionya
+    """
+    total = metrics.counter("gemini_requests")
+    hedged = metrics.counter("gemini_hedged")
+    refused = metrics.counter("gemini_hedge_refused")
+    won = metrics.counter("gemini_hedge_won")
+    return {
+        "requests": total, "hedged": hedged, "refused": refused, "won": won,
+        "hedge_rate": hedged / total if total else None,
+        "win_rate": won / hedged if hedged else None,
+    }
+
+
+metrics.register_gauge("gemini_hedge_rate", lambda: hedge_stats()["hedge_rate"])
+metrics.register_gauge("gemini_hedge_win_rate", lambda: hedge_stats()["win_rate"])
+
+
+def _post(url, payload, priority, max_wait, on_wait, cancel, deadline, timeout, on_start=None):
+    """
+    Satu percobaan generateContent (jalan di _pool). `on_start()` dipanggil
+    tepat sebelum HTTP dikirim (slot limiter sudah didapat).
+    Return: teks kandidat pertama
+    """
+    import requests
+
+    limiter = get_limiter()
+    with limiter.slot(priority, max_wait, on_wait, cancel):
+        if cancel.is_set():
+            raise RequestCancelled("Dibatalkan sebelum request dikirim")
+        read_timeout = timeout if deadline is None else deadline.cap(timeout)
+        if read_timeout <= 0:
+            raise DeadlineExceeded("Deadline habis sebelum request dikirim")
+        if on_start is not None:
+            on_start()
+        t0 = time.perf_counter()
+        try:
+            response = get_session().post(
+                url, params={"key": GEMINI_API_KEY}, json=payload,
+                timeout=(min(CONNECT_TIMEOUT, read_timeout), read_timeout),
+            )
+        except requests.Timeout as e:
+            if deadline is not None and read_timeout < timeout:
+                raise DeadlineExceeded(f"Gemini belum membalas sebelum deadline ({read_timeout:.1f} detik)") from e
+            raise
+    if response.status_code == 429:
+        jeda = _retry_after(response)
+        limiter.pause(jeda)
+        metrics.incr("gemini_429")
+        raise RateLimitExceeded(f"Kuota Gemini habis, coba lagi dalam {jeda:.0f} detik", eta=jeda)
+    response.raise_for_status()
+    result = response.json()
+    text = result['candidates'][0]['content']['parts'][0]['text']
+    metrics.observe("gemini.http", time.perf_counter() - t0)
+    return text
+
+
+def _post_hedge(*args):
+    """
+    _post untuk hedge: gemini_hedged dihitung hanya saat request benar-benar
+    dikirim; gagal sebelum itu (tanpa slot limiter, dibatalkan) = gemini_hedge_refused
+    """
+    dikirim = threading.Event()
+
+    def on_start():
+        dikirim.set()
+        metrics.incr("gemini_hedged")
+
+    try:
+        return _post(*args, on_start=on_start)
+    except Exception:
+        if not dikirim.is_set():
+            metrics.incr("gemini_hedge_refused")
+        raise
+
+
+def _hedged_call(url, payload, priority, max_wait, on_wait, deadline, timeout, hedge):
+    """
+    Request utama + (bila lambat) satu hedge; return hasil pertama yang berhasil.
+    Sinyal antrian diteruskan ke on_wait di thread pemanggil (aman untuk UI/job).
+    """
+    sinyal = queue.SimpleQueue()
+    teruskan = None if on_wait is None else (lambda posisi, eta: sinyal.put((posisi, eta)))
+    percobaan = []  # [(future, cancel, is_hedge)]
+
+    def mulai(is_hedge):
+        cancel = threading.Event()
+        fn = _post_hedge if is_hedge else _post
+        # Hedge hanya jika slot limiter tersedia saat ini juga (max_wait 0), tanpa sinyal antrian
+        future = _pool.submit(
+            fn, url, payload, priority, 0.0 if is_hedge else max_wait,
+            None if is_hedge else teruskan, cancel, deadline, timeout,
+        )
+        percobaan.append((future, cancel, is_hedge))
+
+    mulai(False)
+    hedge_at = time.monotonic() + hedge_delay() if hedge else None
+    try:
+        while True:
+            while not sinyal.empty():
+                on_wait(*sinyal.get())
+
+            for future, _, is_hedge in percobaan:
+                if future.done() and future.exception() is None:
+                    if is_hedge:
+                        metrics.incr("gemini_hedge_won")
+                    return future.result()
+            berjalan = [f for f, _, _ in percobaan if not f.done()]
+            if not berjalan:
+                # Semua gagal: error request utama yang dilaporkan
+                raise percobaan[0][0].exception()
+
+            now = time.monotonic()
+            if hedge_at is not None and now >= hedge_at:
+                hedge_at = None
+                if deadline is None or deadline.remaining() > GEMINI_MIN_REMAINING:
+                    mulai(True)
+                    continue
+
+            tunggu = [POLL_INTERVAL]
+            if hedge_at is not None:
+                tunggu.append(hedge_at - now)
+            if deadline is not None:
+                if deadline.expired():
+                    raise DeadlineExceeded("Deadline habis menunggu Gemini")
+                tunggu.append(deadline.remaining())
+            wait(berjalan, timeout=max(0.0, min(tunggu)), return_when=FIRST_COMPLETED)
+    finally:
+        # Yang kalah (atau semua, bila gagal / dibatalkan) keluar dari antrian limiter
+        for future, cancel, _ in percobaan:
+            cancel.set()
+            future.cancel()
+
+
+def _degrade(key, fallback, error):
+    """Deadline mepet: respons cache untuk prompt ini, lalu fallback; selain itu raise error"""
+    cached = _cache_get(key)
+    metrics.record_cache("gemini_deadline_cache", hit=cached is not None)
+    if cached is not None:
+        metrics.incr("gemini_deadline_cached")
+        return cached
+    if fallback is not None:
+        metrics.incr("gemini_deadline_fallback")
+        return fallback() if callable(fallback) else fallback
+    metrics.incr("gemini_deadline_exceeded")
+    raise error
+
+
+def generate_content(prompt: str, temperature: float = 0.7, max_output_tokens: int = 1500,
+                     timeout: float = TIMEOUT, priority: int = PRIORITY_CHAT,
+                     max_wait: float = None, on_wait=None, deadline: Deadline = None,
+                     hedge: bool = True, fallback=None) -> str:
+    """
+    POST generateContent ke model GEMINI_MODEL lewat rate limiter.
+    `priority`: PRIORITY_CHAT / PRIORITY_ASSESSMENT / PRIORITY_BACKGROUND.
+    `max_wait`: batas tunggu antrian (detik); `on_wait(posisi, eta)`: sinyal antrian.
+    `deadline`: batas total (Deadline); antrian & timeout HTTP memakai sisa waktunya.
+    `hedge`: kirim duplikat bila request lebih lambat dari persentil latensi.
+    `fallback`: teks / callable dipakai saat deadline mepet dan cache kosong.
+    Return: teks kandidat pertama. Raise RateLimitExceeded (antrian penuh / 429),
+    DeadlineExceeded (deadline habis tanpa cache/fallback), exception lain untuk
+    error HTTP / format respons.
+    """
+    url = f"{GEMINI_BASE_URL}/models/{GEMINI_MODEL}:generateContent"
+    payload = {
+        "contents": [{
+            "parts": [{"text": prompt}]
+        }],
+        "generationConfig": {
+            "temperature": temperature,
+            "maxOutputTokens": max_output_tokens
+        }
+    }
+    key = prompt_key(f"{temperature}|{max_output_tokens}|{prompt}")
+    if deadline is not None:
+        if deadline.remaining() <= GEMINI_MIN_REMAINING:
+            return _degrade(key, fallback, DeadlineExceeded("Sisa waktu tidak cukup untuk memanggil Gemini"))
+        max_wait = deadline.cap(max_wait)
+
+    metrics.incr("gemini_requests")
+    try:
+        text = _hedged_call(url, payload, priority, max_wait, on_wait, deadline, timeout, hedge)
+    except DeadlineExceeded as e:
+        return _degrade(key, fallback, e)
+    except RateLimitExceeded as e:
+        # Antrian lebih lama dari sisa deadline: sama dengan deadline habis
+        if deadline is not None and e.eta >= deadline.remaining():
+            return _degrade(key, fallback, e)
+        raise
+    _cache_put(key, text)
+    return text
+
+
+def warmup(timeout: float = 5.0):
+    """
+    Buka koneksi ke host Gemini (DNS + TLS) agar tersimpan di pool.
+    Status HTTP apa pun dianggap berhasil; return: (ok, pesan)
+    """
+    try:
+        response = get_session().head(GEMINI_BASE_URL, timeout=timeout)
+        return True, f"HTTP {response.status_code}"
+    except Exception as e:
+        return False, str(e)
@@ -11,8 +11,15 @@ FUNGSI:
 3. Mengarahkan user ke halaman yang sesuai
 """
 
+import hmac
+
+import pandas as pd
 import streamlit as st
 
+import metrics
+from config import ADMIN_TOKEN
+from gemini_client import get_limiter, hedge_stats
+
 # ========================================
 # KONFIGURASI HALAMAN
 # ========================================
@@ -24,6 +31,70 @@ st.set_page_config(
 )
 
 
+# ========================================
+# HALAMAN ADMIN TERSEMBUNYI: METRIK LATENSI
+# Buka dengan ?admin=<DTP_ADMIN_TOKEN>. Tidak muncul di sidebar.
+# ========================================
+def render_admin_metrics():
+    st.title("🛠️ Metrik Latensi per Tahap")
+
+    data = metrics.snapshot()
+
+    if data["stages"]:
+        df = pd.DataFrame(data["stages"])
+        for col in ["mean", "p50", "p95", "p99"]:
+            df[col] = (df[col] * 1000).round(2)
+        df = df.rename(columns={
+            "stage": "Tahap", "count": "Jumlah", "errors": "Error",
+            "mean": "Rata-rata (ms)", "p50": "p50 (ms)", "p95": "p95 (ms)", "p99": "p99 (ms)",
+        })
+        st.dataframe(df, hide_index=True, use_container_width=True)
+    else:
+        st.info("Belum ada sampel. Jalankan halaman lain terlebih dahulu.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Cache")
+        caches = pd.DataFrame([
+            {"Cache": nama, "Hit": s["hits"], "Miss": s["misses"],
+             "Hit Rate": f"{s['hit_rate']*100:.1f}%" if s["hit_rate"] is not None else "-"}
+            for nama, s in data["caches"].items()
+        ])
+        st.dataframe(caches, hide_index=True, use_container_width=True)
+    with col2:
+        st.markdown("#### Counter")
+        st.json(data["counters"])
+
+    st.markdown("#### Antrian Gemini")
+    antrian = get_limiter().status()
+    kol = st.columns(4)
+    kol[0].metric("Menunggu", antrian["antrian"])
+    kol[1].metric("Berjalan", f"{antrian['aktif']}/{antrian['maks_paralel']}")
+    kol[2].metric("Rata-rata Latensi", f"{antrian['rata_latensi_s']:.1f} s")
+    kol[3].metric("Estimasi Tunggu", f"{antrian['estimasi_tunggu_s']:.0f} s")
+
+    hedge = hedge_stats()
+    kol = st.columns(4)
+    kol[0].metric("Request Gemini", hedge["requests"])
+    kol[1].metric("Hedge", hedge["hedged"], help=f"Hedge ditolak limiter (tanpa slot): {hedge['refused']}")
+    kol[2].metric("Hedge Rate", f"{hedge['hedge_rate']*100:.1f}%" if hedge["hedge_rate"] is not None else "-")
+    kol[3].metric("Win Rate Hedge", f"{hedge['win_rate']*100:.1f}%" if hedge["win_rate"] is not None else "-")
+
+    teks = metrics.prometheus_text()
+    with st.expander("📈 Prometheus Text Format"):
+        st.code(teks, language="text")
+    st.download_button("⬇️ Download metrics.txt", teks, "metrics.txt", "text/plain; version=0.0.4")
+
+    if st.button("🔄 Reset Metrik"):
+        metrics.reset()
+        st.rerun()
+
+
+if ADMIN_TOKEN and hmac.compare_digest(str(st.query_params.get("admin", "")), ADMIN_TOKEN):
+    render_admin_metrics()
+    st.stop()
+
+
 # ========================================
 # CUSTOM CSS (STYLING)
 # ========================================
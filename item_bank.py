@@ -0,0 +1,274 @@
+"""
+BANK SOAL ASESMEN
+Soal pilihan ganda per okupasi PON beserta parameter IRT (a, b) dan
+seluruh jawaban peserta, di SQLite lokal (mode WAL).
+
+Soal hasil Gemini disimpan sekali (item_id = hash okupasi + teks soal,
+jadi soal kembar tidak tersimpan dua kali) lalu dipakai ulang oleh semua
+peserta; generate baru hanya saat bank okupasi tersebut kehabisan soal
+untuk sebuah sesi. Setiap jawaban dicatat per sesi (hanya INSERT, tanpa
+kalibrasi). Setelah CAT_CALIBRATE_EVERY jawaban baru, schedule_calibration()
+menjadwalkan kalibrasi ulang (cat_engine.calibrate) di runner jobs.py,
+paling sering sekali per CAT_CALIBRATE_INTERVAL detik per okupasi dan
+hanya dari CAT_CALIBRATE_WINDOW jawaban terbaru. Parameter baru ditulis
+dalam satu transaksi, jadi pembaca melihat set parameter lama atau baru,
+tidak pernah campuran.
+
+Kalibrasi manual / cron semua okupasi:
+
+    python item_bank.py calibrate
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import cat_engine
+import metrics
+from config import CAT_CALIBRATE_EVERY, CAT_CALIBRATE_INTERVAL, CAT_CALIBRATE_WINDOW, ITEM_BANK_PATH
+from jobs import get_runner
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS item (
+    item_id TEXT PRIMARY KEY,
+    okupasi_id TEXT NOT NULL,
+    teks TEXT NOT NULL,
+    opsi TEXT NOT NULL,
+    jawaban_benar TEXT NOT NULL,
+    a REAL NOT NULL,
+    b REAL NOT NULL,
+    n_respon_window INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_item_okupasi ON item (okupasi_id);
+CREATE TABLE IF NOT EXISTS response (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    okupasi_id TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_response_okupasi ON response (okupasi_id, id);
+CREATE TABLE IF NOT EXISTS calibration (
+    okupasi_id TEXT PRIMARY KEY,
+    last_response_id INTEGER NOT NULL,
+    calibrated REAL NOT NULL
+);
+"""
+
+
+def item_id_for(okupasi_id, teks):
+    """Id stabil soal: hash okupasi + teks soal (spasi & huruf besar diabaikan)"""
+    normal = " ".join(teks.lower().split())
+    return hashlib.sha1(f"{okupasi_id}\n{normal}".encode("utf-8")).hexdigest()[:16]
+
+
+def _row_to_item(row):
+    item_id, okupasi_id, teks, opsi, jawaban_benar, a, b, n_respon_window = row
+    return {
+        "item_id": item_id, "okupasi_id": okupasi_id, "teks": teks, "opsi": json.loads(opsi),
+        "jawaban_benar": jawaban_benar, "a": a, "b": b, "n_respon_window": n_respon_window,
+    }
+
+
+class ItemBank:
+    """Soal & jawaban per okupasi; satu koneksi SQLite per thread"""
+
+    def __init__(self, path=ITEM_BANK_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._calibration_jobs = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        con = self._connect()
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(_SCHEMA)
+        if "n_respon" in {r[1] for r in con.execute("PRAGMA table_info(item)")}:
+            # Bank lama: kolom ini hanya menghitung jawaban di jendela kalibrasi
+            con.execute("ALTER TABLE item RENAME COLUMN n_respon TO n_respon_window")
+
+    def _connect(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=10)
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    # ---------- soal ----------
+    def add_items(self, okupasi_id, questions):
+        """
+        Simpan soal (dict teks/opsi/jawaban_benar, mis. hasil normalize_questions);
+        soal yang sudah ada dilewati. Return: jumlah soal baru
+        """
+        now = time.time()
+        rows = [(
+            item_id_for(okupasi_id, q["teks"]), okupasi_id, q["teks"], json.dumps(q["opsi"], ensure_ascii=False),
+            q["jawaban_benar"], cat_engine.DEFAULT_A, cat_engine.DEFAULT_B, now,
+        ) for q in questions]
+        con = self._connect()
+        with con:
+            sebelum = con.total_changes
+            con.executemany(
+                "INSERT OR IGNORE INTO item (item_id, okupasi_id, teks, opsi, jawaban_benar, a, b, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows,
+            )
+            baru = con.total_changes - sebelum
+        metrics.incr("item_bank_added", baru)
+        return baru
+
+    def items_for(self, okupasi_id):
+        """Semua soal satu okupasi, dengan parameter IRT terbaru"""
+        rows = self._connect().execute(
+            "SELECT item_id, okupasi_id, teks, opsi, jawaban_benar, a, b, n_respon_window FROM item "
+            "WHERE okupasi_id = ? ORDER BY created, item_id", (okupasi_id,),
+        ).fetchall()
+        return [_row_to_item(r) for r in rows]
+
+    def count(self, okupasi_id=None):
+        if okupasi_id is None:
+            return self._connect().execute("SELECT COUNT(*) FROM item").fetchone()[0]
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM item WHERE okupasi_id = ?", (okupasi_id,)
+        ).fetchone()[0]
+
+    # ---------- jawaban ----------
+    def record_response(self, session, item, correct):
+        """Catat satu jawaban (kalibrasi lewat schedule_calibration)"""
+        con = self._connect()
+        with con:
+            con.execute(
+                "INSERT INTO response (session, item_id, okupasi_id, correct, created) VALUES (?, ?, ?, ?, ?)",
+                (session, item["item_id"], item["okupasi_id"], int(bool(correct)), time.time()),
+            )
+
+    def pending_responses(self, okupasi_id):
+        """Jumlah jawaban sejak kalibrasi terakhir okupasi ini"""
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM response WHERE okupasi_id = ? AND id > "
+            "COALESCE((SELECT last_response_id FROM calibration WHERE okupasi_id = ?), 0)",
+            (okupasi_id, okupasi_id),
+        ).fetchone()[0]
+
+    # ---------- kalibrasi ----------
+    def calibration_due(self, okupasi_id, every=CAT_CALIBRATE_EVERY, interval=CAT_CALIBRATE_INTERVAL):
+        """True jika ada >= every jawaban baru dan kalibrasi terakhir > interval detik lalu"""
+        row = self._connect().execute(
+            "SELECT calibrated FROM calibration WHERE okupasi_id = ?", (okupasi_id,)
+        ).fetchone()
+        if row is not None and time.time() - row[0] < interval:
+            return False
+        return self.pending_responses(okupasi_id) >= every
+
+    def schedule_calibration(self, okupasi_id, runner=None):
+        """
+        Jadwalkan kalibrasi okupasi di runner jobs jika sudah waktunya; paling
+        banyak satu job aktif per okupasi. Return: job_id atau None
+        """
+        runner = runner or get_runner()
+        with self._lock:
+            job_id = self._calibration_jobs.get(okupasi_id)
+            job = runner.get(job_id, touch=False) if job_id else None
+            if job is not None and not job.done:
+                return None
+            if not self.calibration_due(okupasi_id):
+                return None
+            job_id = runner.submit("kalibrasi", _job_kalibrasi, self, okupasi_id)
+            self._calibration_jobs[okupasi_id] = job_id
+        return job_id
+
+    def calibrate(self, okupasi_id, window=CAT_CALIBRATE_WINDOW):
+        """
+        Estimasi ulang a & b semua soal okupasi dari `window` jawaban terbaru;
+        n_respon_window = jumlah jawaban soal itu di jendela tersebut (bukan total).
+        EM berjalan di luar transaksi; hasil ditulis dalam satu transaksi dan
+        dibuang jika kalibrasi lain yang lebih baru sudah tersimpan lebih dulu.
+        Return: jumlah soal
+        """
+        con = self._connect()
+        with metrics.timer("item_bank.calibrate"):
+            items = {r[0]: (r[1], r[2]) for r in con.execute(
+                "SELECT item_id, a, b FROM item WHERE okupasi_id = ?", (okupasi_id,)
+            )}
+            responses = con.execute(
+                "SELECT id, session, item_id, correct FROM response WHERE okupasi_id = ? ORDER BY id DESC LIMIT ?",
+                (okupasi_id, window),
+            ).fetchall()[::-1]
+            if not items or not responses:
+                return 0
+            hasil = cat_engine.calibrate(items, [r[1:] for r in responses])
+            last_id = responses[-1][0]
+            with con:
+                con.execute("BEGIN IMMEDIATE")
+                row = con.execute(
+                    "SELECT last_response_id FROM calibration WHERE okupasi_id = ?", (okupasi_id,)
+                ).fetchone()
+                if row is not None and row[0] > last_id:
+                    return 0
+                con.executemany(
+                    "UPDATE item SET a = ?, b = ?, n_respon_window = ? WHERE item_id = ?",
+                    [(a, b, n, item_id) for item_id, (a, b, n) in hasil.items()],
+                )
+                con.execute(
+                    "INSERT OR REPLACE INTO calibration VALUES (?, ?, ?)",
+                    (okupasi_id, last_id, time.time()),
+                )
+        metrics.incr("item_bank_calibrated")
+        return len(hasil)
+
+    def calibrate_all(self, window=CAT_CALIBRATE_WINDOW):
+        """Kalibrasi semua okupasi yang punya jawaban. Return: {okupasi_id: jumlah soal}"""
+        okupasi = [r[0] for r in self._connect().execute("SELECT DISTINCT okupasi_id FROM response")]
+        return {o: self.calibrate(o, window) for o in okupasi}
+
+
+def _job_kalibrasi(job, bank, okupasi_id):
+    job.report(0.0, f"Kalibrasi soal okupasi {okupasi_id}")
+    return bank.calibrate(okupasi_id)
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_item_bank():
+    """Bank bersama satu proses (dibuat saat pertama dipakai)"""
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = ItemBank()
+    return _bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bank soal asesmen adaptif")
+    parser.add_argument("--db", default=ITEM_BANK_PATH, help="file SQLite bank soal")
+    parser.add_argument("--window", type=int, default=CAT_CALIBRATE_WINDOW, help="jumlah jawaban terbaru per okupasi")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    sub.add_parser("calibrate", help="kalibrasi ulang parameter IRT semua okupasi")
+    sub.add_parser("stats", help="jumlah soal & parameter per okupasi")
+    args = parser.parse_args()
+
+    bank = ItemBank(args.db)
+    if args.perintah == "calibrate":
+        t0 = time.perf_counter()
+        for okupasi_id, n in bank.calibrate_all(args.window).items():
+            print(f"{okupasi_id:<16} {n:>5} soal")
+        print(f"Selesai dalam {time.perf_counter() - t0:.2f} s")
+    else:
+        for okupasi_id, n, a, b, respon in bank._connect().execute(
+            "SELECT i.okupasi_id, COUNT(*), AVG(a), AVG(b), "
+            "(SELECT COUNT(*) FROM response r WHERE r.okupasi_id = i.okupasi_id) "
+            "FROM item i GROUP BY i.okupasi_id"
+        ):
+            print(f"{okupasi_id:<16} {n:>5} soal  a={a:.2f}  b={b:+.2f}  {respon:>7,} jawaban")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+JOB LATAR BELAKANG
+Pool thread bersama untuk pekerjaan lama (baca CV, mapping, generate soal)
+supaya script Streamlit tidak tertahan di bawah st.spinner.
+
+- Halaman memanggil submit() lalu menyimpan job_id di session_state, dan
+  mem-polling get() dari fragment ber-run_every (rerun murah, hanya
+  fragment yang dijalankan ulang).
+- Fungsi job menerima objek Job sebagai argumen pertama; job.report(
+  fraksi, pesan) memperbarui progress sekaligus titik cek pembatalan.
+- Pembatalan kooperatif: job yang masih antre langsung dibatalkan, job
+  yang berjalan berhenti di report()/check_cancelled() berikutnya.
+- Job yang tidak di-polling selama ABANDON_AFTER detik (tab ditutup,
+  pindah halaman) dibatalkan, jadi worker kembali tersedia. Job selesai
+  disimpan RETENTION detik lalu dibuang.
+
+Job berjalan di thread (bukan proses) karena memakai index PON, cache
+sheet, dan session Gemini yang sama dengan halaman; sebagian besar
+waktunya menunggu I/O.
+"""
+
+import itertools
+import secrets
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from config import JOB_ABANDON_AFTER, JOB_RETENTION, JOB_WORKERS
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+STATUS_SELESAI = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+# Interval thread pembersih (detik)
+REAP_INTERVAL = 5.0
+
+
+class JobCancelled(BaseException):
+    """
+    Dilempar di dalam job yang dibatalkan. Turunan BaseException (seperti
+    exception kontrol Streamlit) agar tidak tertangkap `except Exception`
+    di kode pemanggil, dan pemanggil lain di single_flight mengambil alih.
+    """
+
+
+class Job:
+    """Satu pekerjaan: status, progress 0..1, pesan, hasil / error"""
+
+    def __init__(self, job_id, kind):
+        self.id = job_id
+        self.kind = kind
+        self.status = STATUS_QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.exception = None
+        self.warnings = []
+        self.traceback = ""
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.last_seen = time.monotonic()
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in STATUS_SELESAI
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        """Raise JobCancelled jika job diminta berhenti"""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def report(self, progress=None, message=None):
+        """Perbarui progress (0..1) dan/atau pesan; juga titik cek pembatalan"""
+        self.check_cancelled()
+        if progress is not None:
+            self.progress = min(1.0, max(0.0, float(progress)))
+        if message is not None:
+            self.message = message
+
+    def warn(self, message):
+        """Catatan untuk ditampilkan halaman bersama hasil (job tetap berhasil)"""
+        self.warnings.append(message)
+
+    def on_wait(self, posisi, eta):
+        """Callback antrian Gemini (rate_limiter) -> pesan progress"""
+        self.report(message=f"Menunggu giliran AI: antrian ke-{posisi + 1}, estimasi {eta:.0f} detik")
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 3),
+            "message": self.message,
+            "error": self.error,
+            "elapsed_s": round(self.elapsed(), 3),
+        }
+
+
+class JobRunner:
+    """Pool worker + tabel job"""
+
+    def __init__(self, max_workers=JOB_WORKERS, abandon_after=JOB_ABANDON_AFTER, retention=JOB_RETENTION):
+        self.max_workers = max_workers
+        self.abandon_after = abandon_after
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dtp-job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._seq = itertools.count(1)
+        self._reaper = threading.Thread(target=self._reap_loop, name="dtp-job-reaper", daemon=True)
+        self._reaper.start()
+
+    # ---------- submit / poll / cancel ----------
+    def submit(self, kind, fn, *args, **kwargs):
+        """Jadwalkan fn(job, *args, **kwargs); return job_id"""
+        job_id = f"{next(self._seq)}-{secrets.token_hex(6)}"
+        job = Job(job_id, kind)
+        with self._lock:
+            self._jobs[job_id] = job
+        metrics.incr(f"job_{kind}_submitted")
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job_id
+
+    def get(self, job_id, touch=True):
+        """Job dengan id ini (None jika tidak ada / sudah dibuang); touch = tanda masih di-polling"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None and touch:
+            job.last_seen = time.monotonic()
+        return job
+
+    def cancel(self, job_id):
+        """Minta job berhenti. Return: True jika job ada dan belum selesai"""
+        job = self.get(job_id, touch=False)
+        if job is None or job.done:
+            return False
+        job._cancel.set()
+        # Belum mulai: keluarkan dari antrian pool
+        if job.future is not None and job.future.cancel():
+            self._finish(job, STATUS_CANCELLED)
+        return True
+
+    def status(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        per_status = {}
+        for job in jobs:
+            per_status[job.status] = per_status.get(job.status, 0) + 1
+        return {"workers": self.max_workers, "jobs": per_status}
+
+    # ---------- eksekusi ----------
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            self._finish(job, STATUS_CANCELLED)
+            return
+        job.status = STATUS_RUNNING
+        job.started = time.time()
+        metrics.observe("job_queue_wait", job.started - job.created)
+        try:
+            job.result = fn(job, *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, STATUS_CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            job.exception = e
+            job.traceback = traceback.format_exc()
+            self._finish(job, STATUS_FAILED)
+        else:
+            job.progress = 1.0
+            self._finish(job, STATUS_DONE)
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished = time.time()
+        metrics.incr(f"job_{job.kind}_{status}")
+        if job.started is not None:
+            metrics.observe(f"job.{job.kind}", job.finished - job.started, error=status == STATUS_FAILED)
+
+    # ---------- pembersihan ----------
+    def reap(self):
+        """
+        Batalkan job aktif yang tidak di-polling > abandon_after detik dan buang
+        job selesai yang lebih tua dari retention. Return: (dibatalkan, dibuang)
+        """
+        now_mono, now = time.monotonic(), time.time()
+        with self._lock:
+            jobs = list(self._jobs.values())
+
+        ditinggal = [j for j in jobs if not j.done and now_mono - j.last_seen > self.abandon_after]
+        for job in ditinggal:
+            if self.cancel(job.id):
+                metrics.incr("job_abandoned")
+
+        kadaluarsa = [j.id for j in jobs if j.done and now - j.finished > self.retention]
+        with self._lock:
+            for job_id in kadaluarsa:
+                self._jobs.pop(job_id, None)
+        return len(ditinggal), len(kadaluarsa)
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(REAP_INTERVAL)
+            try:
+                self.reap()
+            except Exception:
+                pass
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """Runner bersama satu proses (dibuat saat pertama dipakai)"""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = JobRunner()
+    return _runner
@@ -0,0 +1,317 @@
+"""
+METRIK LATENSI PER TAHAP (IN-PROCESS)
+Timer ringan untuk tahap-tahap utama aplikasi: load Excel, ekstrak PDF,
+parsing CV, mapping PON, panggilan Gemini, generate soal, render chat.
+
+- Histogram (bucket kumulatif ala Prometheus) + jendela sampel terakhir
+  untuk p50/p95/p99 per tahap
+- Counter bebas, statistik cache (hit/miss), dan gauge turunan (rasio)
+- Export format teks Prometheus
+
+Registry tersimpan di level modul: semua sesi Streamlit dalam satu
+proses berbagi angka yang sama.
+
+Pemakaian:
+    @timed("parse_cv_data")
+    def parse_cv_data(...): ...
+
+    with timer("render_chat_bubble"):
+        ...
+"""
+
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Batas bucket histogram (detik)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Jumlah sampel terakhir per tahap untuk hitung persentil
+WINDOW = 2048
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+PREFIX = "dtp"
+
+# Titik nol metrik startup: saat modul ini pertama di-import
+# (warmup.py meng-import-nya paling awal, jadi ~ awal proses)
+STARTED_AT = time.perf_counter()
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "total", "errors", "samples")
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.samples = deque(maxlen=WINDOW)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        for i, batas in enumerate(BUCKETS):
+            if seconds <= batas:
+                self.bucket_counts[i] += 1
+                break
+
+    def quantiles(self):
+        if not self.samples:
+            return {q: None for q in QUANTILES}
+        values = np.quantile(np.fromiter(self.samples, dtype=float), QUANTILES)
+        return dict(zip(QUANTILES, values.tolist()))
+
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_cache_stats = {}
+_cache_sources = {}
+_gauge_sources = {}
+_startup_events = set()
+
+
+# ========================================
+# PENCATATAN
+# ========================================
+def observe(stage, seconds, error=False):
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = _Histogram()
+        hist.observe(seconds)
+        if error:
+            hist.errors += 1
+
+
+@contextmanager
+def timer(stage):
+    """Context manager: catat durasi blok sebagai satu sampel tahap `stage`"""
+    t0 = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe(stage, time.perf_counter() - t0, error)
+
+
+def timed(stage=None, cache=None):
+    """
+    Decorator timer. `cache`: nama cache yang dihitung per panggilan;
+    pasang cache_miss(cache) di dalam fungsi ber-cache agar hit rate terhitung.
+    """
+    def decorator(func):
+        nama = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if cache:
+                record_cache(cache, calls=1)
+            with timer(nama):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_startup(event, seconds=None):
+    """
+    Catat sekali per proses tahap "startup.<event>": `seconds`, atau durasi
+    sejak STARTED_AT (mis. time-to-first-mapping). Panggilan berikutnya diabaikan.
+    """
+    with _lock:
+        if event in _startup_events:
+            return
+        _startup_events.add(event)
+    observe(f"startup.{event}", time.perf_counter() - STARTED_AT if seconds is None else seconds)
+
+
+def incr(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def record_cache(cache, hit=None, calls=0, misses=0):
+    """
+    Statistik cache. Bisa `hit=True/False` per lookup, atau `calls`/`misses`
+    terpisah (untuk cache yang hanya kelihatan miss-nya, mis. st.cache_data).
+    """
+    if hit is not None:
+        calls, misses = 1, 0 if hit else 1
+    with _lock:
+        stat = _cache_stats.setdefault(cache, [0, 0])
+        stat[0] += calls
+        stat[1] += misses
+
+
+def cache_miss(cache):
+    """Dipanggil di badan fungsi ber-cache: badan hanya jalan saat miss"""
+    record_cache(cache, misses=1)
+
+
+def register_cache(cache, stats_fn):
+    """Daftarkan cache yang punya statistik sendiri; stats_fn() -> (hits, misses)"""
+    with _lock:
+        _cache_sources[cache] = stats_fn
+
+
+def register_gauge(name, value_fn):
+    """Daftarkan gauge yang dihitung saat dibaca; value_fn() -> angka atau None"""
+    with _lock:
+        _gauge_sources[name] = value_fn
+
+
+def reset():
+    """Kosongkan semua metrik, termasuk tanda tahap startup yang sudah tercatat"""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _cache_stats.clear()
+        _startup_events.clear()
+
+
+# ========================================
+# PEMBACAAN
+# ========================================
+def counter(name):
+    """Nilai satu counter (0 jika belum pernah dicatat)"""
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def quantile(stage, q, min_samples=1):
+    """Persentil q (0..1) durasi tahap dari jendela sampel; None jika sampel < min_samples"""
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None or len(hist.samples) < min_samples:
+            return None
+        samples = np.fromiter(hist.samples, dtype=float)
+    return float(np.quantile(samples, q))
+
+
+def cache_summary():
+    """{cache: {'hits', 'misses', 'hit_rate'}}"""
+    with _lock:
+        stats = {k: (calls - misses, misses) for k, (calls, misses) in _cache_stats.items()}
+        sources = dict(_cache_sources)
+    for nama, fn in sources.items():
+        try:
+            stats[nama] = tuple(fn())
+        except Exception:
+            continue
+    ringkas = {}
+    for nama, (hits, misses) in sorted(stats.items()):
+        total = hits + misses
+        ringkas[nama] = {"hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
+    return ringkas
+
+
+def gauges():
+    """{nama: nilai} semua gauge terdaftar (None jika belum terdefinisi / gagal)"""
+    with _lock:
+        sources = dict(_gauge_sources)
+    hasil = {}
+    for nama, fn in sorted(sources.items()):
+        try:
+            hasil[nama] = fn()
+        except Exception:
+            hasil[nama] = None
+    return hasil
+
+
+def snapshot():
+    """Ringkasan per tahap untuk tabel admin: count, error, mean, p50/p95/p99 (detik)"""
+    with _lock:
+        items = [(stage, hist, hist.quantiles()) for stage, hist in _histograms.items()]
+        rows = [
+            {
+                "stage": stage,
+                "count": hist.count,
+                "errors": hist.errors,
+                "mean": hist.total / hist.count if hist.count else None,
+                "p50": q[0.5],
+                "p95": q[0.95],
+                "p99": q[0.99],
+            }
+            for stage, hist, q in items
+        ]
+        counters = dict(_counters)
+    return {
+        "stages": sorted(rows, key=lambda r: r["stage"]),
+        "counters": counters,
+        "caches": cache_summary(),
+        "gauges": gauges(),
+    }
+
+
+def _fmt(value):
+    return "NaN" if value is None else repr(float(value))
+
+
+def prometheus_text():
+    """Semua metrik dalam format teks Prometheus (exposition format 0.0.4)"""
+    lines = []
+    nama_hist = f"{PREFIX}_stage_duration_seconds"
+    nama_q = f"{PREFIX}_stage_latency_seconds"
+
+    with _lock:
+        stages = sorted(_histograms.items())
+        data = [
+            (stage, list(h.bucket_counts), h.count, h.total, h.errors, h.quantiles())
+            for stage, h in stages
+        ]
+        counters = sorted(_counters.items())
+
+    lines += [f"# HELP {nama_hist} Durasi per tahap.", f"# TYPE {nama_hist} histogram"]
+    for stage, buckets, count, total, _, _ in data:
+        kumulatif = 0
+        for batas, n in zip(BUCKETS, buckets):
+            kumulatif += n
+            lines.append(f'{nama_hist}_bucket{{stage="{stage}",le="{batas}"}} {kumulatif}')
+        lines.append(f'{nama_hist}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+        lines.append(f'{nama_hist}_sum{{stage="{stage}"}} {_fmt(total)}')
+        lines.append(f'{nama_hist}_count{{stage="{stage}"}} {count}')
+
+    lines += [f"# HELP {nama_q} Persentil durasi per tahap ({WINDOW} sampel terakhir).",
+              f"# TYPE {nama_q} summary"]
+    for stage, _, count, total, _, q in data:
+        for quantile, value in q.items():
+            lines.append(f'{nama_q}{{stage="{stage}",quantile="{quantile}"}} {_fmt(value)}')
+        lines.append(f'{nama_q}_sum{{stage="{stage}"}} {_fmt(total)}')
+        lines.append(f'{nama_q}_count{{stage="{stage}"}} {count}')
+
+    nama_err = f"{PREFIX}_stage_errors_total"
+    lines += [f"# HELP {nama_err} Jumlah eksekusi tahap yang melempar exception.", f"# TYPE {nama_err} counter"]
+    for stage, _, _, _, errors, _ in data:
+        lines.append(f'{nama_err}{{stage="{stage}"}} {errors}')
+
+    nama_c = f"{PREFIX}_events_total"
+    lines += [f"# HELP {nama_c} Counter kejadian aplikasi.", f"# TYPE {nama_c} counter"]
+    for nama, nilai in counters:
+        lines.append(f'{nama_c}{{name="{nama}"}} {nilai}')
+
+    nama_cache = f"{PREFIX}_cache_requests_total"
+    nama_rate = f"{PREFIX}_cache_hit_ratio"
+    caches = cache_summary()
+    lines += [f"# HELP {nama_cache} Lookup cache per hasil.", f"# TYPE {nama_cache} counter"]
+    for nama, s in caches.items():
+        lines.append(f'{nama_cache}{{cache="{nama}",result="hit"}} {s["hits"]}')
+        lines.append(f'{nama_cache}{{cache="{nama}",result="miss"}} {s["misses"]}')
+    lines += [f"# HELP {nama_rate} Rasio hit cache.", f"# TYPE {nama_rate} gauge"]
+    for nama, s in caches.items():
+        lines.append(f'{nama_rate}{{cache="{nama}"}} {_fmt(s["hit_rate"])}')
+
+    nama_g = f"{PREFIX}_gauge"
+    lines += [f"# HELP {nama_g} Nilai turunan aplikasi (rasio, dsb.).", f"# TYPE {nama_g} gauge"]
+    for nama, nilai in gauges().items():
+        lines.append(f'{nama_g}{{name="{nama}"}} {_fmt(nilai)}')
+
+    return "\n".join(lines) + "\n"
@@ -4,16 +4,20 @@ Perbaikan: konsistensi nama sheet dan error handling
 """
 
 import streamlit as st
-import pandas as pd
-import re
-import io
-import os
-from pypdf import PdfReader
-import docx
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-from config import EXCEL_PATH, SHEET_PON, SHEET_TALENTA
+from config import EXCEL_PATH, SHEET_PON
+from cv_dedup import get_cv_index
+from cv_parser import extract_profile_entities, extract_text_from_upload, parse_cv_data
+from data_loader import read_sheet_cached
+from jobs import STATUS_CANCELLED, STATUS_FAILED, get_runner
+from metrics import record_startup, timed
+from pon_index import (
+    MAPPING_CACHE, METODE_MAPPING, PON_TEXT_COLUMNS,
+    refresh_pon_index
+)
+from profile_join import store_document
+from profile_store import get_profile_store
+from skill_extractor import load_skill_extractor, skill_gap, skills_frame
 
 # ========================================
 # KONFIGURASI HALAMAN
@@ -26,220 +30,155 @@ st.set_page_config(
 
 
 # ========================================
-# FUNGSI 1: LOAD EXCEL
+# FUNGSI 1: BACA CV (JOB LATAR BELAKANG)
 # ========================================
-@st.cache_data
-def load_excel_sheet(file_path, sheet_name):
-    """Membaca sheet dari Excel dengan error handling lengkap"""
-    try:
-        # Cek apakah file ada
-        if not os.path.exists(file_path):
-            st.error(f"❌ File tidak ditemukan: '{file_path}'")
-            return None
-        
-        # Baca Excel tanpa header dulu untuk debug
-        xls = pd.ExcelFile(file_path)
-        available_sheets = xls.sheet_names
-        
-        # Debug: tampilkan sheet yang tersedia
-        with st.expander("🔍 Debug: Sheet tersedia di Excel"):
-            st.write(f"📂 File: `{file_path}`")
-            st.write(f"📋 Sheet yang dicari: `{sheet_name}`")
-            st.write(f"📊 Sheet tersedia:")
-            for s in available_sheets:
-                st.write(f"  - {s}")
-        
-        # Cek apakah sheet ada
-        if sheet_name not in available_sheets:
-            st.error(f"❌ Sheet '{sheet_name}' tidak ditemukan!")
-            st.info(f"💡 Sheet tersedia: {', '.join(available_sheets)}")
-            return None
-        
-        # Baca sheet dengan header di baris ke-2 (index 1)
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=1)
-        df.columns = df.columns.str.strip()
-        df = df.fillna('')
-        
-        st.success(f"✅ Sheet '{sheet_name}' berhasil dimuat ({len(df)} baris)")
-        return df
-        
-    except Exception as e:
-        st.error(f"❌ Error memuat sheet '{sheet_name}': {str(e)}")
-        import traceback
-        with st.expander("🐛 Detail Error"):
-            st.code(traceback.format_exc())
-        return None
+def job_read_cv(job, data: bytes, mime_type: str):
+    """Ekstrak teks file CV lalu parsing data diri. Berjalan di worker jobs.py"""
+    job.report(0.1, "📄 Membaca dokumen...")
+    raw_text = extract_text_from_upload(data, mime_type)
+    job.report(0.6, "🔎 Mengekstrak data diri...")
+    return parse_cv_data(raw_text)
 
 
 # ========================================
-# FUNGSI 2: EKSTRAK FILE
+# FUNGSI 2: MAPPING KE PON TIK (JOB LATAR BELAKANG)
 # ========================================
-def extract_text_from_pdf(file_io):
-    """Ekstrak teks dari PDF"""
-    reader = PdfReader(file_io)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-    return text
+@timed()
+def map_profile_to_pon(job, raw_cv: str, metode: str = "tfidf", index=None, delta=None):
+    """
+    Semantic search: cari okupasi PON yang paling cocok
+    Menggunakan Cosine Similarity (TF-IDF atau vektor LSA)
+    Berjalan di worker jobs.py, jadi tanpa elemen Streamlit; error dilempar
+    dan ditampilkan halaman saat polling. `index`/`delta`: hasil
+    refresh_pon_index milik pemanggil (default: diambil di sini).
+    Return: dict hasil pemetaan
+    """
+    # Ekstrak entitas
+    job.report(0.05, "📝 Mengekstrak entitas...")
+    profile_entities = extract_profile_entities(raw_cv)
 
+    # Index PON dipakai bersama seluruh proses (sudah siap jika server di-warmup)
+    job.report(0.3, f"⚙️ Menyiapkan index PON ({METODE_MAPPING[metode]})...")
+    df_pon = read_sheet_cached(EXCEL_PATH, SHEET_PON)
+    if df_pon.empty:
+        raise ValueError("Data PON TIK kosong")
+    missing_cols = [col for col in PON_TEXT_COLUMNS if col not in df_pon.columns]
+    if missing_cols:
+        raise ValueError(f"Kolom tidak ditemukan: {missing_cols}. Kolom tersedia: {list(df_pon.columns)}")
+    # Sheet PON yang berubah diterapkan tanpa restart (index hashing: delta per baris)
+    if index is None:
+        index, delta = refresh_pon_index(EXCEL_PATH, metode)
 
-def extract_text_from_docx(file_io):
-    """Ekstrak teks dari DOCX"""
-    doc = docx.Document(file_io)
-    text = ""
-    for para in doc.paragraphs:
-        text += para.text + "\n"
-    return text
+    # Cari okupasi yang paling cocok (cache diinvalidasi selektif per versi index)
+    job.report(0.6, "🎯 Memetakan ke PON TIK...")
+    okupasi_id, best_score = MAPPING_CACHE.lookup(index, profile_entities, top_k=1)[0]
+    record_startup("first_mapping")
 
+    # Ambil data okupasi
+    pon_data = index.row_for(okupasi_id)
 
-# ========================================
-# FUNGSI 3: PARSING CV (AI Sederhana)
-# ========================================
-def parse_cv_data(cv_text):
-    """
-    AI sederhana untuk parsing CV menggunakan Regex
-    Ekstrak: email, nama, lokasi, LinkedIn
-    """
-    data = {
-        "email": "",
-        "nama": "",
-        "linkedin": "",
-        "lokasi": "",
-        "full_text": cv_text
+    # Skill gap: skill okupasi (Unit_Kompetensi + Kuk_Keywords) yang tidak ada di profil
+    job.report(0.8, "🛠️ Menghitung skill gap...")
+    extractor = load_skill_extractor(EXCEL_PATH)
+    gap = skill_gap(extractor, pon_data, profile_entities)
+
+    return {
+        "okupasi_id": pon_data.get('OkupasiID', 'N/A'),
+        "okupasi_nama": pon_data.get('Okupasi', 'N/A'),
+        "skor": best_score,
+        "gap": ", ".join(gap) if gap else "-",
+        "profile_text": profile_entities,
+        "skills": extractor.extract(raw_cv),
+        "delta": delta,
     }
-    
-    # 1. Ekstrak Email
-    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', cv_text)
-    if email_match:
-        data["email"] = email_match.group(0)
-        
-    # 2. Ekstrak LinkedIn
-    linkedin_match = re.search(
-        r'linkedin\.com/in/([\w-]+)', 
-        cv_text, 
-        re.IGNORECASE
-    )
-    if linkedin_match:
-        data["linkedin"] = f"https://www.linkedin.com/in/{linkedin_match.group(1)}"
-        
-    # 3. Ekstrak Nama (baris pertama biasanya)
-    first_line = cv_text.split('\n')[0].strip()
-    if first_line and '@' not in first_line and len(first_line.split()) < 5: 
-        data["nama"] = first_line.title()
-        
-    # 4. Ekstrak Lokasi
-    lokasi_match = re.search(
-        r'(Jakarta|Bandung|Surabaya|Yogyakarta|Jogja|Medan|Semarang|Makassar)', 
-        cv_text, 
-        re.IGNORECASE
-    )
-    if lokasi_match:
-        lokasi = lokasi_match.group(0).title()
-        if lokasi == "Jogja":
-            lokasi = "Yogyakarta"
-        data["lokasi"] = lokasi
-    
-    return data
 
 
 # ========================================
-# FUNGSI 4: EKSTRAK ENTITAS (NER Sederhana)
+# FUNGSI 3: PAKAI ULANG HASIL CV DUPLIKAT
 # ========================================
-def extract_profile_entities(raw_cv: str):
+def reuse_duplicate_result(job, raw_cv: str, hasil_lama: dict):
     """
-    Named Entity Recognition sederhana
-    Ambil kata-kata penting (panjang >= 4 huruf)
+    Hasil pemetaan (dan asesmen, jika ada) dari profil dengan CV near-duplicate,
+    tanpa mapping ulang. Return: dict dengan bentuk sama seperti map_profile_to_pon
     """
-    words = set(re.findall(r'\b\w{4,}\b', raw_cv.lower()))
-    profile_text = ' '.join(words)
-    return profile_text
+    job.report(0.3, "🔁 CV mirip profil tersimpan, memakai hasil sebelumnya...")
+    okupasi_id = hasil_lama["OkupasiID_Mapped"]
+    df_pon = read_sheet_cached(EXCEL_PATH, SHEET_PON)
+    pon_row = df_pon[df_pon['OkupasiID'] == okupasi_id]
+    extractor = load_skill_extractor(EXCEL_PATH)
+
+    return {
+        "okupasi_id": okupasi_id,
+        "okupasi_nama": pon_row.iloc[0]['Okupasi'] if not pon_row.empty else okupasi_id,
+        "skor": hasil_lama["Skor_Kecocokan_Awal"] or 0.0,
+        "gap": hasil_lama["Gap_Keterampilan"] or "-",
+        "profile_text": extract_profile_entities(raw_cv),
+        "skills": extractor.extract(raw_cv),
+        "delta": None,
+    }
 
 
 # ========================================
-# FUNGSI 5: INISIALISASI VECTORIZER
+# FUNGSI 4: PETAKAN & SIMPAN PROFIL (JOB LATAR BELAKANG)
 # ========================================
-@st.cache_resource
-def initialize_vectorizer():
+def job_simpan_profil(job, profil: dict, metode: str):
     """
-    Inisialisasi TF-IDF Vectorizer dan training dengan data PON
-    FIXED: Menggunakan SHEET_PON dari config.py
+    Cek CV near-duplicate (MinHash/LSH) lalu mapping, atau pakai ulang hasil
+    profil yang cocok; simpan profil + hasil pemetaan ke profile store (SQLite)
     """
-    st.info("⚙️ Inisialisasi AI Vectorizer...")
-    
-    # PENTING: Gunakan konstanta dari config.py
-    df_pon = load_excel_sheet(EXCEL_PATH, SHEET_PON)
-    
-    if df_pon is None or df_pon.empty:
-        st.error("❌ Data PON TIK tidak bisa dimuat atau kosong")
-        return None, None, None
-    
-    # Validasi kolom yang dibutuhkan
-    required_cols = ['Okupasi', 'Unit_Kompetensi', 'Kuk_Keywords']
-    missing_cols = [col for col in required_cols if col not in df_pon.columns]
-    
-    if missing_cols:
-        st.error(f"❌ Kolom tidak ditemukan: {missing_cols}")
-        with st.expander("📋 Kolom tersedia"):
-            st.write(list(df_pon.columns))
-        return None, None, None
-    
-    # Gabungkan teks okupasi
-    pon_corpus = (
-        df_pon['Okupasi'].astype(str) + ' ' + 
-        df_pon['Unit_Kompetensi'].astype(str) + ' ' + 
-        df_pon['Kuk_Keywords'].astype(str)
+    raw_cv = profil["Raw_CV_Text"]
+    store = get_profile_store()
+    terdaftar = store.find_by_email(profil["Email"])
+
+    # Versi index saat ini: hasil lama hanya dipakai ulang jika dipetakan dengan index yang sama
+    index, delta = refresh_pon_index(EXCEL_PATH, metode)
+    meta = (metode, index.fingerprint)
+
+    job.report(0.02, "🔎 Mengecek CV duplikat...")
+    cv_index = get_cv_index()
+    duplikat = cv_index.find(raw_cv, exclude=terdaftar["TalentID"] if terdaftar else None)
+    hasil_lama = store.latest_result(duplikat[0]) if duplikat else None
+    if hasil_lama and store.result_meta(hasil_lama["HasilID"]) != meta:
+        hasil_lama = None
+
+    asesmen = None
+    if hasil_lama and hasil_lama["OkupasiID_Mapped"]:
+        hasil = reuse_duplicate_result(job, raw_cv, hasil_lama)
+        if hasil_lama["Skor_Asesmen"] is not None:
+            asesmen = (hasil_lama["Skor_Asesmen"], hasil_lama["Level_Kompetensi"])
+        hasil["duplikat"] = {"talent_id": duplikat[0], "kemiripan": duplikat[1], "asesmen": asesmen}
+    else:
+        # Talenta yang sudah terdaftar: lengkapi CV dengan riwayat pendidikan, pekerjaan & skill
+        teks = raw_cv
+        if terdaftar is not None:
+            teks = store_document(store, terdaftar["TalentID"], base_text=raw_cv)
+        hasil = map_profile_to_pon(job, teks, metode, index, delta)
+        hasil["duplikat"] = None
+
+    job.report(0.9, "💾 Menyimpan profil...")
+    hasil["store_talent_id"], hasil["hasil_id"] = store.save_mapping(
+        profil, hasil["okupasi_id"], hasil["skor"], hasil["gap"], asesmen, meta
     )
-    
-    # Training vectorizer
-    vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-    pon_vectors = vectorizer.fit_transform(pon_corpus)
-    
-    st.success(f"✅ Vectorizer siap ({len(df_pon)} okupasi)")
-    
-    return vectorizer, pon_vectors, df_pon
+    cv_index.add(hasil["store_talent_id"], raw_cv)
+    return hasil
 
 
 # ========================================
-# FUNGSI 6: MAPPING KE PON TIK
+# FUNGSI 5: PANTAU JOB (POLLING)
 # ========================================
-def map_profile_to_pon(profile_text: str):
+@st.fragment(run_every=1.0)
+def pantau_job(state_key: str, label: str):
     """
-    Semantic search: cari okupasi PON yang paling cocok
-    Menggunakan Cosine Similarity
+    Progress job di session_state[state_key]; hanya fragment ini yang
+    dijalankan ulang tiap detik. Rerun penuh begitu job selesai.
     """
-    # Ambil vectorizer yang sudah di-training
-    vectorizer, pon_vectors, df_pon = initialize_vectorizer()
-    
-    if vectorizer is None:
-        return None, None, 0, ""
-    
-    try:
-        # Ubah profil jadi vector
-        query_vector = vectorizer.transform([profile_text])
-        
-        # Hitung similarity dengan semua okupasi
-        scores = cosine_similarity(query_vector, pon_vectors)
-        
-        # Ambil yang paling cocok
-        best_match_index = scores.argmax()
-        best_score = scores[0, best_match_index]
-        
-        # Ambil data okupasi
-        pon_data = df_pon.iloc[best_match_index]
-        okupasi_id = pon_data.get('OkupasiID', 'N/A')
-        okupasi_nama = pon_data.get('Okupasi', 'N/A')
-        
-        # Simulasi skill gap
-        gap_keterampilan = "Cloud Computing, CI/CD, Agile"
-        
-        return okupasi_id, okupasi_nama, best_score, gap_keterampilan
-        
-    except Exception as e:
-        st.error(f"❌ Error mapping: {str(e)}")
-        import traceback
-        with st.expander("🐛 Detail Error"):
-            st.code(traceback.format_exc())
-        return None, None, 0, ""
+    job = get_runner().get(st.session_state.get(state_key))
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"{label} {job.message}")
+    if st.button("✖️ Batalkan", key=f"batal_{state_key}"):
+        get_runner().cancel(job.id)
+        st.rerun()
 
 
 # ========================================
@@ -279,35 +218,36 @@ uploaded_file = st.file_uploader(
     label_visibility="collapsed"
 )
 
-if uploaded_file is not None:
-    with st.spinner("🤖 AI sedang membaca CV..."):
-        try:
-            # Baca file
-            if uploaded_file.type == "application/pdf":
-                file_io = io.BytesIO(uploaded_file.getvalue())
-                raw_text = extract_text_from_pdf(file_io)
-                
-            elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                file_io = io.BytesIO(uploaded_file.getvalue())
-                raw_text = extract_text_from_docx(file_io)
-                
-            else:  # TXT
-                raw_text = uploaded_file.getvalue().decode("utf-8")
-            
-            # Parse dengan AI
-            parsed_data = parse_cv_data(raw_text)
-            
+# Satu job per file: rerun berikutnya dengan file yang sama tidak memproses ulang
+if uploaded_file is not None and uploaded_file.file_id != st.session_state.get("cv_file_id"):
+    if st.session_state.get("cv_job_id"):
+        get_runner().cancel(st.session_state.cv_job_id)
+    st.session_state.cv_file_id = uploaded_file.file_id
+    st.session_state.cv_job_id = get_runner().submit(
+        "read_cv", job_read_cv, uploaded_file.getvalue(), uploaded_file.type
+    )
+
+if st.session_state.get("cv_job_id"):
+    cv_job = get_runner().get(st.session_state.cv_job_id)
+    if cv_job is not None and not cv_job.done:
+        pantau_job("cv_job_id", "🤖 AI sedang membaca CV...")
+    else:
+        st.session_state.cv_job_id = None
+        if cv_job is None or cv_job.status == STATUS_CANCELLED:
+            st.info("ℹ️ Pemrosesan CV dibatalkan.")
+        elif cv_job.status == STATUS_FAILED:
+            st.error(f"❌ Gagal memproses: {cv_job.error}")
+        else:
+            parsed_data = cv_job.result
+
             # Update session state
             st.session_state.form_email = parsed_data["email"]
             st.session_state.form_nama = parsed_data["nama"]
             st.session_state.form_lokasi = parsed_data["lokasi"]
             st.session_state.form_linkedin = parsed_data["linkedin"]
             st.session_state.form_cv_text = parsed_data["full_text"]
-            
+
             st.success("✅ CV berhasil diproses!")
-            
-        except Exception as e:
-            st.error(f"❌ Gagal memproses: {e}")
 
 st.markdown("---")
 
@@ -351,6 +291,14 @@ with st.form("profil_form"):
         help="AI akan ekstrak skill dari teks ini"
     )
     
+    metode_mapping = st.radio(
+        "Metode Pemetaan",
+        list(METODE_MAPPING),
+        format_func=METODE_MAPPING.get,
+        horizontal=True,
+        help="TF-IDF mencocokkan kata kunci; LSA juga menangkap sinonim & campuran Indonesia/Inggris"
+    )
+    
     submitted = st.form_submit_button("💾 Simpan & Petakan Profil")
 
 
@@ -368,45 +316,80 @@ if submitted:
         st.session_state.form_linkedin = linkedin
         st.session_state.form_cv_text = raw_cv
         
-        with st.spinner("🤖 AI sedang memetakan profil..."):
-            try:
-                talent_id = email
-                
-                # Ekstrak entitas
-                st.write("📝 Mengekstrak entitas...")
-                profile_entities = extract_profile_entities(raw_cv)
-                
-                # Mapping ke PON
-                st.write("🎯 Memetakan ke PON TIK...")
-                okupasi_id, okupasi_nama, skor, gap = map_profile_to_pon(profile_entities)
-                
-                if okupasi_id is None:
-                    st.error("❌ Gagal mapping. Periksa debug info di atas.")
-                else:
-                    # Simpan hasil
-                    st.session_state.talent_id = talent_id
-                    st.session_state.mapped_okupasi_id = okupasi_id
-                    st.session_state.mapped_okupasi_nama = okupasi_nama
-                    st.session_state.skill_gap = gap
-                    st.session_state.profile_text = profile_entities
-                    
-                    # Tampilkan hasil
-                    st.success("✅ Profil Berhasil Dipetakan!")
-                    
-                    st.subheader("📊 Hasil Pemetaan AI:")
-                    col1, col2 = st.columns(2)
-                    col1.metric("Okupasi Sesuai", okupasi_nama)
-                    col2.metric("Kecocokan", f"{skor*100:.2f}%")
-                    
-                    st.warning(f"⚠️ **Skill Gap:** {gap}")
-                    
-                    st.info("""
-                    💡 **Next Step:**
-                    Lanjut ke **Asesmen Kompetensi** untuk validasi!
-                    """)
-            
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-                import traceback
-                with st.expander("🐛 Detail Error"):
-                    st.code(traceback.format_exc())
+        if st.session_state.get("map_job_id"):
+            get_runner().cancel(st.session_state.map_job_id)
+        st.session_state.map_talent_id = email
+        profil = {
+            "Email": email, "Nama": nama, "Lokasi": lokasi,
+            "LinkedIn_URL": linkedin, "Raw_CV_Text": raw_cv,
+        }
+        st.session_state.map_job_id = get_runner().submit(
+            "map_profile", job_simpan_profil, profil, metode_mapping
+        )
+
+
+# ========================================
+# HASIL PEMETAAN
+# ========================================
+if st.session_state.get("map_job_id"):
+    map_job = get_runner().get(st.session_state.map_job_id)
+    if map_job is not None and not map_job.done:
+        pantau_job("map_job_id", "🤖 AI sedang memetakan profil...")
+    else:
+        st.session_state.map_job_id = None
+        if map_job is None or map_job.status == STATUS_CANCELLED:
+            st.info("ℹ️ Pemetaan dibatalkan.")
+        elif map_job.status == STATUS_FAILED:
+            st.error(f"❌ Error mapping: {map_job.error}")
+            with st.expander("🐛 Detail Error"):
+                st.code(map_job.traceback)
+        else:
+            hasil = map_job.result
+            delta = hasil["delta"]
+            if delta and (delta["ditambah"] or delta["diubah"] or delta["dihapus"]):
+                st.info(
+                    f"🔄 Index PON diperbarui ke versi {delta['version']}: "
+                    f"+{len(delta['ditambah'])} ~{len(delta['diubah'])} -{len(delta['dihapus'])} okupasi"
+                )
+
+            # Simpan hasil
+            st.session_state.talent_id = st.session_state.map_talent_id
+            st.session_state.mapped_okupasi_id = hasil["okupasi_id"]
+            st.session_state.mapped_okupasi_nama = hasil["okupasi_nama"]
+            st.session_state.skill_gap = hasil["gap"]
+            st.session_state.profile_text = hasil["profile_text"]
+            st.session_state.store_talent_id = hasil["store_talent_id"]
+            st.session_state.hasil_id = hasil["hasil_id"]
+
+            duplikat = hasil["duplikat"]
+            if duplikat:
+                info = (
+                    f"🔁 CV ini {duplikat['kemiripan']*100:.0f}% mirip dengan profil "
+                    f"**{duplikat['talent_id']}**; hasil pemetaan sebelumnya dipakai ulang."
+                )
+                if duplikat["asesmen"]:
+                    skor_lama, level_lama = duplikat["asesmen"]
+                    st.session_state.assessment_score = int(skor_lama)
+                    st.session_state.assessment_level = level_lama
+                    info += f" Hasil asesmen juga dipakai: {skor_lama:.0f}/100 ({level_lama})."
+                st.info(info)
+
+            # Tampilkan hasil
+            st.success(f"✅ Profil Berhasil Dipetakan & Disimpan! (TalentID: {hasil['store_talent_id']})")
+
+            st.subheader("📊 Hasil Pemetaan AI:")
+            col1, col2 = st.columns(2)
+            col1.metric("Okupasi Sesuai", hasil["okupasi_nama"])
+            col2.metric("Kecocokan", f"{hasil['skor']*100:.2f}%")
+
+            st.warning(f"⚠️ **Skill Gap:** {hasil['gap']}")
+
+            skills = hasil["skills"]
+            if skills:
+                with st.expander(f"🛠️ Skill Terdeteksi ({len(skills)})"):
+                    st.dataframe(skills_frame(skills), hide_index=True, use_container_width=True)
+
+            st.info("""
+            💡 **Next Step:**
+            Lanjut ke **Asesmen Kompetensi** untuk validasi!
+            """)
@@ -1,21 +1,31 @@
 # pages/2_🧠_Asesmen_Kompetensi.py
 """
 HALAMAN ASESMEN - ALL IN ONE
-Generate soal dengan Gemini AI + Validasi jawaban
+Asesmen adaptif (CAT) atas bank soal; soal baru dibuat Gemini AI hanya
+jika bank okupasi kehabisan soal, dengan soal template lokal bila AI lambat
 """
 
 import streamlit as st
-import pandas as pd
 import json
-import re
-import requests
 import datetime
+import random
+import secrets
 
+from assessment import (
+    SUMBER_LOKAL, build_question_prompt, extract_questions, local_questions, normalize_questions,
+    remote_or_local, request_questions_text
+)
+from cat_engine import estimate_theta, result_for, select_item, should_stop
 from config import (
-    EXCEL_PATH, SHEET_PON, 
-    GEMINI_API_KEY, GEMINI_BASE_URL, GEMINI_MODEL,
-    JUMLAH_SOAL
+    EXCEL_PATH, SHEET_PON, JUMLAH_SOAL, GEMINI_DEADLINE_ASESMEN, GEMINI_MAX_WAIT_ASESMEN, CAT_MAX_ITEMS,
+    CAT_SE_TARGET, SOAL_LATENCY_BUDGET
 )
+from data_loader import read_sheet_cached, text_of
+from gemini_client import PRIORITY_ASSESSMENT, Deadline, RateLimitExceeded
+from item_bank import get_item_bank
+from jobs import STATUS_CANCELLED, STATUS_FAILED, get_runner
+from metrics import timed
+from profile_store import get_profile_store
 
 # ========================================
 # KONFIGURASI
@@ -28,109 +38,41 @@ st.set_page_config(
 
 
 # ========================================
-# FUNGSI 1: LOAD EXCEL
-# ========================================
-@st.cache_data
-def load_excel_sheet(file_path, sheet_name):
-    """Membaca sheet dari Excel"""
-    try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=1)
-        df.columns = df.columns.str.strip()
-        df = df.fillna('')
-        return df
-    except Exception as e:
-        st.error(f"Gagal memuat sheet: {e}")
-        return None
-
-
-# ========================================
-# FUNGSI 2: CALL GEMINI API
+# FUNGSI 1: CALL GEMINI API
 # ========================================
-def call_gemini_api(prompt: str) -> str:
+@timed()
+def call_gemini_api(prompt: str, on_wait=None, deadline=None) -> str:
     """
-    Kirim request ke Gemini API
+    Kirim request ke Gemini API (antrian & timeout dibatasi sisa `deadline`)
     Return: Response text dari AI
     """
-    url = f"{GEMINI_BASE_URL}/models/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
-    
-    headers = {"Content-Type": "application/json"}
-    
-    json_instruction = """
-PENTING: Respons HARUS JSON valid.
-Format:
-{
-  "questions": [
-    {"id": "q1", "teks": "...", "opsi": ["A", "B", "C", "D"], "jawaban_benar": "A"}
-  ]
-}
-"""
-    
-    payload = {
-        "contents": [{
-            "parts": [{"text": prompt + json_instruction}]
-        }],
-        "generationConfig": {
-            "temperature": 0.7,
-            "maxOutputTokens": 3000
-        }
-    }
-    
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        result = response.json()
-        
-        # Ekstrak text
-        content = result['candidates'][0]['content']['parts'][0]['text']
-        
-        # Clean markdown fence
-        content = content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-        
-        return content
-        
+        return request_questions_text(prompt, PRIORITY_ASSESSMENT, GEMINI_MAX_WAIT_ASESMEN, on_wait, deadline)
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         raise Exception(f"Error calling Gemini: {e}")
 
 
 # ========================================
-# FUNGSI 3: SANITIZE JSON
+# FUNGSI 2: GENERATE SOAL (JOB LATAR BELAKANG)
 # ========================================
-def sanitize_json_response(text: str) -> str:
-    """Bersihkan JSON dari karakter aneh"""
-    # Hapus escape sequence invalid
-    text = re.sub(r'\\(?![ntr"\\/bfuU])', '', text)
-    text = text.replace("\\'", "'")
-    
-    # Hapus control characters
-    text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
-    
-    # Fix missing commas
-    text = re.sub(r'\}\s*\{', '},{', text)
-    text = re.sub(r'\]\s*"', '],"', text)
-    
-    return text.strip()
-
-
-# ========================================
-# FUNGSI 4: GENERATE SOAL
-# ========================================
-def generate_assessment_questions(okupasi_id: str):
+@timed()
+def generate_assessment_questions(job, okupasi_id: str):
     """
-    Generate soal dengan AI Gemini
-    Return: List of dict (5 soal)
+    Generate soal dengan AI Gemini lalu simpan ke bank soal okupasi.
+    Lewat SOAL_LATENCY_BUDGET detik (atau Gemini gagal) dipakai soal template
+    lokal; soal Gemini yang telat tetap masuk bank untuk sesi berikutnya,
+    selama belum lewat GEMINI_DEADLINE_ASESMEN sejak job mulai.
+    Berjalan di worker jobs.py, jadi tanpa elemen Streamlit; error dilempar
+    dan ditampilkan halaman saat polling.
+    Return: jumlah soal baru di bank
     """
+    deadline = Deadline(GEMINI_DEADLINE_ASESMEN)
+
     # Load data okupasi
-    df_pon = load_excel_sheet(EXCEL_PATH, SHEET_PON)
-    
-    if df_pon is None:
-        raise Exception("Gagal load data PON TIK")
+    job.report(0.05, "📂 Memuat data okupasi...")
+    df_pon = read_sheet_cached(EXCEL_PATH, SHEET_PON)
     
     # Cari okupasi
     pon_data = df_pon[df_pon['OkupasiID'] == okupasi_id]
@@ -139,139 +81,55 @@ def generate_assessment_questions(okupasi_id: str):
         raise Exception(f"Okupasi {okupasi_id} tidak ditemukan")
     
     okupasi_info = pon_data.iloc[0]
-    okupasi_nama = okupasi_info['Okupasi']
-    unit_kompetensi = okupasi_info['Unit_Kompetensi']
-    kuk_keywords = okupasi_info['Kuk_Keywords']
+    okupasi_nama = text_of(okupasi_info['Okupasi']) or okupasi_id
     
     # Buat prompt
-    prompt = f"""Anda adalah expert TIK Indonesia.
-
-Buat TEPAT {JUMLAH_SOAL} soal pilihan ganda untuk:
-
-**Okupasi:** {okupasi_nama}
-**Unit Kompetensi:** {unit_kompetensi}
-**Keterampilan:** {kuk_keywords}
-
-**Kriteria:**
-1. Relevan dengan kompetensi
-2. Tingkat: Menengah-Ahli
-3. Skenario praktis
-4. TEPAT 4 opsi per soal
-5. 1 jawaban benar
-6. Bahasa Indonesia
-7. HINDARI karakter khusus
-
-**Format JSON:**
-{{
-  "questions": [
-    {{
-      "id": "q1",
-      "teks": "Pertanyaan...",
-      "opsi": ["Opsi A", "Opsi B", "Opsi C", "Opsi D"],
-      "jawaban_benar": "Opsi A"
-    }}
-  ]
-}}
-
-ATURAN:
-- {JUMLAH_SOAL} soal (q1-q{JUMLAH_SOAL})
-- Pisahkan dengan koma
-- jawaban_benar = salah satu opsi
-- Output HANYA JSON
-"""
+    prompt = build_question_prompt(
+        okupasi_nama, text_of(okupasi_info['Unit_Kompetensi']), text_of(okupasi_info['Kuk_Keywords'])
+    )
+    cadangan = local_questions(okupasi_id)
+    bank = get_item_bank()
 
-    try:
-        # Call API
-        response_text = call_gemini_api(prompt)
-        
-        # Sanitize & parse
-        response_text = sanitize_json_response(response_text)
-        response_json = json.loads(response_text)
-        
-        # Ekstrak questions
-        if isinstance(response_json, dict) and "questions" in response_json:
-            questions = response_json["questions"]
-        elif isinstance(response_json, list):
-            questions = response_json
-        else:
-            raise ValueError("Format tidak dikenali")
-        
-        # Validasi jumlah
+    def remote():
+        # Call API (antrian rate limiter dilaporkan sebagai pesan progress)
+        response_text = call_gemini_api(prompt, job.on_wait, deadline)
+        try:
+            # Sanitize & parse
+            questions = extract_questions(response_text)
+        except json.JSONDecodeError as e:
+            raise Exception(f"Error parsing JSON: {e}\n\nResponse: {response_text[:2000]}")
+
+        # Validasi jumlah & struktur
         if len(questions) != JUMLAH_SOAL:
-            st.warning(f"AI buat {len(questions)} soal, bukan {JUMLAH_SOAL}")
-            # Tambah dummy jika kurang
-            while len(questions) < JUMLAH_SOAL:
-                questions.append({
-                    "id": f"q{len(questions)+1}",
-                    "teks": f"[Soal tambahan] Bagaimana menangani darurat di {okupasi_nama}?",
-                    "opsi": ["Eskalasi", "Konsultasi", "Dokumentasi", "Trial"],
-                    "jawaban_benar": "Konsultasi"
-                })
-            questions = questions[:JUMLAH_SOAL]
-        
-        # Validasi struktur
-        for i, q in enumerate(questions):
-            if not all(k in q for k in ["id", "teks", "opsi", "jawaban_benar"]):
-                raise ValueError(f"Soal {i+1} struktur tidak lengkap")
-            
-            if len(q["opsi"]) != 4:
-                raise ValueError(f"Soal {i+1} tidak punya 4 opsi")
-            
-            if q["jawaban_benar"] not in q["opsi"]:
-                raise ValueError(f"Soal {i+1}: Jawaban tidak di opsi")
-            
-            q["id"] = f"q{i+1}"
-            q["tipe"] = "pilihan_ganda"
-        
-        return questions
-        
-    except json.JSONDecodeError as e:
-        error_msg = f"❌ Error parsing JSON: {e}\n\nResponse: {response_text[:2000]}"
-        st.error(error_msg)
-        raise Exception(error_msg)
-        
-    except Exception as e:
-        st.error(f"❌ Error generate soal: {e}")
-        raise
+            job.warn(f"AI buat {len(questions)} soal, bukan {JUMLAH_SOAL}")
+        return normalize_questions(questions, okupasi_nama, cadangan=cadangan)
+
+    job.report(0.15, "🤖 AI sedang membuat soal...")
+    questions, sumber = remote_or_local(
+        remote, lambda: cadangan, deadline.cap(SOAL_LATENCY_BUDGET), on_late=lambda qs: bank.add_items(okupasi_id, qs)
+    )
+    if sumber == SUMBER_LOKAL:
+        job.warn("⚡ AI sedang lambat; soal disusun dari standar kompetensi PON okupasi Anda.")
+    job.report(0.9, "🔍 Menyimpan soal...")
+    return bank.add_items(okupasi_id, questions)
 
 
 # ========================================
-# FUNGSI 5: VALIDASI JAWABAN
+# FUNGSI 3: PANTAU JOB (POLLING)
 # ========================================
-def validate_assessment(answers: dict, questions: list):
+@st.fragment(run_every=1.0)
+def pantau_job(state_key: str, label: str):
     """
-    Validasi jawaban user
-    Return: (skor, level)
+    Progress job di session_state[state_key]; hanya fragment ini yang
+    dijalankan ulang tiap detik. Rerun penuh begitu job selesai.
     """
-    if not questions:
-        return 0, "Error"
-    
-    total = len(questions)
-    correct = 0
-    
-    for q in questions:
-        q_id = q['id']
-        correct_answer = q['jawaban_benar']
-        
-        if q_id in answers:
-            user_answer = answers[q_id]
-            if user_answer == correct_answer:
-                correct += 1
-    
-    # Hitung skor
-    skor = int((correct / total) * 100)
-    
-    # Tentukan level
-    if skor >= 90:
-        level = "Ahli"
-    elif skor >= 70:
-        level = "Menengah"
-    elif skor >= 50:
-        level = "Junior"
-    else:
-        level = "Pemula"
-    
-    return skor, level
+    job = get_runner().get(st.session_state.get(state_key))
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"{label} {job.message}")
+    if st.button("✖️ Batalkan", key=f"batal_{state_key}"):
+        get_runner().cancel(job.id)
+        st.rerun()
 
 
 # ========================================
@@ -289,100 +147,184 @@ if not st.session_state.get('talent_id'):
 # ========================================
 st.info(f"👤 Login: **{st.session_state.talent_id}**")
 st.header(f"📝 Asesmen: {st.session_state.mapped_okupasi_nama}")
-st.markdown("AI telah generate soal sesuai okupasi Anda.")
+st.markdown(
+    "Soal dipilih adaptif sesuai jawaban Anda: asesmen berhenti begitu "
+    "level kompetensi cukup pasti (maksimal " f"{CAT_MAX_ITEMS} soal)."
+)
 
 
 # ========================================
-# GENERATE SOAL (SEKALI SAJA)
+# FUNGSI 4: SESI CAT
 # ========================================
-if 'questions' not in st.session_state or st.session_state.questions is None:
-    with st.spinner("🤖 AI sedang membuat soal..."):
-        try:
-            questions = generate_assessment_questions(
-                st.session_state.mapped_okupasi_id
+def mulai_sesi_cat(okupasi_id):
+    """Sesi asesmen adaptif baru di session_state"""
+    st.session_state.cat = {
+        "okupasi_id": okupasi_id,
+        "session": secrets.token_urlsafe(12),
+        "jawaban": [],      # [(item_id, benar, jawaban user)]
+        "theta": 0.0,
+        "se": 1.0,
+        "current": None,    # soal yang sedang tampil (opsi sudah diacak)
+        "selesai": False,
+    }
+
+
+def estimasi_sesi(cat, items):
+    """(theta, se) dari jawaban sesi dengan parameter soal terbaru di bank"""
+    param = {it["item_id"]: (it["a"], it["b"]) for it in items}
+    return estimate_theta([(*param[i], benar) for i, benar, _ in cat["jawaban"] if i in param])
+
+
+def soal_berikutnya(cat, items):
+    """Pilih soal berikutnya (opsi diacak); None jika bank habis untuk sesi ini"""
+    item = select_item(items, cat["theta"], [i for i, _, _ in cat["jawaban"]])
+    if item is None:
+        return None
+    return dict(item, opsi=random.sample(item["opsi"], len(item["opsi"])))
+
+
+# ========================================
+# SIAPKAN SESI & SOAL
+# ========================================
+okupasi_id = st.session_state.mapped_okupasi_id
+if st.session_state.get("cat") is None or st.session_state.cat["okupasi_id"] != okupasi_id:
+    mulai_sesi_cat(okupasi_id)
+cat = st.session_state.cat
+bank = get_item_bank()
+items = bank.items_for(okupasi_id)
+
+if st.session_state.get("questions_job_okupasi") != okupasi_id:
+    st.session_state.questions_job_id = None
+
+if not cat["selesai"] and cat["current"] is None:
+    # Bank kehabisan soal untuk sesi ini: minta Gemini membuat soal baru (satu job per okupasi)
+    if not st.session_state.get("questions_job_id"):
+        cat["current"] = soal_berikutnya(cat, items)
+        if cat["current"] is None and not cat.get("bank_habis"):
+            st.session_state.questions_job_okupasi = okupasi_id
+            st.session_state.questions_job_id = get_runner().submit(
+                "generate_questions", generate_assessment_questions, okupasi_id
             )
-            st.session_state.questions = questions
-            st.success(f"✅ {len(questions)} soal siap!")
-        except Exception as e:
-            st.error(f"❌ Gagal: {e}")
+
+    if st.session_state.get("questions_job_id"):
+        job = get_runner().get(st.session_state.questions_job_id)
+        if job is not None and not job.done:
+            pantau_job("questions_job_id", "🤖 AI sedang membuat soal...")
+            st.stop()
+
+        st.session_state.questions_job_id = None
+        if job is None or job.status == STATUS_CANCELLED:
+            st.info("ℹ️ Pembuatan soal dibatalkan.")
+            st.button("🔄 Buat soal lagi")
+            st.stop()
+        if job.status == STATUS_FAILED:
+            if isinstance(job.exception, RateLimitExceeded):
+                st.warning(
+                    f"⏳ AI sedang melayani banyak pengguna. Coba lagi dalam ~{max(1, round(job.exception.eta))} detik."
+                )
+                st.button("🔄 Coba lagi")
+            else:
+                st.error(f"❌ Gagal: {job.error}")
+            if cat["jawaban"]:
+                # Callback jalan sebelum rerun, jadi job baru tidak dikirim lagi
+                st.button("✅ Selesaikan dengan jawaban saat ini", on_click=cat.update, kwargs={"bank_habis": True})
+            st.stop()
+
+        for catatan in job.warnings:
+            st.warning(catatan)
+        items = bank.items_for(okupasi_id)
+        cat["current"] = soal_berikutnya(cat, items)
+        # Soal baru semuanya kembar dengan yang sudah dijawab: selesaikan dengan estimasi saat ini
+        cat["bank_habis"] = cat["current"] is None
+
+    if cat["current"] is None:
+        cat["selesai"] = bool(cat["jawaban"])
+        if not cat["selesai"]:
+            st.error("❌ Bank soal untuk okupasi ini masih kosong.")
             st.stop()
-else:
-    questions = st.session_state.questions
-    st.success(f"📋 {len(questions)} soal tersedia")
 
 
 # ========================================
-# FORM ASESMEN
+# FORM ASESMEN (SATU SOAL PER LANGKAH)
 # ========================================
-answers = {}
+if not cat["selesai"]:
+    q = cat["current"]
+    nomor = len(cat["jawaban"]) + 1
+    st.progress(min(1.0, (nomor - 1) / CAT_MAX_ITEMS), text=f"Soal ke-{nomor} (maksimal {CAT_MAX_ITEMS})")
+    if cat["jawaban"]:
+        st.caption(f"Presisi saat ini: SE {cat['se']:.2f} (selesai jika ≤ {CAT_SE_TARGET})")
 
-with st.form("assessment_form"):
-    for i, q in enumerate(questions):
-        st.subheader(f"❓ Pertanyaan {i+1}")
+    with st.form(f"cat_form_{nomor}"):
+        st.subheader(f"❓ Pertanyaan {nomor}")
         st.markdown(f"**{q['teks']}**")
-        
-        if q['tipe'] == 'pilihan_ganda':
-            answers[q['id']] = st.radio(
-                "Pilih:", 
-                q['opsi'], 
-                key=q['id'],
-                label_visibility="collapsed"
-            )
-    
-    submit = st.form_submit_button("🚀 Kirim Jawaban")
+        jawaban = st.radio("Pilih:", q["opsi"], key=f"cat_{q['item_id']}", label_visibility="collapsed")
+        submit = st.form_submit_button("➡️ Jawab")
+
+    if submit:
+        benar = jawaban == q["jawaban_benar"]
+        try:
+            bank.record_response(cat["session"], q, benar)
+            bank.schedule_calibration(okupasi_id)
+        except Exception as e:
+            st.warning(f"⚠️ Jawaban belum tercatat di bank soal: {e}")
+        cat["jawaban"].append((q["item_id"], int(benar), jawaban))
+        items = bank.items_for(okupasi_id)
+        cat["theta"], cat["se"] = estimasi_sesi(cat, items)
+        sisa = len(items) - len(cat["jawaban"])
+        cat["current"] = None
+        # Sisa 0 tidak langsung berhenti: bank bisa ditambah soal baru dari Gemini
+        cat["selesai"] = should_stop(len(cat["jawaban"]), cat["se"], max(sisa, 1))
+        st.rerun()
+    st.stop()
 
 
 # ========================================
-# PROSES SUBMISSION
+# HASIL ASESMEN
 # ========================================
-if submit:
-    with st.spinner("🔍 AI sedang menilai..."):
+skor, level = result_for(cat["theta"])
+if not cat.get("disimpan"):
+    st.session_state.assessment_score = skor
+    st.session_state.assessment_level = level
+    st.session_state.assessment_date = datetime.datetime.now()
+    if st.session_state.get('hasil_id'):
         try:
-            skor, level = validate_assessment(
-                answers, 
-                st.session_state.questions
-            )
-            
-            # Simpan hasil
-            st.session_state.assessment_score = skor
-            st.session_state.assessment_level = level
-            st.session_state.assessment_date = datetime.datetime.now()
-            
-            # Tampilkan hasil
-            st.success("✅ Asesmen Selesai!")
-            st.balloons()
-            
-            st.subheader("📊 Hasil Validasi:")
-            col1, col2 = st.columns(2)
-            col1.metric("Skor", f"{skor}/100")
-            col2.metric("Level", level)
-            
-            # Detail jawaban
-            with st.expander("📝 Detail Jawaban"):
-                correct_count = 0
-                
-                for q in st.session_state.questions:
-                    user_ans = answers.get(q['id'], '-')
-                    is_correct = user_ans == q['jawaban_benar']
-                    
-                    if is_correct:
-                        correct_count += 1
-                        st.success(f"""
-                        **{q['teks']}**
-                        ✅ Benar: {user_ans}
-                        """)
-                    else:
-                        st.error(f"""
-                        **{q['teks']}**
-                        ❌ Anda: {user_ans}
-                        ✅ Benar: {q['jawaban_benar']}
-                        """)
-                
-                st.info(f"Total: {correct_count}/{len(st.session_state.questions)}")
-            
-            st.info("""
-            💡 **Next:** Lihat rekomendasi di halaman berikutnya!
-            """)
-            
+            get_profile_store().record_assessment(st.session_state.hasil_id, skor, level)
         except Exception as e:
-            st.error(f"❌ Error validasi: {e}")
+            st.warning(f"⚠️ Hasil asesmen belum tersimpan: {e}")
+    cat["disimpan"] = True
+    st.balloons()
+
+st.success(f"✅ Asesmen Selesai dalam {len(cat['jawaban'])} soal!")
+st.subheader("📊 Hasil Validasi:")
+col1, col2, col3 = st.columns(3)
+col1.metric("Skor", f"{skor}/100")
+col2.metric("Level", level)
+col3.metric("Presisi (SE)", f"{cat['se']:.2f}")
+
+# Detail jawaban
+with st.expander("📝 Detail Jawaban"):
+    per_id = {it["item_id"]: it for it in items}
+    for item_id, benar, user_ans in cat["jawaban"]:
+        q = per_id.get(item_id)
+        if q is None:
+            continue
+        if benar:
+            st.success(f"""
+            **{q['teks']}**
+            ✅ Benar: {user_ans}
+            """)
+        else:
+            st.error(f"""
+            **{q['teks']}**
+            ❌ Anda: {user_ans}
+            ✅ Benar: {q['jawaban_benar']}
+            """)
+    st.info(f"Total: {sum(b for _, b, _ in cat['jawaban'])}/{len(cat['jawaban'])}")
+
+st.info("""
+💡 **Next:** Lihat rekomendasi di halaman berikutnya!
+""")
+
+if st.button("🔄 Ulangi Asesmen"):
+    mulai_sesi_cat(okupasi_id)
+    st.rerun()
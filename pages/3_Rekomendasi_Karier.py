@@ -2,16 +2,22 @@
 # Chatbot AI untuk analisis profil & rekomendasi karier
 
 import streamlit as st
+import pandas as pd
 import json
 import random
-import requests
+import re
+import secrets
 from datetime import datetime
 import mistune
 
+from chat_store import get_chat_store
 from config import (
-    EXCEL_PATH, SHEET_LOWONGAN,
-    GEMINI_API_KEY, GEMINI_BASE_URL, GEMINI_MODEL
+    CHAT_OLDER_MAX, CHAT_PAGE_SIZE, CHAT_WINDOW, EXCEL_PATH, GEMINI_DEADLINE_CHAT, GEMINI_MAX_WAIT_CHAT, SHEET_LOWONGAN
 )
+from data_loader import read_sheet_cached
+from gemini_client import PRIORITY_CHAT, Deadline, RateLimitExceeded, generate_content
+from metrics import timed
+from skill_extractor import load_skill_extractor, match_vacancies
 
 # ========================================
 # KONFIGURASI
@@ -263,16 +269,72 @@ footer {visibility: hidden;}
 </style>
 """, unsafe_allow_html=True)
 
+# ========================================
+# RIWAYAT CHAT (SQLITE + JENDELA DI MEMORI)
+# Hanya CHAT_WINDOW pesan terakhir di session_state; pesan lama dibaca per
+# halaman dari chat_store, paling banyak CHAT_OLDER_MAX sekaligus. Id percakapan disimpan di URL (?chat=...), jadi
+# refresh / reconnect melanjutkan percakapan yang sama.
+# ========================================
+_CHAT_ID_RE = re.compile(r"^[\w-]{8,64}$")
+
+chat_store = get_chat_store()
+
+
+def tambah_pesan(role: str, content: str):
+    """Simpan pesan ke store lalu geser jendela pesan di memori"""
+    message = chat_store.append(
+        st.session_state.chat_id, role, content,
+        timestamp=datetime.now().strftime("%H:%M"),
+        talent_id=st.session_state.get('talent_id'),
+    )
+    history = st.session_state.chat_history
+    history.append(message)
+    if len(history) > CHAT_WINDOW:
+        lebih = len(history) - CHAT_WINDOW
+        # Pesan lama sedang dibuka user: pindahkan, bukan dibuang dari tampilan
+        older = st.session_state.chat_older
+        if older:
+            older.extend(history[:lebih])
+            del older[:max(0, len(older) - CHAT_OLDER_MAX)]
+        del history[:lebih]
+
+
+def muat_pesan_lama():
+    """
+    Satu halaman pesan sebelum pesan tertua yang tampil. Jika chat_older melewati
+    CHAT_OLDER_MAX, pesan lama yang terbaru dibuang (dibaca ulang dari store bila perlu).
+    """
+    older = st.session_state.chat_older
+    tertua = (older or st.session_state.chat_history)[0]["id"]
+    halaman = chat_store.before(st.session_state.chat_id, tertua, CHAT_PAGE_SIZE)
+    st.session_state.chat_older = (halaman + older)[:CHAT_OLDER_MAX]
+
+
+def ada_celah():
+    """Ada pesan tersimpan di antara chat_older dan chat_history (sudah dibuang dari memori)?"""
+    older, history = st.session_state.chat_older, st.session_state.chat_history
+    if not older or not history:
+        return False
+    sebelum = chat_store.before(st.session_state.chat_id, history[0]["id"], 1)
+    return bool(sebelum) and sebelum[0]["id"] != older[-1]["id"]
+
+
 # ========================================
 # INISIALISASI SESSION STATE
 # ========================================
+if 'chat_id' not in st.session_state:
+    chat_id = str(st.query_params.get("chat", ""))
+    st.session_state.chat_id = chat_id if _CHAT_ID_RE.match(chat_id) else secrets.token_urlsafe(12)
+st.query_params["chat"] = st.session_state.chat_id
+
 if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
-    st.session_state.chat_history.append({
-        "role": "ai",
-        "content": "👋 **Halo! Saya Career Assistant AI**\n\nSaya siap membantu Anda menemukan jalur karier yang tepat di bidang TIK!\n\n💡 **Ceritakan kepada saya:**\n• Pengalaman kerja Anda\n• Skill teknis yang dikuasai\n• Minat & passion karier\n\nYuk mulai percakapan! 🚀",
-        "timestamp": datetime.now().strftime("%H:%M")
-    })
+    st.session_state.chat_history = chat_store.recent(st.session_state.chat_id, CHAT_WINDOW)
+    st.session_state.chat_older = []
+    if not st.session_state.chat_history:
+        tambah_pesan(
+            "ai",
+            "👋 **Halo! Saya Career Assistant AI**\n\nSaya siap membantu Anda menemukan jalur karier yang tepat di bidang TIK!\n\n💡 **Ceritakan kepada saya:**\n• Pengalaman kerja Anda\n• Skill teknis yang dikuasai\n• Minat & passion karier\n\nYuk mulai percakapan! 🚀"
+        )
 
 if 'waiting_response' not in st.session_state:
     st.session_state.waiting_response = False
@@ -284,29 +346,32 @@ if 'trigger_ai_response' not in st.session_state:
 # ========================================
 # FUNGSI: CALL GEMINI API
 # ========================================
-def call_gemini_api(prompt: str) -> str:
-    """Kirim request ke Gemini API"""
-    url = f"{GEMINI_BASE_URL}/models/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
-    
-    headers = {"Content-Type": "application/json"}
-    
-    payload = {
-        "contents": [{
-            "parts": [{"text": prompt}]
-        }],
-        "generationConfig": {
-            "temperature": 0.8,
-            "maxOutputTokens": 1500
-        }
-    }
-    
+# Balasan saat Gemini tidak menjawab sebelum deadline dan tidak ada respons cache
+JAWABAN_LAMBAT = (
+    "⌛ Maaf, Career Coach AI sedang lambat merespons. "
+    "Silakan kirim ulang pesan Anda sebentar lagi."
+)
+
+
+@timed()
+def call_gemini_api(prompt: str, on_wait=None, deadline=None) -> str:
+    """
+    Kirim request ke Gemini API (prioritas chat). Antrian dibatasi GEMINI_MAX_WAIT_CHAT;
+    total waktu (antrian, request, hedge) dibatasi `deadline`
+    """
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        result = response.json()
-        
-        content = result['candidates'][0]['content']['parts'][0]['text']
+        content = generate_content(
+            prompt, temperature=0.8, max_output_tokens=1500,
+            priority=PRIORITY_CHAT, max_wait=GEMINI_MAX_WAIT_CHAT, on_wait=on_wait,
+            deadline=deadline or Deadline(GEMINI_DEADLINE_CHAT), fallback=JAWABAN_LAMBAT,
+        )
         return content.strip()
+
+    except RateLimitExceeded as e:
+        return (
+            "⏳ Maaf, Career Coach AI sedang melayani banyak pengguna. "
+            f"Silakan kirim ulang pesan Anda dalam ~{max(1, round(e.eta))} detik."
+        )
         
     except Exception as e:
         return f"❌ Maaf, terjadi kesalahan koneksi. Silakan coba lagi.\n\nDetail: {str(e)}"
@@ -315,7 +380,7 @@ def call_gemini_api(prompt: str) -> str:
 # ========================================
 # FUNGSI: ANALISIS KARIER AI
 # ========================================
-def get_career_analysis(user_message: str, chat_history: list) -> str:
+def get_career_analysis(user_message: str, chat_history: list, on_wait=None, deadline=None) -> str:
     """Generate response dari AI berdasarkan context chat"""
     
     context = "\n".join([
@@ -344,12 +409,13 @@ def get_career_analysis(user_message: str, chat_history: list) -> str:
 
 Jawab sekarang:"""
 
-    return call_gemini_api(prompt)
+    return call_gemini_api(prompt, on_wait, deadline)
 
 
 # ========================================
 # FUNGSI: RENDER CHAT BUBBLE
 # ========================================
+@timed()
 def render_chat_bubble(message: dict):
     """Render chat bubble dengan avatar"""
     if message['role'] == 'user':
@@ -387,37 +453,24 @@ def render_chat_bubble(message: dict):
 # ========================================
 # FUNGSI: REKOMENDASI
 # ========================================
+def load_lowongan():
+    """Sheet Lowongan_Industri (kosong jika gagal dibaca); cache di read_sheet_cached"""
+    try:
+        return read_sheet_cached(EXCEL_PATH, SHEET_LOWONGAN)
+    except Exception:
+        return pd.DataFrame()
+
+
 def get_recommendations(okupasi_id, skill_gap, profil_teks):
-    """Return: (jobs, trainings)"""
-    job_samples = [
-        {
-            "Posisi": "Data Analyst",
-            "Perusahaan": "Tech Innovate Indonesia",
-            "Lokasi": "Jakarta Selatan",
-            "Keterampilan_Dibutuhkan": "Python, SQL, Power BI, Excel",
-            "Deskripsi_Pekerjaan": "Menganalisis data bisnis untuk insight strategis perusahaan fintech."
-        },
-        {
-            "Posisi": "Machine Learning Engineer",
-            "Perusahaan": "AI Labs Indonesia",
-            "Lokasi": "Bandung",
-            "Keterampilan_Dibutuhkan": "Python, TensorFlow, PyTorch, AWS",
-            "Deskripsi_Pekerjaan": "Membangun dan deploy model AI untuk produk digital."
-        },
-        {
-            "Posisi": "DevOps Engineer",
-            "Perusahaan": "CloudTech Indonesia",
-            "Lokasi": "Jakarta Pusat",
-            "Keterampilan_Dibutuhkan": "Docker, Kubernetes, CI/CD, Terraform",
-            "Deskripsi_Pekerjaan": "Mengelola infrastruktur cloud dan automation pipeline."
-        },
-        {
-            "Posisi": "Frontend Developer",
-            "Perusahaan": "Digital Creative",
-            "Lokasi": "Yogyakarta",
-            "Keterampilan_Dibutuhkan": "React, TypeScript, Tailwind CSS",
-            "Deskripsi_Pekerjaan": "Membangun UI/UX responsive untuk aplikasi web modern."
-        }
+    """
+    Return: (jobs, trainings)
+    Lowongan diurutkan berdasarkan cakupan skill profil terhadap Keterampilan_Dibutuhkan
+    """
+    extractor = load_skill_extractor(EXCEL_PATH)
+    matches = match_vacancies(extractor, load_lowongan(), profil_teks, top_k=3)
+    jobs = [
+        dict(row, Skor_Skill=skor, Skill_Cocok=cocok, Skill_Kurang=kurang)
+        for row, skor, cocok, kurang in matches
     ]
 
     training_samples = [
@@ -429,7 +482,6 @@ def get_recommendations(okupasi_id, skill_gap, profil_teks):
         "☁️ Google Cloud Professional (Qwiklabs)"
     ]
 
-    jobs = random.sample(job_samples, k=min(3, len(job_samples)))
     trainings = random.sample(training_samples, k=min(4, len(training_samples)))
 
     return jobs, trainings
@@ -445,18 +497,21 @@ if st.session_state.trigger_ai_response:
         # Tampilkan typing indicator
         st.session_state.waiting_response = True
         
-        # Get AI response
+        # Get AI response (posisi antrian ditampilkan jika Gemini sedang ramai);
+        # deadline dihitung sejak pesan diproses, mencakup antrian & hedge
+        info_antrian = st.empty()
         ai_response = get_career_analysis(
             last_message['content'], 
-            st.session_state.chat_history
+            st.session_state.chat_history,
+            on_wait=lambda posisi, eta: info_antrian.info(
+                f"⏳ Menunggu giliran AI: antrian ke-{posisi + 1}, estimasi {eta:.0f} detik"
+            ),
+            deadline=Deadline(GEMINI_DEADLINE_CHAT),
         )
+        info_antrian.empty()
         
         # Tambahkan AI response
-        st.session_state.chat_history.append({
-            "role": "ai",
-            "content": ai_response,
-            "timestamp": datetime.now().strftime("%H:%M")
-        })
+        tambah_pesan("ai", ai_response)
         
         # Save profil
         st.session_state['profil_teks'] = last_message['content']
@@ -471,6 +526,17 @@ if st.session_state.trigger_ai_response:
 # ========================================
 st.markdown('<div class="chat-container" id="chat-box">', unsafe_allow_html=True)
 
+# Pesan lama hanya dibaca dari disk saat diminta
+pesan_tampil = st.session_state.chat_older + st.session_state.chat_history
+if pesan_tampil and chat_store.has_before(st.session_state.chat_id, pesan_tampil[0]["id"]):
+    if st.button("⬆️ Muat pesan sebelumnya"):
+        muat_pesan_lama()
+        st.rerun()
+
+for message in st.session_state.chat_older:
+    render_chat_bubble(message)
+if ada_celah():
+    st.caption("··· pesan di antaranya disembunyikan ···")
 for message in st.session_state.chat_history:
     render_chat_bubble(message)
 
@@ -498,41 +564,31 @@ col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     if st.button("💼 Lowongan", use_container_width=True):
-        st.session_state.chat_history.append({
-            "role": "user",
-            "content": "Lowongan apa yang cocok untuk saya?",
-            "timestamp": datetime.now().strftime("%H:%M")
-        })
+        tambah_pesan("user", "Lowongan apa yang cocok untuk saya?")
         st.session_state.trigger_ai_response = True
         st.rerun()
 
 with col2:
     if st.button("📚 Pelatihan", use_container_width=True):
-        st.session_state.chat_history.append({
-            "role": "user",
-            "content": "Pelatihan apa yang sebaiknya saya ikuti?",
-            "timestamp": datetime.now().strftime("%H:%M")
-        })
+        tambah_pesan("user", "Pelatihan apa yang sebaiknya saya ikuti?")
         st.session_state.trigger_ai_response = True
         st.rerun()
 
 with col3:
     if st.button("🎯 Analisis", use_container_width=True):
-        st.session_state.chat_history.append({
-            "role": "user",
-            "content": "Analisis skill saya dan kasih saran karier",
-            "timestamp": datetime.now().strftime("%H:%M")
-        })
+        tambah_pesan("user", "Analisis skill saya dan kasih saran karier")
         st.session_state.trigger_ai_response = True
         st.rerun()
 
 with col4:
     if st.button("🔄 Reset", use_container_width=True):
-        st.session_state.chat_history = [{
-            "role": "ai",
-            "content": "👋 **Chat direset!**\n\nSilakan mulai percakapan baru. Ceritakan tentang pengalaman dan minat karier Anda! 🚀",
-            "timestamp": datetime.now().strftime("%H:%M")
-        }]
+        chat_store.clear(st.session_state.chat_id)
+        st.session_state.chat_history = []
+        st.session_state.chat_older = []
+        tambah_pesan(
+            "ai",
+            "👋 **Chat direset!**\n\nSilakan mulai percakapan baru. Ceritakan tentang pengalaman dan minat karier Anda! 🚀"
+        )
         st.session_state.waiting_response = False
         st.session_state.trigger_ai_response = False
         st.rerun()
@@ -562,11 +618,7 @@ with st.form(key="chat_form", clear_on_submit=True):
 # PROSES INPUT USER
 # ========================================
 if send_button and user_input.strip():
-    st.session_state.chat_history.append({
-        "role": "user",
-        "content": user_input,
-        "timestamp": datetime.now().strftime("%H:%M")
-    })
+    tambah_pesan("user", user_input)
     st.session_state.trigger_ai_response = True
     st.rerun()
 
@@ -593,7 +645,7 @@ if 'assessment_score' in st.session_state and 'mapped_okupasi_id' in st.session_
                 jobs, trainings = get_recommendations(
                     st.session_state.get('mapped_okupasi_id', ''),
                     st.session_state.get('skill_gap', []),
-                    st.session_state.get('profil_teks', '')
+                    st.session_state.get('profile_text') or st.session_state.get('profil_teks', '')
                 )
             except Exception as e:
                 st.error(f"❌ Error: {e}")
@@ -609,8 +661,14 @@ if 'assessment_score' in st.session_state and 'mapped_okupasi_id' in st.session_
             else:
                 for idx, job in enumerate(jobs, 1):
                     with st.expander(f"🧩 **{job['Posisi']}** — {job['Perusahaan']}", expanded=(idx==1)):
-                        st.markdown(f"**📍 Lokasi:** {job['Lokasi']}")
+                        st.markdown(f"**📍 Lokasi:** {job['Lokasi'] or '-'}")
                         st.markdown(f"**🛠️ Skill:** `{job['Keterampilan_Dibutuhkan']}`")
+                        st.markdown(
+                            f"**✅ Kecocokan Skill:** {job['Skor_Skill']*100:.0f}% "
+                            f"({', '.join(job['Skill_Cocok'])})"
+                        )
+                        if job['Skill_Kurang']:
+                            st.markdown(f"**📌 Perlu Dipelajari:** {', '.join(job['Skill_Kurang'])}")
                         st.markdown(f"**📝 Deskripsi:**")
                         st.write(job['Deskripsi_Pekerjaan'])
                         st.button(f"Lamar Sekarang →", key=f"apply_{idx}", use_container_width=True)
@@ -7,6 +7,14 @@ Visualisasi data agregat (data dummy untuk demo)
 import streamlit as st
 import pandas as pd
 
+from config import EXCEL_PATH, SHEET_TALENTA
+from data_loader import read_sheet_cached
+from export_data import FORMAT_EXPORT, export_tables
+from gazetteer import geocode_lokasi
+from metrics import timed
+from report import build_snapshot, pdf_available, render_report_html, render_report_pdf
+from spatial_binning import bin_points
+
 # ========================================
 # KONFIGURASI
 # ========================================
@@ -17,6 +25,61 @@ st.set_page_config(
 )
 
 
+# ========================================
+# FUNGSI: LOAD EXCEL
+# ========================================
+@timed("load_excel_sheet")
+def load_excel_sheet(file_path, sheet_name):
+    """
+    Membaca sheet dari Excel. Tanpa st.cache_data: read_sheet_cached sudah
+    menyimpan satu salinan per proses, cache Streamlit hanya menggandakannya.
+    """
+    try:
+        return read_sheet_cached(file_path, sheet_name)
+    except Exception as e:
+        st.error(f"Gagal memuat sheet: {e}")
+        return None
+
+
+# ========================================
+# FUNGSI: SEBARAN LOKASI (GAZETTEER OFFLINE)
+# ========================================
+def get_sebaran_lokasi():
+    """
+    Hitung sebaran talenta per lokasi dari sheet Talenta
+    Koordinat diambil dari gazetteer lokasi (tanpa geocoding online)
+    """
+    df_talenta = load_excel_sheet(EXCEL_PATH, SHEET_TALENTA)
+
+    if df_talenta is None or 'Lokasi' not in df_talenta.columns:
+        return pd.DataFrame(columns=['Lokasi', 'Jumlah', 'lat', 'lon', 'size'])
+
+    geo = geocode_lokasi(df_talenta['Lokasi']).dropna(subset=['lat', 'lon'])
+
+    sebaran = (
+        geo.groupby(['lokasi', 'lat', 'lon'], as_index=False)
+        .size()
+        .rename(columns={'lokasi': 'Lokasi', 'size': 'Jumlah'})
+    )
+    sebaran['size'] = sebaran['Jumlah']
+
+    return sebaran
+
+
+@st.cache_data
+def get_peta_bin(sebaran_lokasi, zoom):
+    """
+    Binning sebaran lokasi di server sesuai zoom peta
+    Payload ke browser dibatasi jumlah bin, bukan jumlah talenta
+    """
+    return bin_points(
+        sebaran_lokasi['lat'],
+        sebaran_lokasi['lon'],
+        weight=sebaran_lokasi['Jumlah'],
+        zoom=zoom
+    )
+
+
 # ========================================
 # FUNGSI: GET DASHBOARD DATA (DUMMY)
 # ========================================
@@ -31,14 +94,8 @@ def get_national_dashboard_data():
         'Jumlah_Talenta': [45, 32, 28, 20]
     }).set_index('Okupasi')
 
-    # 2. Sebaran Lokasi (dummy)
-    sebaran_lokasi = pd.DataFrame({
-        'Lokasi': ['Jakarta', 'Bandung', 'Surabaya', 'Yogyakarta', 'Medan'],
-        'Jumlah': [50, 30, 25, 20, 15],
-        'lat': [-6.20, -6.91, -7.25, -7.79, 3.59],
-        'lon': [106.81, 107.61, 112.75, 110.36, 98.67],
-        'size': [50, 30, 25, 20, 15]
-    })
+    # 2. Sebaran Lokasi (dari sheet Talenta)
+    sebaran_lokasi = get_sebaran_lokasi()
     
     # 3. Skill Gap (dummy)
     skill_gap_umum = pd.DataFrame({
@@ -49,6 +106,19 @@ def get_national_dashboard_data():
     return distribusi_okupasi, sebaran_lokasi, skill_gap_umum
 
 
+def get_metrics_tambahan():
+    """
+    Return metrik ringkasan (dummy): nama -> (nilai, delta)
+    Dipakai untuk kartu metrik dan laporan
+    """
+    return {
+        "Total Talenta": ("1,245", "12 hari ini"),
+        "Okupasi Terpetakan": ("38", "PON TIK"),
+        "Asesmen Selesai": ("892", "71.6%"),
+        "Rata-rata Skor": ("74.2", "+2.3"),
+    }
+
+
 # ========================================
 # JUDUL
 # ========================================
@@ -56,7 +126,7 @@ st.title("📊 4. Dashboard Talenta Digital Nasional")
 st.markdown("""
 Visualisasi data agregat untuk pemangku kepentingan.
 
-**Catatan:** Data ini adalah simulasi untuk demo.
+**Catatan:** Sebaran lokasi dihitung dari data Talenta, data lain masih simulasi untuk demo.
 """)
 
 
@@ -76,7 +146,7 @@ st.markdown("Berapa banyak talenta di setiap okupasi PON TIK")
 if not dist_okupasi.empty:
     st.bar_chart(dist_okupasi)
     
-    top_okupasi = dist_okupasi.idxmax()[0]
+    top_okupasi = dist_okupasi.idxmax().iloc[0]
     st.info(f"💡 **Insight:** Okupasi terbanyak: **{top_okupasi}**")
 else:
     st.warning("⚠️ Belum ada data")
@@ -91,7 +161,15 @@ st.header("🗺️ Sebaran Talenta Nasional")
 st.markdown("Peta interaktif lokasi talenta digital Indonesia")
 
 if not sebaran_lokasi.empty:
-    st.map(sebaran_lokasi, size='size', zoom=4)
+    zoom = st.select_slider(
+        "Level zoom peta",
+        options=[4, 5, 6, 7, 8],
+        value=4,
+        help="Semakin besar zoom, semakin halus grid agregasi"
+    )
+    peta_bin = get_peta_bin(sebaran_lokasi, zoom)
+    st.map(peta_bin, size='size', zoom=zoom)
+    st.caption(f"🧮 {len(peta_bin)} bin dari {int(sebaran_lokasi['Jumlah'].sum())} talenta")
     
     top_lokasi = sebaran_lokasi.nlargest(1, 'Jumlah')
     if not top_lokasi.empty:
@@ -115,7 +193,7 @@ st.markdown("Keterampilan yang paling banyak kurang dikuasai")
 if not skill_gap.empty:
     st.bar_chart(skill_gap)
     
-    top_gap = skill_gap.idxmax()[0]
+    top_gap = skill_gap.idxmax().iloc[0]
     st.warning(f"""
     ⚠️ **Insight:** Gap terbesar: **{top_gap}**
     
@@ -135,46 +213,58 @@ st.markdown("---")
 # ========================================
 st.markdown("### 📈 Metrics Tambahan")
 
-col1, col2, col3, col4 = st.columns(4)
+metrics_tambahan = get_metrics_tambahan()
 
-col1.metric(
-    "Total Talenta", 
-    "1,245",
-    delta="12 hari ini"
-)
-col2.metric(
-    "Okupasi Terpetakan", 
-    "38",
-    delta="PON TIK"
-)
-col3.metric(
-    "Asesmen Selesai", 
-    "892",
-    delta="71.6%"
-)
-col4.metric(
-    "Rata-rata Skor", 
-    "74.2",
-    delta="+2.3"
-)
+for col, (nama_metrik, (nilai, delta)) in zip(st.columns(4), metrics_tambahan.items()):
+    col.metric(nama_metrik, nilai, delta=delta)
 
 st.markdown("---")
 
 
 # ========================================
-# EXPORT (PLACEHOLDER)
+# EXPORT
 # ========================================
 st.markdown("### 📥 Export Data")
 
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    if st.button("📄 Export Excel"):
-        st.info("Fitur akan segera hadir!")
+    # File dibuat saat tombol diklik (streaming per chunk), bukan di setiap rerun
+    format_export = st.selectbox(
+        "Format export",
+        list(FORMAT_EXPORT),
+        format_func=lambda f: {"xlsx": "Excel (.xlsx)", "csv": "CSV (zip)", "parquet": "Parquet (zip)"}[f],
+        label_visibility="collapsed"
+    )
+    nama_file, mime = FORMAT_EXPORT[format_export]
+    st.download_button(
+        "📄 Export Excel" if format_export == "xlsx" else f"📄 Export {format_export.upper()}",
+        data=lambda: export_tables(format_export),
+        file_name=nama_file,
+        mime=mime
+    )
         
 with col2:
-    if st.button("📊 Generate Report"):
-        st.info("Fitur akan segera hadir!")
+    # Snapshot agregat menentukan versi laporan; versi sama = dilayani dari cache
+    snapshot = build_snapshot(
+        dist_okupasi,
+        sebaran_lokasi,
+        skill_gap,
+        {nama_metrik: nilai for nama_metrik, (nilai, _) in metrics_tambahan.items()}
+    )
+    st.download_button(
+        "📊 Generate Report",
+        data=lambda: render_report_html(snapshot),
+        file_name=f"Laporan_DTP_{snapshot['periode']}.html",
+        mime="text/html"
+    )
+    if pdf_available():
+        st.download_button(
+            "📑 Report PDF",
+            data=lambda: render_report_pdf(snapshot),
+            file_name=f"Laporan_DTP_{snapshot['periode']}.pdf",
+            mime="application/pdf"
+        )
         
 with col3:
     if st.button("📧 Email Dashboard"):
@@ -0,0 +1,450 @@
+"""
+INDEX PON TIK
+Index pencarian okupasi PON untuk mapping profil talenta.
+
+Metode:
+- "tfidf"  : TF-IDF kata kunci + cosine similarity (default)
+- "lsa"    : representasi semantik padat, lihat semantic_index.py
+- "hashing": HashingVectorizer tanpa state; perubahan sheet PON diterapkan
+             per baris (delta OkupasiID) tanpa fit ulang, dengan nomor versi
+"""
+
+import hashlib
+import itertools
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import SHEET_PON, SHEET_TALENTA
+from data_loader import read_sheet, read_sheet_cached, source_signature, text_column
+from metrics import register_cache
+from text_analyzer import analyze
+
+# Kolom PON yang digabung menjadi dokumen okupasi
+PON_TEXT_COLUMNS = ['Okupasi', 'Unit_Kompetensi', 'Kuk_Keywords']
+
+PON_ID_COLUMN = 'OkupasiID'
+
+METODE_MAPPING = {
+    "tfidf": "TF-IDF (kata kunci)",
+    "lsa": "Semantik (LSA)",
+    "hashing": "Hashing (update inkremental)",
+}
+
+# Jumlah versi terakhir yang log perubahannya disimpan
+MAX_CHANGE_LOG = 100
+
+# Nomor generasi objek index; tidak pernah dipakai ulang (berbeda dengan id())
+_GENERASI = itertools.count(1)
+
+
+def build_pon_corpus(df_pon):
+    """Gabungkan teks okupasi: Okupasi + Unit_Kompetensi + Kuk_Keywords"""
+    return (
+        text_column(df_pon, 'Okupasi') + ' ' +
+        text_column(df_pon, 'Unit_Kompetensi') + ' ' +
+        text_column(df_pon, 'Kuk_Keywords')
+    )
+
+
+def okupasi_ids_of(df_pon):
+    """OkupasiID per baris (fallback: nomor baris jika kolom tidak ada)"""
+    if PON_ID_COLUMN in df_pon.columns:
+        return df_pon[PON_ID_COLUMN].astype(str).to_numpy()
+    return np.array([str(i) for i in range(len(df_pon))], dtype=object)
+
+
+def top_k_from_scores(scores, top_k):
+    """
+    Ambil top-k per baris dari matriks skor (n_query x n_okupasi).
+    Return: list (per query) of list (posisi_okupasi, skor), urut menurun
+    """
+    scores = np.asarray(scores)
+    k = min(top_k, scores.shape[1])
+    if k <= 0:
+        return [[] for _ in range(scores.shape[0])]
+
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-part, axis=1, kind="stable")
+    idx = np.take_along_axis(idx, order, axis=1)
+    part = np.take_along_axis(part, order, axis=1)
+
+    return [
+        [(int(i), float(s)) for i, s in zip(row_idx, row_scores)]
+        for row_idx, row_scores in zip(idx, part)
+    ]
+
+
+class BasePonIndex:
+    """
+    Antarmuka bersama semua index PON.
+    Index statis (tfidf/lsa) selalu versi 0; perubahan data = bangun index baru.
+    Setiap objek index mendapat `generation` unik, jadi index yang dibangun
+    ulang tidak pernah dianggap sama dengan index lama.
+    """
+
+    metode = None
+    version = 0
+
+    def __init__(self, df_pon):
+        self.generation = next(_GENERASI)
+        self.df_pon = df_pon
+        self.okupasi_ids = okupasi_ids_of(df_pon)
+
+    def search_batch(self, profile_texts, top_k=1):
+        raise NotImplementedError
+
+    def search(self, profile_text, top_k=1):
+        """Return: list of (posisi_okupasi, skor) untuk satu profil"""
+        return self.search_batch([profile_text], top_k)[0]
+
+    def search_ids(self, profile_text, top_k=1):
+        """Seperti search, tapi return list of (OkupasiID, skor)"""
+        return [(self.okupasi_ids[i], s) for i, s in self.search(profile_text, top_k)]
+
+    def row_for(self, okupasi_id):
+        """Baris df_pon untuk OkupasiID"""
+        pos = np.flatnonzero(self.okupasi_ids == okupasi_id)
+        return self.df_pon.iloc[int(pos[0])] if len(pos) else None
+
+    def changes_since(self, version):
+        """OkupasiID yang berubah sejak `version`; None = tidak diketahui (anggap semua)"""
+        return set() if version == self.version else None
+
+    @property
+    def fingerprint(self):
+        """
+        Sidik index (metode + isi sheet PON) yang stabil antar proses, untuk
+        mencocokkan hasil pemetaan tersimpan dengan index saat ini.
+        Dihitung ulang hanya saat `version` berubah.
+        """
+        cache = getattr(self, "_fingerprint", None)
+        if cache is None or cache[0] != self.version:
+            h = hashlib.sha1(str(self.metode).encode("utf-8"))
+            h.update(pd.util.hash_pandas_object(self.df_pon.astype(str), index=False).to_numpy().tobytes())
+            cache = self._fingerprint = (self.version, h.hexdigest()[:16])
+        return cache[1]
+
+    def score_ids(self, profile_text, okupasi_ids):
+        """Skor profil terhadap sebagian okupasi saja"""
+        raise NotImplementedError
+
+
+class TfidfPonIndex(BasePonIndex):
+    """TF-IDF 1000 fitur + cosine similarity terhadap semua okupasi"""
+
+    metode = "tfidf"
+
+    def __init__(self, df_pon):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        super().__init__(df_pon)
+        self.vectorizer = TfidfVectorizer(analyzer=analyze, max_features=1000)
+        self.pon_vectors = self.vectorizer.fit_transform(build_pon_corpus(df_pon))
+
+    def search_batch(self, profile_texts, top_k=1):
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        query_vectors = self.vectorizer.transform(profile_texts)
+        scores = cosine_similarity(query_vectors, self.pon_vectors)
+        return top_k_from_scores(scores, top_k)
+
+
+class HashingPonIndex(BasePonIndex):
+    """
+    HashingVectorizer (tanpa vocabulary/IDF) + cosine similarity.
+
+    Karena vectorizer tidak di-fit, baris okupasi bisa ditambah, diubah,
+    dan dihapus satu per satu: hanya baris yang berubah yang di-transform ulang,
+    baris lain dipakai apa adanya. Setiap perubahan menaikkan `version`
+    dan mencatat OkupasiID yang terdampak untuk invalidasi cache selektif.
+    """
+
+    metode = "hashing"
+
+    def __init__(self, df_pon):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.vectorizer = HashingVectorizer(
+            analyzer=analyze, n_features=2 ** 18,
+            alternate_sign=False, norm='l2'
+        )
+        self.generation = next(_GENERASI)
+        self.version = 0
+        self.source_signature = None
+        self._change_log = OrderedDict()
+        self._lock = threading.Lock()
+        self._set_state(df_pon, self.vectorizer.transform(build_pon_corpus(df_pon)))
+
+    @staticmethod
+    def _row_hashes(df_pon):
+        return pd.util.hash_pandas_object(df_pon.astype(str), index=False).to_numpy()
+
+    def _set_state(self, df_pon, pon_vectors):
+        import scipy.sparse as sp
+
+        # Satu assignment tuple: pembaca selalu melihat state yang konsisten
+        self._state = (
+            df_pon.reset_index(drop=True),
+            okupasi_ids_of(df_pon),
+            sp.csr_matrix(pon_vectors),
+            self._row_hashes(df_pon),
+        )
+
+    @property
+    def df_pon(self):
+        return self._state[0]
+
+    @property
+    def okupasi_ids(self):
+        return self._state[1]
+
+    @property
+    def pon_vectors(self):
+        return self._state[2]
+
+    def search_batch(self, profile_texts, top_k=1):
+        _, _, pon_vectors, _ = self._state
+        scores = (self.vectorizer.transform(profile_texts) @ pon_vectors.T).toarray()
+        return top_k_from_scores(scores, top_k)
+
+    def score_ids(self, profile_text, okupasi_ids):
+        _, ids, pon_vectors, _ = self._state
+        posisi = {okupasi_id: i for i, okupasi_id in enumerate(ids)}
+        target = [(oid, posisi[oid]) for oid in okupasi_ids if oid in posisi]
+        if not target:
+            return {}
+        query = self.vectorizer.transform([profile_text])
+        scores = (query @ pon_vectors[[p for _, p in target]].T).toarray()[0]
+        return {oid: float(s) for (oid, _), s in zip(target, scores)}
+
+    def apply_delta(self, df_baru):
+        """
+        Terapkan isi sheet PON terbaru.
+        Return: dict ringkasan (ditambah, diubah, dihapus, version)
+        """
+        with self._lock:
+            df_lama, ids_lama, vectors_lama, hash_lama = self._state
+            lama = {oid: (i, h) for i, (oid, h) in enumerate(zip(ids_lama, hash_lama))}
+
+            df_baru = df_baru.reset_index(drop=True)
+            ids_baru = okupasi_ids_of(df_baru)
+            hash_baru = self._row_hashes(df_baru)
+
+            # Sumber setiap baris baru: posisi lama (tidak berubah) atau perlu transform
+            sumber, perlu_transform = [], []
+            ditambah, diubah = [], []
+            for i, (oid, h) in enumerate(zip(ids_baru, hash_baru)):
+                if oid in lama and lama[oid][1] == h:
+                    sumber.append(lama[oid][0])
+                    continue
+                (diubah if oid in lama else ditambah).append(oid)
+                sumber.append(len(ids_lama) + len(perlu_transform))
+                perlu_transform.append(i)
+            dihapus = sorted(set(ids_lama) - set(ids_baru))
+
+            ringkasan = {
+                "ditambah": ditambah, "diubah": diubah, "dihapus": dihapus,
+                "version": self.version,
+            }
+            if not (ditambah or diubah or dihapus):
+                return ringkasan
+
+            vectors_baru = self.vectorizer.transform(
+                build_pon_corpus(df_baru.iloc[perlu_transform])
+            )
+            import scipy.sparse as sp
+
+            gabungan = sp.vstack([vectors_lama, vectors_baru], format="csr")
+            self._set_state(df_baru, gabungan[sumber])
+
+            self.version += 1
+            self._change_log[self.version] = frozenset(ditambah + diubah + dihapus)
+            while len(self._change_log) > MAX_CHANGE_LOG:
+                self._change_log.popitem(last=False)
+
+            ringkasan["version"] = self.version
+            return ringkasan
+
+    def changes_since(self, version):
+        if version == self.version:
+            return set()
+        if version + 1 not in self._change_log:
+            return None
+        berubah = set()
+        for v in range(version + 1, self.version + 1):
+            berubah |= self._change_log.get(v, frozenset())
+        return berubah
+
+
+def refresh_from_excel(index, file_path, sheet_name):
+    """
+    Cek source_signature sheet; jika berubah, baca ulang sheet PON dan terapkan delta.
+    Return: ringkasan delta, atau None jika sumber tidak berubah
+    """
+    signature = source_signature(file_path, sheet_name)
+    if index.source_signature == signature:
+        return None
+    ringkasan = index.apply_delta(read_sheet(file_path, sheet_name))
+    index.source_signature = signature
+    return ringkasan
+
+
+class MappingCache:
+    """
+    Cache hasil mapping per (metode, generasi index, teks profil, top_k),
+    dengan versi index. Kunci memakai index.generation, bukan id(index): id
+    objek index lama bisa dipakai ulang oleh index hasil bangun ulang.
+
+    Saat index naik versi, entri tidak langsung dibuang:
+    - jika salah satu okupasi hasil cache ikut berubah/dihapus -> invalid
+    - jika ada okupasi baru/berubah yang skornya melampaui hasil cache -> invalid
+    - selain itu entri tetap benar, cukup dinaikkan versinya
+    Pengecekan hanya menghitung skor terhadap baris yang berubah.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "revalidated": 0, "invalidated": 0, "miss": 0}
+
+    @staticmethod
+    def _key(index, profile_text, top_k):
+        digest = hashlib.sha1(profile_text.encode("utf-8")).hexdigest()
+        return (index.metode, index.generation, digest, top_k)
+
+    def _still_valid(self, index, profile_text, entry, top_k):
+        berubah = index.changes_since(entry["version"])
+        if berubah is None:
+            return False
+        if berubah & {oid for oid, _ in entry["hasil"]}:
+            return False
+        if not berubah:
+            return True
+        batas = entry["hasil"][-1][1] if len(entry["hasil"]) >= top_k else -np.inf
+        skor_baru = index.score_ids(profile_text, berubah)
+        return all(s <= batas for s in skor_baru.values())
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def lookup(self, index, profile_text, top_k=1):
+        """Return: list of (OkupasiID, skor), dari cache jika masih valid"""
+        key = self._key(index, profile_text, top_k)
+        version = index.version
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["version"] == version:
+                self.stats["hit"] += 1
+                self._entries.move_to_end(key)
+                return entry["hasil"]
+
+        if entry is not None:
+            if self._still_valid(index, profile_text, entry, top_k):
+                self._count("revalidated")
+                entry["version"] = version
+                return entry["hasil"]
+            self._count("invalidated")
+        else:
+            self._count("miss")
+
+        hasil = index.search_ids(profile_text, top_k)
+        with self._lock:
+            self._entries[key] = {"version": version, "hasil": hasil}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return hasil
+
+
+# Cache mapping bersama untuk seluruh proses
+MAPPING_CACHE = MappingCache()
+register_cache("pon_mapping", lambda: (
+    MAPPING_CACHE.stats["hit"] + MAPPING_CACHE.stats["revalidated"],
+    MAPPING_CACHE.stats["invalidated"] + MAPPING_CACHE.stats["miss"],
+))
+
+
+def build_pon_index(metode, df_pon, talent_corpus=None):
+    """
+    Bangun index sesuai metode.
+    talent_corpus (teks CV/profil) hanya dipakai metode "lsa" untuk memperkaya ruang semantik.
+    """
+    if metode == "tfidf":
+        return TfidfPonIndex(df_pon)
+    if metode == "hashing":
+        return HashingPonIndex(df_pon)
+    if metode == "lsa":
+        from semantic_index import LsaPonIndex
+        return LsaPonIndex.load_or_fit(df_pon, talent_corpus)
+    raise ValueError(f"Metode mapping tidak dikenal: {metode}")
+
+
+# Index per (workbook, metode) bersama untuk seluruh proses
+_INDEX_CACHE = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def load_pon_index(file_path, metode="tfidf"):
+    """
+    Index PON dari workbook / folder dataset, dibangun sekali per (file, metode)
+    per proses. Dipakai bersama semua sesi dan diisi lebih dulu oleh warmup.py.
+    Sheet PON yang berubah sejak index dibangun ikut diterapkan, lihat refresh_pon_index.
+    """
+    return refresh_pon_index(file_path, metode)[0]
+
+
+def refresh_pon_index(file_path, metode="tfidf"):
+    """
+    Seperti load_pon_index, ditambah ringkasan perubahan yang diterapkan
+    panggilan ini. Versi sheet PON = source_signature (mtime & ukuran per file):
+    index hashing menerapkan delta per baris, index lain dibangun ulang.
+    Return: (index, ringkasan delta atau None)
+    """
+    key = (os.path.abspath(file_path), metode)
+    signature = source_signature(file_path, SHEET_PON)
+    with _INDEX_LOCK:
+        entry = _INDEX_CACHE.get(key)
+        if entry is None:
+            _INDEX_CACHE[key] = (signature, _build_from_file(file_path, metode))
+            return _INDEX_CACHE[key][1], None
+        if entry[0] == signature:
+            return entry[1], None
+        index, delta = entry[1], None
+        if metode == "hashing":
+            delta = refresh_from_excel(index, file_path, SHEET_PON)
+        else:
+            index = _build_from_file(file_path, metode)
+        _INDEX_CACHE[key] = (signature, index)
+        return index, delta
+
+
+def loaded_indexes():
+    """(path, metode) index yang sudah dibangun di proses ini"""
+    with _INDEX_LOCK:
+        return list(_INDEX_CACHE)
+
+
+def _build_from_file(file_path, metode):
+    df_pon = read_sheet_cached(file_path, SHEET_PON)
+
+    # LSA memakai teks talenta untuk memperkaya ruang semantik
+    talent_corpus = None
+    if metode == "lsa":
+        df_talenta = read_sheet_cached(file_path, SHEET_TALENTA)
+        kolom_teks = [c for c in ['Profil_Singkat', 'Raw_CV_Text'] if c in df_talenta.columns]
+        if kolom_teks:
+            teks = [text_column(df_talenta, c) for c in kolom_teks]
+            talent_corpus = teks[0].str.cat(teks[1:], sep=' ').tolist()
+
+    index = build_pon_index(metode, df_pon, talent_corpus)
+    if metode == "hashing":
+        index.source_signature = source_signature(file_path, SHEET_PON)
+    return index
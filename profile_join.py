@@ -0,0 +1,183 @@
+"""
+PROFILE JOIN
+Rakit dokumen profil lengkap satu talenta: teks profil/CV dari sheet
+Talenta ditambah data terstruktur dari Riwayat_Pendidikan,
+Riwayat_Pekerjaan, dan Keterampilan_Sertifikasi.
+
+Tiap sheet anak di-index sekali: baris diurutkan menurut TalentID
+(argsort stabil) dan teks per baris disiapkan vektor. Ambil data satu
+talenta = dua np.searchsorted lalu slice, O(log n + baris talenta itu),
+tanpa scan tabel. Mode bulk (documents) menggabungkan semua baris anak
+per TalentID dalam satu pass groupby, untuk pipeline mapping massal
+(batch_remap) dan API.
+
+Halaman profil, API, dan batch_remap memakai index dari profile store
+(load_store_join), dibangun ulang hanya saat versi tabel anak store
+berubah, jadi ketiganya memetakan teks terstruktur yang sama.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from config import EXCEL_PATH, SHEET_PEKERJAAN, SHEET_PENDIDIKAN, SHEET_SKILL, SHEET_TALENTA
+from data_loader import read_sheet_cached, source_signature, text_column
+
+# Kolom teks per sheet anak, urut seperti tampil di dokumen
+KOLOM_ANAK = {
+    SHEET_PENDIDIKAN: ["Jenjang", "Jurusan", "Institusi"],
+    SHEET_PEKERJAAN: ["Posisi", "Deskripsi"],
+    SHEET_SKILL: ["Nama_Skill_Sertifikasi", "Lembaga_Penerbit"],
+}
+
+# Kolom teks talenta (Profil_Singkat dipakai bila Raw_CV_Text kosong)
+KOLOM_TALENTA = ["Raw_CV_Text", "Profil_Singkat"]
+
+
+def _row_texts(df, kolom):
+    """Teks per baris: kolom yang ada digabung spasi, NA dilewati"""
+    kolom = [c for c in kolom if c in df.columns]
+    if not kolom:
+        return pd.Series("", index=df.index, dtype="string")
+    bagian = [text_column(df, c) for c in kolom]
+    return bagian[0].str.cat(bagian[1:], sep=" ").str.strip().str.rstrip(".")
+
+
+class ChildIndex:
+    """Satu sheet anak, terurut menurut TalentID"""
+
+    def __init__(self, df, kolom):
+        if df is None or "TalentID" not in df.columns:
+            self.keys = np.array([], dtype=object)
+            self.texts = np.array([], dtype=object)
+            return
+        keys = text_column(df, "TalentID").to_numpy(dtype=object)
+        texts = _row_texts(df, kolom).to_numpy(dtype=object)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.texts = texts[order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, talent_id):
+        """Teks baris milik talent_id (urutan baris sheet dipertahankan)"""
+        lo = np.searchsorted(self.keys, talent_id, side="left")
+        hi = np.searchsorted(self.keys, talent_id, side="right")
+        return [t for t in self.texts[lo:hi] if t]
+
+    def grouped(self):
+        """Semua talenta sekaligus: Series TalentID -> teks baris digabung '. '"""
+        if not len(self.keys):
+            return pd.Series(dtype=object)
+        s = pd.Series(self.texts, dtype=object)
+        s = s[s != ""]
+        return s.groupby(self.keys[s.index.to_numpy()], sort=False).agg(". ".join)
+
+
+class ProfileJoin:
+    """Index TalentID untuk sheet Talenta & ketiga sheet anak"""
+
+    def __init__(self, df_talenta=None, df_pendidikan=None, df_pekerjaan=None, df_skill=None):
+        frames = {SHEET_PENDIDIKAN: df_pendidikan, SHEET_PEKERJAAN: df_pekerjaan, SHEET_SKILL: df_skill}
+        self.children = {sheet: ChildIndex(frames[sheet], kolom) for sheet, kolom in KOLOM_ANAK.items()}
+
+        # Teks dasar per talenta: Raw_CV_Text, atau Profil_Singkat jika kosong
+        if df_talenta is not None and "TalentID" in df_talenta.columns:
+            ids = text_column(df_talenta, "TalentID")
+            dasar = pd.Series("", index=df_talenta.index, dtype="string")
+            for col in reversed([c for c in KOLOM_TALENTA if c in df_talenta.columns]):
+                teks = text_column(df_talenta, col).str.strip()
+                dasar = teks.where(teks != "", dasar)
+            self.base = pd.Series(dasar.to_numpy(dtype=object), index=ids.to_numpy(dtype=object))
+            self.base = self.base[~self.base.index.duplicated()]
+        else:
+            self.base = pd.Series(dtype=object)
+
+    @classmethod
+    def from_store(cls, store, children_only=False):
+        """
+        Dari tabel profile store (satu kali baca per tabel). children_only: tanpa
+        tabel Talenta, untuk pemanggil yang membaca teks CV sendiri per chunk.
+        """
+        df_talenta = None if children_only else store.read_table(SHEET_TALENTA)
+        return cls(df_talenta, *(store.read_table(s) for s in KOLOM_ANAK))
+
+    def structured_text(self, talent_id):
+        """Teks data terstruktur (pendidikan, pekerjaan, skill) satu talenta"""
+        bagian = [". ".join(rows) for rows in (c.lookup(talent_id) for c in self.children.values()) if rows]
+        return ". ".join(bagian)
+
+    def document(self, talent_id, base_text=None):
+        """
+        Dokumen lengkap satu talenta: base_text (default: CV/profil tersimpan)
+        + data terstruktur. None jika talenta tidak dikenal dan tanpa base_text.
+        """
+        if base_text is None:
+            if talent_id not in self.base.index:
+                return None
+            base_text = self.base[talent_id]
+        return ". ".join(t for t in (base_text.strip(), self.structured_text(talent_id)) if t)
+
+    def structured_texts(self):
+        """Bulk: Series TalentID -> teks terstruktur, semua talenta dalam satu pass per sheet"""
+        with metrics.timer("profile_join.bulk"):
+            hasil = None
+            for child in self.children.values():
+                grup = child.grouped()
+                hasil = grup if hasil is None else _gabung(hasil, grup)
+            return hasil if hasil is not None else pd.Series(dtype=object)
+
+    def documents(self, talent_ids=None):
+        """Bulk: Series TalentID -> dokumen lengkap (default: semua talenta di sheet Talenta)"""
+        ids = self.base.index if talent_ids is None else pd.Index(talent_ids)
+        dasar = self.base.reindex(ids).fillna("")
+        struktur = self.structured_texts().reindex(ids).fillna("")
+        return _gabung(dasar, struktur)
+
+
+def _gabung(a, b):
+    """Gabung dua Series teks per TalentID dengan '. ' (vektor; teks kosong dilewati)"""
+    a, b = a.align(b, fill_value="")
+    return (a + ". " + b).where((a != "") & (b != ""), a + b)
+
+
+@lru_cache(maxsize=2)
+def _load_cached(file_path, signature):
+    frames = []
+    for sheet in (SHEET_TALENTA, SHEET_PENDIDIKAN, SHEET_PEKERJAAN, SHEET_SKILL):
+        try:
+            frames.append(read_sheet_cached(file_path, sheet))
+        except Exception:
+            frames.append(None)
+    return ProfileJoin(*frames)
+
+
+def load_profile_join(file_path=EXCEL_PATH) -> ProfileJoin:
+    """Index dibangun sekali per versi workbook / folder dataset (kunci = source_signature)"""
+    return _load_cached(file_path, source_signature(file_path))
+
+
+@lru_cache(maxsize=2)
+def _load_store_cached(store, versi):
+    return ProfileJoin.from_store(store, children_only=True)
+
+
+def load_store_join(store) -> ProfileJoin:
+    """Index tabel anak profile store, dibangun sekali per versi tabel anak (store.version)"""
+    return _load_store_cached(store, store.version(*KOLOM_ANAK))
+
+
+def store_document(store, talent_id, base_text=None):
+    """
+    document() untuk talenta di profile store. base_text default: Raw_CV_Text,
+    atau Profil_Singkat jika kosong. None jika talenta tidak ada dan tanpa base_text.
+    """
+    if base_text is None:
+        talent = store.get_talent(talent_id)
+        if talent is None:
+            return None
+        base_text = next((talent[k].strip() for k in KOLOM_TALENTA if (talent.get(k) or "").strip()), "")
+    return load_store_join(store).document(talent_id, base_text=base_text)
@@ -0,0 +1,473 @@
+"""
+PROFILE STORE
+Penyimpanan profil talenta di SQLite (mode WAL), skema sama dengan sheet
+workbook: Talenta, Riwayat_Pendidikan, Riwayat_Pekerjaan,
+Keterampilan_Sertifikasi, dan Hasil_Pemetaan_Asesmen.
+
+Workbook Excel tidak aman ditulis beberapa proses sekaligus; store ini
+bisa: WAL membuat pembaca tidak tertahan penulis, dan setiap penulisan
+adalah satu transaksi. Index pada Email, Lokasi, TalentID (tabel anak)
+dan OkupasiID_Mapped membuat pencarian tidak perlu scan seluruh tabel.
+
+Upsert dilakukan per batch (executemany dalam satu transaksi). Id baru
+(TAL-021, HASIL-007, ...) diambil dari tabel id_sequence di dalam transaksi
+penulisan, tanpa scan tabel. Import sekali jalan dari workbook (dijalankan
+warmup.py saat store masih kosong, atau manual) dan export kembali ke
+format workbook:
+
+    python profile_store.py import [--excel data/DTP_Database.xlsx]
+    python profile_store.py export data/cache/DTP_Profil.xlsx
+"""
+
+import argparse
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from config import (
+    EXCEL_PATH, PROFILE_DB_PATH, SHEET_HASIL, SHEET_PEKERJAAN, SHEET_PENDIDIKAN,
+    SHEET_SKILL, SHEET_TALENTA
+)
+
+# Jumlah baris per executemany / per chunk export
+BATCH_SIZE = 1000
+
+# Skema per sheet: (primary key, [(kolom, tipe SQLite)], prefix id baru)
+TABLES = {
+    SHEET_TALENTA: ("TalentID", [
+        ("TalentID", "TEXT"), ("Nama", "TEXT"), ("Email", "TEXT"), ("Lokasi", "TEXT"),
+        ("Profil_Singkat", "TEXT"), ("LinkedIn_URL", "TEXT"), ("Raw_CV_Text", "TEXT"),
+    ], "TAL"),
+    SHEET_PENDIDIKAN: ("PendidikanID", [
+        ("PendidikanID", "TEXT"), ("TalentID", "TEXT"), ("Institusi", "TEXT"), ("Jenjang", "TEXT"),
+        ("Jurusan", "TEXT"), ("Tahun_Lulus", "INTEGER"),
+    ], "PEND"),
+    SHEET_PEKERJAAN: ("PengalamanID", [
+        ("PengalamanID", "TEXT"), ("TalentID", "TEXT"), ("Perusahaan", "TEXT"), ("Posisi", "TEXT"),
+        ("Deskripsi", "TEXT"), ("Tanggal_Mulai", "TEXT"), ("Tanggal_Selesai", "TEXT"),
+    ], "KERJA"),
+    SHEET_SKILL: ("SkillID", [
+        ("SkillID", "TEXT"), ("TalentID", "TEXT"), ("Nama_Skill_Sertifikasi", "TEXT"), ("Tipe", "TEXT"),
+        ("Lembaga_Penerbit", "TEXT"), ("Level", "TEXT"),
+    ], "SKILL"),
+    SHEET_HASIL: ("HasilID", [
+        ("HasilID", "TEXT"), ("TalentID", "TEXT"), ("OkupasiID_Mapped", "TEXT"),
+        ("Skor_Kecocokan_Awal", "REAL"), ("Skor_Asesmen", "REAL"), ("Level_Kompetensi", "TEXT"),
+        ("Gap_Keterampilan", "TEXT"), ("Tanggal_Update", "TEXT"),
+    ], "HASIL"),
+}
+
+STORE_SHEETS = list(TABLES)
+
+INDEXES = [
+    (SHEET_TALENTA, "Email"),
+    (SHEET_TALENTA, "Lokasi"),
+    (SHEET_PENDIDIKAN, "TalentID"),
+    (SHEET_PEKERJAAN, "TalentID"),
+    (SHEET_SKILL, "TalentID"),
+    (SHEET_HASIL, "TalentID"),
+    (SHEET_HASIL, "OkupasiID_Mapped"),
+]
+
+
+def columns(sheet):
+    """Nama kolom tabel, urut sesuai sheet"""
+    return [nama for nama, _ in TABLES[sheet][1]]
+
+
+def _is_na(value):
+    """pd.NA / pd.NaT tanpa import pandas (tidak bisa dibandingkan dengan ==)"""
+    return type(value).__name__ in ("NAType", "NaTType")
+
+
+def _id_number(value, prefix):
+    """'TAL-021' -> 21 untuk prefix 'TAL'; None jika pola tidak cocok"""
+    if not isinstance(value, str) or not value.startswith(f"{prefix}-"):
+        return None
+    nomor = value[len(prefix) + 1:]
+    return int(nomor) if nomor.isdigit() else None
+
+
+def _to_sql(value):
+    """Nilai pandas / Excel -> nilai yang bisa di-bind SQLite; string kosong & NA jadi NULL"""
+    if value is None or _is_na(value) or value == "":
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat() if value.time() == datetime.time() else value.isoformat(sep=" ")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if hasattr(value, "item"):  # skalar numpy
+        value = value.item()
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    return value
+
+
+class ProfileStore:
+    """Tabel profil di satu file SQLite; satu koneksi per thread"""
+
+    def __init__(self, path=PROFILE_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        con = self._connect()
+        con.execute("PRAGMA journal_mode=WAL")
+        with con:
+            for sheet, (pk, kolom, _) in TABLES.items():
+                definisi = ", ".join(
+                    f"{nama} {tipe}" + (" PRIMARY KEY" if nama == pk else "") for nama, tipe in kolom
+                )
+                con.execute(f'CREATE TABLE IF NOT EXISTS "{sheet}" ({definisi})')
+            for sheet, kolom in INDEXES:
+                con.execute(f'CREATE INDEX IF NOT EXISTS "idx_{sheet}_{kolom}" ON "{sheet}" ({kolom})')
+            con.execute("CREATE TABLE IF NOT EXISTS store_version (sheet TEXT PRIMARY KEY, versi INTEGER NOT NULL)")
+            con.execute("CREATE TABLE IF NOT EXISTS id_sequence (sheet TEXT PRIMARY KEY, terakhir INTEGER NOT NULL)")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS mapping_meta (HasilID TEXT PRIMARY KEY, Metode TEXT, Versi_Index TEXT)"
+            )
+
+    def _connect(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            con.row_factory = sqlite3.Row
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute("PRAGMA foreign_keys=OFF")
+            self._local.con = con
+        return con
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT: penulis lain menunggu, pembaca tetap jalan (WAL)"""
+        con = self._connect()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    # ---------- tulis ----------
+    def _upsert_sql(self, sheet):
+        pk, _, _ = TABLES[sheet]
+        kolom = columns(sheet)
+        update = ", ".join(f"{k} = excluded.{k}" for k in kolom if k != pk)
+        return (
+            f'INSERT INTO "{sheet}" ({", ".join(kolom)}) VALUES ({", ".join("?" * len(kolom))}) '
+            f"ON CONFLICT({pk}) DO UPDATE SET {update}"
+        )
+
+    def upsert(self, sheet, rows, batch_size=BATCH_SIZE, con=None):
+        """
+        Insert / update baris (dict per baris; kolom yang tidak ada jadi NULL).
+        Per batch satu transaksi (atau di dalam transaksi `con` milik pemanggil).
+        Return: jumlah baris
+        """
+        sql = self._upsert_sql(sheet)
+        kolom = columns(sheet)
+        total = 0
+        batch = []
+
+        def flush():
+            if con is not None:
+                self._write_batch(con, sheet, sql, batch)
+            else:
+                with self.transaction() as tx:
+                    self._write_batch(tx, sheet, sql, batch)
+
+        for row in rows:
+            batch.append(tuple(_to_sql(row.get(k)) for k in kolom))
+            if len(batch) >= batch_size:
+                flush()
+                total += len(batch)
+                batch = []
+        if batch:
+            flush()
+            total += len(batch)
+        return total
+
+    def _write_batch(self, con, sheet, sql, batch):
+        con.executemany(sql, batch)
+        self._bump_version(con, sheet)
+        # Id eksplisit (mis. dari import) ikut memajukan sequence, supaya id baru tidak bentrok
+        pk, _, prefix = TABLES[sheet]
+        pos = columns(sheet).index(pk)
+        nomor = [_id_number(row[pos], prefix) for row in batch]
+        terbesar = max((n for n in nomor if n is not None), default=None)
+        if terbesar is not None and self._sequence(con, sheet) < terbesar:
+            con.execute("UPDATE id_sequence SET terakhir = ? WHERE sheet = ?", (terbesar, sheet))
+
+    def _bump_version(self, con, sheet):
+        """Naikkan versi tabel; dipanggil di dalam transaksi penulisan"""
+        con.execute(
+            "INSERT INTO store_version VALUES (?, 1) ON CONFLICT(sheet) DO UPDATE SET versi = versi + 1",
+            (sheet,),
+        )
+
+    def version(self, *sheets):
+        """Versi tabel (naik setiap ada penulisan), untuk kunci cache turunan store"""
+        versi = dict(self._connect().execute("SELECT sheet, versi FROM store_version").fetchall())
+        return tuple(versi.get(sheet, 0) for sheet in sheets or STORE_SHEETS)
+
+    def _sequence(self, con, sheet):
+        """
+        Nomor id terakhir sheet dari id_sequence. Store lama tanpa baris sequence
+        di-seed sekali dari nomor terbesar di tabel (satu-satunya scan).
+        """
+        row = con.execute("SELECT terakhir FROM id_sequence WHERE sheet = ?", (sheet,)).fetchone()
+        if row is not None:
+            return row[0]
+        pk, _, prefix = TABLES[sheet]
+        terbesar = con.execute(
+            f'SELECT MAX(CAST(SUBSTR({pk}, ?) AS INTEGER)) FROM "{sheet}" WHERE {pk} LIKE ?',
+            (len(prefix) + 2, f"{prefix}-%"),
+        ).fetchone()[0] or 0
+        con.execute("INSERT INTO id_sequence VALUES (?, ?)", (sheet, terbesar))
+        return terbesar
+
+    def _next_ids(self, con, sheet, n=1):
+        """n id berikutnya dengan pola sheet (mis. TAL-021); dipanggil di dalam transaksi"""
+        _, _, prefix = TABLES[sheet]
+        terakhir = self._sequence(con, sheet)
+        con.execute("UPDATE id_sequence SET terakhir = ? WHERE sheet = ?", (terakhir + n, sheet))
+        return [f"{prefix}-{terakhir + i:03d}" for i in range(1, n + 1)]
+
+    def save_mapping(self, profil, okupasi_id, skor, gap, asesmen=None, meta=None):
+        """
+        Simpan profil (dict kolom Talenta, dicari lewat Email) dan satu baris
+        Hasil_Pemetaan_Asesmen dalam satu transaksi. Kolom profil yang tidak
+        diisi mempertahankan nilai lama. `asesmen`: (skor, level) yang dipakai
+        ulang, mis. dari CV duplikat. `meta`: (metode, versi index) pemetaan,
+        lihat result_meta.
+        Return: (TalentID, HasilID)
+        """
+        skor_asesmen, level = asesmen or (None, None)
+        with self.transaction() as con:
+            lama = con.execute(
+                f'SELECT * FROM "{SHEET_TALENTA}" WHERE Email = ? ORDER BY TalentID LIMIT 1',
+                (profil["Email"],),
+            ).fetchone()
+            if lama is not None:
+                talent_id = lama["TalentID"]
+                profil = dict(lama, **{k: v for k, v in profil.items() if v not in (None, "")})
+            else:
+                talent_id, = self._next_ids(con, SHEET_TALENTA)
+            self.upsert(SHEET_TALENTA, [dict(profil, TalentID=talent_id)], con=con)
+
+            hasil_id, = self._next_ids(con, SHEET_HASIL)
+            self.upsert(SHEET_HASIL, [{
+                "HasilID": hasil_id,
+                "TalentID": talent_id,
+                "OkupasiID_Mapped": okupasi_id,
+                "Skor_Kecocokan_Awal": round(float(skor), 4),
+                "Skor_Asesmen": skor_asesmen,
+                "Level_Kompetensi": level,
+                "Gap_Keterampilan": gap,
+                "Tanggal_Update": datetime.datetime.now().isoformat(sep=" ", timespec="seconds"),
+            }], con=con)
+            if meta is not None:
+                con.execute("INSERT OR REPLACE INTO mapping_meta VALUES (?, ?, ?)", (hasil_id, *meta))
+        return talent_id, hasil_id
+
+    def append_results(self, rows):
+        """
+        Tambah baris Hasil_Pemetaan_Asesmen (dict tanpa HasilID) dalam satu
+        transaksi; HasilID diberikan berurutan. Return: jumlah baris
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self.transaction() as con:
+            ids = self._next_ids(con, SHEET_HASIL, len(rows))
+            return self.upsert(SHEET_HASIL, (
+                dict(row, HasilID=hasil_id) for hasil_id, row in zip(ids, rows)
+            ), con=con)
+
+    def record_assessment(self, hasil_id, skor, level):
+        """Isi skor & level asesmen pada baris hasil pemetaan"""
+        with self.transaction() as con:
+            con.execute(
+                f'UPDATE "{SHEET_HASIL}" SET Skor_Asesmen = ?, Level_Kompetensi = ?, Tanggal_Update = ? '
+                "WHERE HasilID = ?",
+                (skor, level, datetime.datetime.now().isoformat(sep=" ", timespec="seconds"), hasil_id),
+            )
+            self._bump_version(con, SHEET_HASIL)
+
+    # ---------- baca ----------
+    def get_talent(self, talent_id):
+        row = self._connect().execute(
+            f'SELECT * FROM "{SHEET_TALENTA}" WHERE TalentID = ?', (talent_id,)
+        ).fetchone()
+        return None if row is None else dict(row)
+
+    def find_by_email(self, email):
+        row = self._connect().execute(
+            f'SELECT * FROM "{SHEET_TALENTA}" WHERE Email = ? ORDER BY TalentID LIMIT 1', (email,)
+        ).fetchone()
+        return None if row is None else dict(row)
+
+    def latest_result(self, talent_id):
+        """Baris Hasil_Pemetaan_Asesmen terbaru milik talenta (None jika belum ada)"""
+        row = self._connect().execute(
+            f'SELECT * FROM "{SHEET_HASIL}" WHERE TalentID = ? ORDER BY rowid DESC LIMIT 1', (talent_id,)
+        ).fetchone()
+        return None if row is None else dict(row)
+
+    def result_meta(self, hasil_id):
+        """(metode, versi index) saat hasil pemetaan dibuat; None jika tidak tercatat"""
+        row = self._connect().execute(
+            "SELECT Metode, Versi_Index FROM mapping_meta WHERE HasilID = ?", (hasil_id,)
+        ).fetchone()
+        return None if row is None else tuple(row)
+
+    def talents_by_lokasi(self, lokasi):
+        return [dict(r) for r in self._connect().execute(
+            f'SELECT * FROM "{SHEET_TALENTA}" WHERE Lokasi = ? ORDER BY TalentID', (lokasi,)
+        )]
+
+    def talents_by_okupasi(self, okupasi_id):
+        """Talenta dengan hasil pemetaan ke okupasi ini (hasil terbaru per talenta)"""
+        return [dict(r) for r in self._connect().execute(
+            f'SELECT t.*, h.HasilID, h.Skor_Kecocokan_Awal, h.Skor_Asesmen, h.Level_Kompetensi '
+            f'FROM "{SHEET_HASIL}" h JOIN "{SHEET_TALENTA}" t ON t.TalentID = h.TalentID '
+            f'WHERE h.OkupasiID_Mapped = ? AND h.rowid = ('
+            f'  SELECT MAX(h2.rowid) FROM "{SHEET_HASIL}" h2 WHERE h2.TalentID = h.TalentID) '
+            f'ORDER BY t.TalentID',
+            (okupasi_id,),
+        )]
+
+    def children(self, sheet, talent_id):
+        """Baris tabel anak (pendidikan / pekerjaan / skill / hasil) milik satu talenta"""
+        pk = TABLES[sheet][0]
+        return [dict(r) for r in self._connect().execute(
+            f'SELECT * FROM "{sheet}" WHERE TalentID = ? ORDER BY {pk}', (talent_id,)
+        )]
+
+    def count(self, sheet):
+        return self._connect().execute(f'SELECT COUNT(*) FROM "{sheet}"').fetchone()[0]
+
+    def iter_rows(self, sheet, chunk_size=BATCH_SIZE):
+        """Baris tabel per chunk (list of tuple, urut kolom sheet)"""
+        cur = self._connect().execute(
+            f'SELECT {", ".join(columns(sheet))} FROM "{sheet}" ORDER BY {TABLES[sheet][0]}'
+        )
+        while chunk := cur.fetchmany(chunk_size):
+            yield [tuple(r) for r in chunk]
+
+    def iter_mapping_inputs(self, chunk_size=BATCH_SIZE):
+        """
+        Per chunk: (TalentID, Raw_CV_Text, Profil_Singkat, OkupasiID_Mapped terbaru,
+        Skor_Kecocokan_Awal terbaru). Memakai koneksi baca sendiri dalam satu
+        transaksi, jadi snapshot tetap konsisten walau hasil baru ditulis selama iterasi.
+        """
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            con.execute("BEGIN")
+            cur = con.execute(
+                f'SELECT t.TalentID, t.Raw_CV_Text, t.Profil_Singkat, h.OkupasiID_Mapped, h.Skor_Kecocokan_Awal '
+                f'FROM "{SHEET_TALENTA}" t LEFT JOIN "{SHEET_HASIL}" h ON h.rowid = ('
+                f'  SELECT MAX(h2.rowid) FROM "{SHEET_HASIL}" h2 WHERE h2.TalentID = t.TalentID) '
+                f'ORDER BY t.TalentID'
+            )
+            while chunk := cur.fetchmany(chunk_size):
+                yield chunk
+        finally:
+            con.close()
+
+    def read_table(self, sheet):
+        """Seluruh tabel sebagai DataFrame bertipe sesuai skema read_sheet (NULL jadi NA)"""
+        import pandas as pd
+
+        from data_loader import apply_schema
+
+        rows = [r for chunk in self.iter_rows(sheet) for r in chunk]
+        return apply_schema(pd.DataFrame(rows, columns=columns(sheet)), sheet)
+
+    # ---------- import / export ----------
+    def import_workbook(self, file_path=EXCEL_PATH, sheets=STORE_SHEETS, batch_size=BATCH_SIZE):
+        """Upsert semua baris sheet dari workbook / folder dataset. Return: {sheet: jumlah}"""
+        from data_loader import read_sheet
+
+        hasil = {}
+        for sheet in sheets:
+            df = read_sheet(file_path, sheet)
+            kolom = [k for k in columns(sheet) if k in df.columns]
+            rows = df[kolom].to_dict("records")
+            hasil[sheet] = self.upsert(sheet, (r for r in rows if r.get(TABLES[sheet][0])), batch_size)
+        return hasil
+
+    def import_if_empty(self, file_path=EXCEL_PATH):
+        """
+        Import awal: isi store dari workbook / folder dataset jika tabel Talenta
+        masih kosong. Dipanggil warmup.py sebelum server menerima request.
+        Return: {sheet: jumlah} atau None jika store sudah berisi / sumber tidak ada
+        """
+        if self.count(SHEET_TALENTA) > 0 or not os.path.exists(file_path):
+            return None
+        return self.import_workbook(file_path)
+
+    def export_workbook(self, dest, sheets=STORE_SHEETS, chunk_size=BATCH_SIZE):
+        """
+        Tulis tabel ke workbook dengan tata letak yang sama seperti data/DTP_Database.xlsx
+        (baris 1 kosong, header di baris 2), jadi bisa dibaca lagi oleh read_sheet.
+        """
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        for sheet in sheets:
+            ws = wb.create_sheet(sheet[:31])
+            ws.append([])
+            ws.append(columns(sheet))
+            for chunk in self.iter_rows(sheet, chunk_size):
+                for row in chunk:
+                    ws.append(row)
+        wb.save(dest)
+        return dest
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store():
+    """
+    Store bersama satu proses (dibuat saat pertama dipakai). Import awal dari
+    workbook tidak dilakukan di sini (request pertama tidak tertahan), tapi
+    oleh warmup.py atau `python profile_store.py import`.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProfileStore()
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import / export profile store <-> workbook DTP")
+    parser.add_argument("--db", default=PROFILE_DB_PATH, help="file SQLite profile store")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    p_import = sub.add_parser("import", help="upsert sheet workbook ke store")
+    p_import.add_argument("--excel", default=EXCEL_PATH, help="workbook / folder dataset sumber")
+    p_export = sub.add_parser("export", help="tulis store ke workbook .xlsx")
+    p_export.add_argument("dest", help="path workbook tujuan")
+    args = parser.parse_args()
+
+    store = ProfileStore(args.db)
+    t0 = time.perf_counter()
+    if args.perintah == "import":
+        for sheet, n in store.import_workbook(args.excel).items():
+            print(f"{sheet:<28} {n:>10,} baris")
+    else:
+        store.export_workbook(args.dest)
+        for sheet in STORE_SHEETS:
+            print(f"{sheet:<28} {store.count(sheet):>10,} baris")
+    print(f"Selesai dalam {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+SOAL LOKAL (TEMPLATE)
+Generator soal pilihan ganda tanpa AI, dari Unit_Kompetensi & Kuk_Keywords
+sheet PON. Dipakai sebagai cadangan saat Gemini lambat / gagal
+(assessment.remote_or_local), dan untuk melengkapi soal AI yang kurang.
+
+Setiap template menghasilkan satu jawaban benar milik okupasi itu (soal per
+unit kompetensi: Kuk_Keywords yang berbagi kata dasar dengan unit itu); pengecoh
+diambil dari istilah okupasi lain, diutamakan dari area fungsi berbeda, dan
+tidak pernah sama (setelah normalize_skill) dengan istilah okupasi sendiri,
+jadi tiap soal tetap punya tepat satu jawaban benar.
+
+Teks soal hanya bergantung pada okupasi + istilah yang ditanyakan, sehingga
+item_id di bank soal (item_bank.item_id_for) stabil antar pemanggilan.
+"""
+
+import random
+import re
+from functools import lru_cache
+
+from config import EXCEL_PATH, JUMLAH_SOAL, SHEET_PON
+from data_loader import read_sheet_cached, source_signature, text_of
+from skill_extractor import normalize_skill
+from text_analyzer import analyze
+
+SUMBER_LOKAL = "lokal"
+
+_PEMISAH_RE = re.compile(r"[,;\n]")
+
+
+def split_terms(text) -> list:
+    """'HTML, CSS, Javascript' -> ['HTML', 'CSS', 'Javascript'] (kosong/duplikat dibuang)"""
+    hasil, kunci = [], set()
+    for bagian in _PEMISAH_RE.split(text_of(text)):
+        bagian = bagian.strip(" .-")
+        if bagian and normalize_skill(bagian) not in kunci:
+            kunci.add(normalize_skill(bagian))
+            hasil.append(bagian)
+    return hasil
+
+
+def _kata_cocok(a, b):
+    """Kata dasar sama, atau salah satu awalan kata lain ('test' ~ 'testing')"""
+    return a == b or (min(len(a), len(b)) >= 4 and (a.startswith(b) or b.startswith(a)))
+
+
+def keywords_for_unit(unit, keywords):
+    """Kuk_Keywords yang berbagi kata (setelah analyze) dengan nama unit kompetensi"""
+    kata_unit = set(analyze(unit))
+    return [kw for kw in keywords if any(_kata_cocok(a, b) for a in analyze(kw) for b in kata_unit)]
+
+
+class _Okupasi:
+    __slots__ = ("okupasi_id", "nama", "area", "units", "keywords", "kunci", "kuk_unit")
+
+    def __init__(self, row):
+        self.okupasi_id = text_of(row["OkupasiID"])
+        self.nama = text_of(row["Okupasi"]) or self.okupasi_id
+        self.area = text_of(row.get("Area_Fungsi"))
+        self.units = split_terms(row.get("Unit_Kompetensi"))
+        self.keywords = split_terms(row.get("Kuk_Keywords"))
+        self.kunci = {normalize_skill(t) for t in self.units + self.keywords}
+        # PON tidak memetakan KUK ke unit: dihubungkan lewat kata yang sama
+        self.kuk_unit = {unit: keywords_for_unit(unit, self.keywords) for unit in self.units}
+
+
+# Template: (kode, fungsi pembuat soal). Fungsi menerima (generator, okupasi, rng)
+# dan menghasilkan (teks, jawaban_benar, pengecoh) untuk setiap istilah yang bisa ditanyakan.
+def _t_unit(gen, ok, rng):
+    # Teks sama untuk semua unit, jadi cukup satu soal per okupasi
+    if ok.units:
+        yield (
+            f"Unit kompetensi mana yang termasuk standar okupasi {ok.nama}?",
+            rng.choice(ok.units), gen.pengecoh(ok, "units", rng),
+        )
+
+
+def _t_kuk(gen, ok, rng):
+    # Jawaban benar harus milik unit yang disebut di soal; unit tanpa KUK terkait dilewati
+    for unit in ok.units:
+        if ok.kuk_unit[unit]:
+            yield (
+                f"Dalam unit kompetensi \"{unit}\", keterampilan kerja mana yang diharapkan dari seorang {ok.nama}?",
+                rng.choice(ok.kuk_unit[unit]), gen.pengecoh(ok, "keywords", rng),
+            )
+
+
+def _t_bukan(gen, ok, rng):
+    if len(ok.keywords) < 3:
+        return
+    asing = gen.pengecoh(ok, "keywords", rng, jumlah=len(ok.units) or 1)
+    for i, unit in enumerate(ok.units):
+        if i >= len(asing):
+            break
+        yield (
+            f"Seorang {ok.nama} sedang menerapkan \"{unit}\". Manakah yang BUKAN bagian dari keterampilan kerjanya?",
+            asing[i], rng.sample(ok.keywords, 3),
+        )
+
+
+def _t_area(gen, ok, rng):
+    if not ok.area:
+        return
+    for kw in ok.keywords:
+        yield (
+            f"Keterampilan \"{kw}\" pada okupasi {ok.nama} paling erat dengan area fungsi apa?",
+            ok.area, gen.pengecoh_area(ok, rng),
+        )
+
+
+def _t_okupasi(gen, ok, rng):
+    for kw in ok.keywords:
+        yield (
+            f"Okupasi mana yang standar kompetensinya mencakup keterampilan \"{kw}\"?",
+            ok.nama, gen.pengecoh_okupasi(ok, kw, rng),
+        )
+
+
+TEMPLATES = (("unit", _t_unit), ("kuk", _t_kuk), ("bukan", _t_bukan), ("area", _t_area), ("okupasi", _t_okupasi))
+
+
+class LocalQuestionGenerator:
+    """Istilah semua okupasi PON, di-index sekali per versi workbook"""
+
+    def __init__(self, df_pon):
+        self.okupasi = {}
+        for _, row in df_pon.iterrows():
+            ok = _Okupasi(row)
+            if ok.okupasi_id:
+                self.okupasi[ok.okupasi_id] = ok
+
+    def __contains__(self, okupasi_id):
+        return okupasi_id in self.okupasi
+
+    def pengecoh(self, ok, atribut, rng, jumlah=3):
+        """Istilah okupasi lain yang bukan istilah ok; area fungsi lain diutamakan"""
+        jauh, dekat, kunci = [], [], set(ok.kunci)
+        for lain in self.okupasi.values():
+            if lain is ok:
+                continue
+            for term in getattr(lain, atribut):
+                k = normalize_skill(term)
+                if k in kunci:
+                    continue
+                kunci.add(k)
+                (dekat if lain.area == ok.area else jauh).append(term)
+        rng.shuffle(jauh)
+        rng.shuffle(dekat)
+        return (jauh + dekat)[:jumlah]
+
+    def pengecoh_area(self, ok, rng, jumlah=3):
+        area = sorted({lain.area for lain in self.okupasi.values() if lain.area and lain.area != ok.area})
+        return rng.sample(area, min(jumlah, len(area)))
+
+    def pengecoh_okupasi(self, ok, kw, rng, jumlah=3):
+        """Okupasi lain yang tidak mencakup kw (area fungsi lain diutamakan)"""
+        k = normalize_skill(kw)
+        lain = [o for o in self.okupasi.values() if o is not ok and k not in o.kunci and o.nama != ok.nama]
+        rng.shuffle(lain)
+        lain.sort(key=lambda o: o.area == ok.area)
+        return [o.nama for o in lain[:jumlah]]
+
+    def candidates(self, okupasi_id, rng=None):
+        """Semua soal valid (4 opsi berbeda, 1 benar) yang bisa dibuat untuk okupasi, per template"""
+        rng = rng or random
+        ok = self.okupasi.get(okupasi_id)
+        if ok is None:
+            return {}
+        hasil = {}
+        for kode, buat in TEMPLATES:
+            soal = []
+            for teks, benar, pengecoh in buat(self, ok, rng):
+                opsi = [benar, *pengecoh]
+                if benar is None or len(opsi) != 4 or len({normalize_skill(o) for o in opsi}) != 4:
+                    continue
+                rng.shuffle(opsi)
+                soal.append({"teks": teks, "opsi": opsi, "jawaban_benar": benar, "sumber": SUMBER_LOKAL})
+            if soal:
+                hasil[kode] = soal
+        return hasil
+
+    def questions(self, okupasi_id, jumlah=JUMLAH_SOAL, rng=None) -> list:
+        """
+        `jumlah` soal bergilir antar template (variasi maksimal), format sama
+        dengan normalize_questions. Bisa kurang dari jumlah jika istilah PON
+        okupasi terlalu sedikit; list kosong jika okupasi tidak dikenal.
+        """
+        rng = rng or random
+        per_template = self.candidates(okupasi_id, rng)
+        for soal in per_template.values():
+            rng.shuffle(soal)
+        antrian = [per_template[k] for k, _ in TEMPLATES if k in per_template]
+        hasil = []
+        while antrian and len(hasil) < jumlah:
+            for soal in list(antrian):
+                if len(hasil) >= jumlah:
+                    break
+                hasil.append(soal.pop())
+                if not soal:
+                    antrian.remove(soal)
+        for i, q in enumerate(hasil):
+            q["id"] = f"q{i+1}"
+            q["tipe"] = "pilihan_ganda"
+        return hasil
+
+
+@lru_cache(maxsize=2)
+def _load_cached(file_path, signature):
+    return LocalQuestionGenerator(read_sheet_cached(file_path, SHEET_PON))
+
+
+def load_local_generator(file_path=EXCEL_PATH) -> LocalQuestionGenerator:
+    """Generator dibangun sekali per versi sheet PON (kunci = source_signature)"""
+    return _load_cached(file_path, source_signature(file_path, SHEET_PON))
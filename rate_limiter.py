@@ -0,0 +1,303 @@
+"""
+RATE LIMITER GEMINI
+Token bucket + batas request paralel + antrian prioritas untuk semua
+panggilan Gemini di satu proses.
+
+- Token bucket: `rate` request/detik dengan burst `capacity`. Default per
+  proses; dengan GEMINI_LIMITER_DB, bucket disimpan di SQLite sehingga
+  beberapa proses/replica di mesin yang sama berbagi kuota.
+- Semaphore: paling banyak `max_concurrent` request berjalan bersamaan
+  (per proses).
+- Antrian prioritas: chat (0) didahulukan dari soal asesmen (1) dan
+  pengisian bank soal di background (2); FIFO dalam prioritas yang sama.
+- Pemanggil menerima sinyal posisi antrian & estimasi tunggu lewat
+  `on_wait(posisi, eta_detik)`. Jika estimasi melewati `max_wait`,
+  RateLimitExceeded dilempar segera, jadi UI bisa menampilkan pesan
+  alih-alih menggantung sampai timeout.
+- Respons 429 dari API: pause(retry_after) mengosongkan bucket sementara.
+- `cancel` (threading.Event): pemanggil bisa menarik tiket dari antrian,
+  mis. hedged request yang kalah (gemini_client).
+"""
+
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+from deadline import RequestCancelled
+
+PRIORITY_CHAT = 0
+PRIORITY_ASSESSMENT = 1
+PRIORITY_BACKGROUND = 2
+
+# Estimasi awal durasi satu panggilan Gemini (detik), diperbarui EWMA
+DEFAULT_LATENCY = 5.0
+EWMA_ALPHA = 0.2
+
+# Interval maksimum cek ulang antrian saat menunggu (detik)
+POLL_INTERVAL = 0.5
+
+
+class RateLimitExceeded(Exception):
+    """Antrian terlalu panjang / kuota habis; `eta` = estimasi detik sampai giliran"""
+
+    def __init__(self, message, position=0, eta=0.0):
+        super().__init__(message)
+        self.position = position
+        self.eta = eta
+
+
+class TokenBucket:
+    """Token bucket di memori proses (dipanggil di bawah lock limiter)"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self):
+        """Ambil satu token. Return: 0 jika berhasil, selain itu detik sampai token tersedia"""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds):
+        """Kosongkan bucket dan tahan token selama `seconds` (mis. setelah 429)"""
+        now = time.monotonic()
+        self._tokens = 0.0
+        self._updated = now
+        self._paused_until = max(self._paused_until, now + seconds)
+
+
+class SqliteTokenBucket:
+    """
+    Token bucket bersama lintas proses. State (token, waktu update, pause)
+    disimpan di satu baris SQLite; setiap ambil token = satu transaksi
+    BEGIN IMMEDIATE, jadi proses lain menunggu lock file, bukan balapan.
+    """
+
+    def __init__(self, path, rate, capacity, name="gemini"):
+        self.path = path
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.name = name
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        con = self._connect()
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS token_bucket ("
+            "name TEXT PRIMARY KEY, tokens REAL, updated REAL, paused_until REAL)"
+        )
+        con.execute(
+            "INSERT OR IGNORE INTO token_bucket VALUES (?, ?, ?, 0)",
+            (name, self.capacity, time.time()),
+        )
+
+    def _connect(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self._local.con = con
+        return con
+
+    @contextmanager
+    def _transaction(self):
+        con = self._connect()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, updated, paused_until = con.execute(
+                "SELECT tokens, updated, paused_until FROM token_bucket WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = time.time()
+            state = {
+                "tokens": min(self.capacity, tokens + max(0.0, now - updated) * self.rate),
+                "paused_until": paused_until,
+                "now": now,
+            }
+            yield state
+            con.execute(
+                "UPDATE token_bucket SET tokens = ?, updated = ?, paused_until = ? WHERE name = ?",
+                (state["tokens"], now, state["paused_until"], self.name),
+            )
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def try_take(self):
+        with self._transaction() as state:
+            if state["now"] < state["paused_until"]:
+                return state["paused_until"] - state["now"]
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0.0
+            return (1 - state["tokens"]) / self.rate
+
+    def pause(self, seconds):
+        with self._transaction() as state:
+            state["tokens"] = 0.0
+            state["paused_until"] = max(state["paused_until"], state["now"] + seconds)
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "cancelled")
+
+    def __init__(self, priority, seq):
+        self.priority = priority
+        self.seq = seq
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateLimiter:
+    """Gabungan token bucket, semaphore, dan antrian prioritas"""
+
+    def __init__(self, bucket, max_concurrent):
+        self.bucket = bucket
+        self.max_concurrent = max_concurrent
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._avg_latency = DEFAULT_LATENCY
+
+    # ---------- antrian ----------
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+
+    def _position(self, ticket):
+        return sum(1 for t in self._heap if not t.cancelled and t < ticket)
+
+    def _eta(self, position, token_wait=0.0):
+        antre_token = position / self.bucket.rate + (token_wait or 0.0)
+        bebas = self.max_concurrent - self._active
+        antre_slot = 0.0 if position < bebas else (position - bebas + 1) / self.max_concurrent * self._avg_latency
+        return max(antre_token, antre_slot)
+
+    def estimate_wait(self, priority=PRIORITY_CHAT):
+        """Estimasi tunggu (detik) untuk request baru dengan prioritas ini, tanpa mengantre"""
+        with self._cond:
+            position = sum(1 for t in self._heap if not t.cancelled and t.priority <= priority)
+            return self._eta(position)
+
+    def status(self):
+        with self._cond:
+            return {
+                "antrian": sum(1 for t in self._heap if not t.cancelled),
+                "aktif": self._active,
+                "maks_paralel": self.max_concurrent,
+                "rata_latensi_s": round(self._avg_latency, 3),
+                "estimasi_tunggu_s": round(self._eta(sum(1 for t in self._heap if not t.cancelled)), 2),
+            }
+
+    # ---------- acquire / release ----------
+    def _acquire(self, priority, max_wait, on_wait, cancel=None):
+        t0 = time.monotonic()
+        deadline = None if max_wait is None else t0 + max_wait
+        with self._cond:
+            ticket = _Ticket(priority, next(self._seq))
+            heapq.heappush(self._heap, ticket)
+
+        try:
+            self._wait_turn(ticket, t0, deadline, on_wait, cancel)
+        except BaseException:
+            # Timeout, atau callback/script dihentikan (mis. rerun Streamlit): keluar dari antrian
+            with self._cond:
+                ticket.cancelled = True
+                self._cond.notify_all()
+            raise
+
+    def _wait_turn(self, ticket, t0, deadline, on_wait, cancel=None):
+        sinyal_terakhir = None
+        while True:
+            sinyal = None
+            if cancel is not None and cancel.is_set():
+                raise RequestCancelled("Dibatalkan saat menunggu antrian")
+            with self._cond:
+                self._drop_cancelled()
+                position = self._position(ticket)
+                token_wait = 0.0
+                if position == 0 and self._active < self.max_concurrent:
+                    token_wait = self.bucket.try_take()
+                    if token_wait <= 0:
+                        heapq.heappop(self._heap)
+                        self._active += 1
+                        self._cond.notify_all()
+                        metrics.observe("gemini_queue_wait", time.monotonic() - t0)
+                        return
+                eta = self._eta(position, token_wait)
+                now = time.monotonic()
+
+                if deadline is not None and (now >= deadline or now + eta > deadline):
+                    metrics.incr("gemini_rate_limited")
+                    raise RateLimitExceeded(
+                        f"Antrian Gemini penuh (posisi {position + 1}, estimasi {eta:.0f} detik)",
+                        position=position, eta=eta,
+                    )
+
+                if on_wait is not None and (position, round(eta)) != sinyal_terakhir:
+                    sinyal = sinyal_terakhir = (position, round(eta))
+                else:
+                    tunggu = POLL_INTERVAL if token_wait <= 0 else min(token_wait, POLL_INTERVAL)
+                    self._cond.wait(timeout=tunggu)
+
+            # Callback di luar lock (boleh menulis ke UI)
+            if sinyal is not None:
+                on_wait(position, eta)
+
+    def _release(self, durasi):
+        with self._cond:
+            self._active -= 1
+            if durasi is not None:
+                self._avg_latency += EWMA_ALPHA * (durasi - self._avg_latency)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority=PRIORITY_CHAT, max_wait=None, on_wait=None, cancel=None):
+        """
+        Tunggu giliran lalu jalankan blok sebagai satu request.
+        Raise RateLimitExceeded jika giliran diperkirakan lebih lama dari max_wait,
+        RequestCancelled jika `cancel` di-set selagi menunggu.
+        """
+        self._acquire(priority, max_wait, on_wait, cancel)
+        t0 = time.monotonic()
+        durasi = None
+        try:
+            yield
+            durasi = time.monotonic() - t0
+        finally:
+            self._release(durasi)
+
+    def pause(self, seconds):
+        """Tahan semua request baru (dipanggil saat API membalas 429)"""
+        with self._cond:
+            self.bucket.pause(seconds)
+            self._cond.notify_all()
+
+
+def build_limiter(rate_per_minute, burst, max_concurrent, db_path=""):
+    """Limiter dengan bucket SQLite jika db_path diisi, selain itu bucket di memori"""
+    rate = rate_per_minute / 60.0
+    if db_path:
+        bucket = SqliteTokenBucket(db_path, rate, burst)
+    else:
+        bucket = TokenBucket(rate, burst)
+    return RateLimiter(bucket, max_concurrent)
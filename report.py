@@ -0,0 +1,233 @@
+"""
+GENERATOR LAPORAN DASHBOARD
+Render agregat dashboard (distribusi okupasi, skill gap, sebaran lokasi,
+metrik asesmen) menjadi laporan HTML mandiri, grafik berupa SVG inline.
+
+Cache:
+- Setiap snapshot agregat punya `version` (hash isi + periode)
+- Grafik SVG di-cache di memori per (version, nama grafik)
+- Laporan HTML di-cache di memori dan di disk (CACHE_DIR/reports/<version>.html)
+Permintaan ulang untuk snapshot yang sama langsung dilayani dari cache.
+"""
+
+import datetime
+import hashlib
+import html
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+
+from config import CACHE_DIR
+
+REPORT_DIR = os.path.join(CACHE_DIR, "reports")
+
+# Batas jumlah entri cache di memori
+MAX_CACHE_ENTRIES = 32
+
+_chart_cache = OrderedDict()
+_report_cache = OrderedDict()
+_cache_lock = Lock()
+
+
+def _cache_get(cache, key):
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    return None
+
+
+def _cache_put(cache, key, value):
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > MAX_CACHE_ENTRIES:
+            cache.popitem(last=False)
+
+
+# ========================================
+# SNAPSHOT AGREGAT
+# ========================================
+def build_snapshot(dist_okupasi, sebaran_lokasi, skill_gap, metrics, periode=None):
+    """
+    Bekukan agregat dashboard menjadi dict JSON-able + version.
+
+    Args:
+        dist_okupasi: DataFrame index Okupasi, satu kolom jumlah
+        sebaran_lokasi: DataFrame dengan kolom Lokasi & Jumlah
+        skill_gap: DataFrame index Keterampilan, satu kolom jumlah
+        metrics: dict nama metrik -> nilai (string/angka)
+        periode: label periode laporan (default: bulan berjalan, YYYY-MM)
+    """
+    periode = periode or datetime.date.today().strftime("%Y-%m")
+
+    snapshot = {
+        "periode": periode,
+        "distribusi_okupasi": [
+            [str(k), int(v)] for k, v in dist_okupasi.iloc[:, 0].items()
+        ],
+        "sebaran_lokasi": [
+            [str(r["Lokasi"]), int(r["Jumlah"])]
+            for _, r in sebaran_lokasi.sort_values("Jumlah", ascending=False).iterrows()
+        ],
+        "skill_gap": [
+            [str(k), int(v)] for k, v in skill_gap.iloc[:, 0].items()
+        ],
+        "metrics": {str(k): str(v) for k, v in metrics.items()},
+    }
+
+    isi = json.dumps(snapshot, sort_keys=True, ensure_ascii=False)
+    snapshot["version"] = hashlib.sha1(isi.encode("utf-8")).hexdigest()[:16]
+    return snapshot
+
+
+# ========================================
+# GRAFIK SVG
+# ========================================
+def _bar_chart_svg(items, warna):
+    """Bar chart horizontal sederhana dalam SVG"""
+    if not items:
+        return "<p><em>Belum ada data</em></p>"
+
+    lebar_label, lebar_bar, tinggi_bar, jarak = 220, 420, 22, 8
+    nilai_max = max(v for _, v in items) or 1
+    tinggi = len(items) * (tinggi_bar + jarak) + jarak
+
+    bars = []
+    for i, (label, nilai) in enumerate(items):
+        y = jarak + i * (tinggi_bar + jarak)
+        w = max(1, int(lebar_bar * nilai / nilai_max))
+        bars.append(
+            f'<text x="{lebar_label - 8}" y="{y + 15}" text-anchor="end">{html.escape(label)}</text>'
+            f'<rect x="{lebar_label}" y="{y}" width="{w}" height="{tinggi_bar}" fill="{warna}" rx="3"/>'
+            f'<text x="{lebar_label + w + 6}" y="{y + 15}">{nilai}</text>'
+        )
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{lebar_label + lebar_bar + 60}" '
+        f'height="{tinggi}" font-family="sans-serif" font-size="12">{"".join(bars)}</svg>'
+    )
+
+
+def render_chart(snapshot, nama, warna="#1E88E5", top_n=15):
+    """Grafik untuk satu bagian snapshot, di-cache per (version, nama)"""
+    key = (snapshot["version"], nama, top_n)
+    svg = _cache_get(_chart_cache, key)
+    if svg is None:
+        svg = _bar_chart_svg(snapshot[nama][:top_n], warna)
+        _cache_put(_chart_cache, key, svg)
+    return svg
+
+
+# ========================================
+# LAPORAN HTML
+# ========================================
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>Laporan Talenta Digital Nasional - {periode}</title>
+<style>
+  body {{ font-family: sans-serif; color: #333; max-width: 900px; margin: 2em auto; }}
+  h1 {{ color: #1E88E5; }}
+  h2 {{ border-bottom: 2px solid #f0f2f6; padding-bottom: .3em; margin-top: 1.5em; }}
+  table {{ border-collapse: collapse; }}
+  td, th {{ padding: .3em 1em; border-bottom: 1px solid #eee; text-align: left; }}
+  .meta {{ color: #666; font-size: .9em; }}
+  @media print {{ body {{ margin: 0; }} h2 {{ page-break-after: avoid; }} }}
+</style>
+</head>
+<body>
+<h1>📊 Laporan Talenta Digital Nasional</h1>
+<p class="meta">Periode: <b>{periode}</b> &middot; Dibuat: {dibuat} &middot; Snapshot: <code>{version}</code></p>
+
+<h2>📈 Metrik Asesmen</h2>
+<table>{metrics}</table>
+
+<h2>📊 Distribusi Okupasi Talenta</h2>
+{chart_okupasi}
+
+<h2>📉 Skill Gap Nasional</h2>
+{chart_gap}
+
+<h2>🗺️ Sebaran Lokasi Talenta</h2>
+{chart_lokasi}
+</body>
+</html>
+"""
+
+
+def _report_path(version):
+    return os.path.join(REPORT_DIR, f"{version}.html")
+
+
+def render_report_html(snapshot) -> bytes:
+    """
+    Render laporan HTML untuk snapshot.
+    Urutan cache: memori -> disk -> render ulang.
+    """
+    version = snapshot["version"]
+
+    cached = _cache_get(_report_cache, version)
+    if cached is not None:
+        return cached
+
+    path = _report_path(version)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            cached = f.read()
+        _cache_put(_report_cache, version, cached)
+        return cached
+
+    metrics_rows = "".join(
+        f"<tr><th>{html.escape(k)}</th><td>{html.escape(v)}</td></tr>"
+        for k, v in snapshot["metrics"].items()
+    )
+    laporan = _TEMPLATE.format(
+        periode=html.escape(snapshot["periode"]),
+        dibuat=datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+        version=version,
+        metrics=metrics_rows,
+        chart_okupasi=render_chart(snapshot, "distribusi_okupasi", "#1E88E5"),
+        chart_gap=render_chart(snapshot, "skill_gap", "#f5576c"),
+        chart_lokasi=render_chart(snapshot, "sebaran_lokasi", "#667eea"),
+    ).encode("utf-8")
+
+    # Tulis atomik agar proses lain tidak membaca file setengah jadi
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(laporan)
+    os.replace(tmp_path, path)
+
+    _cache_put(_report_cache, version, laporan)
+    return laporan
+
+
+def pdf_available() -> bool:
+    """PDF hanya tersedia jika paket opsional weasyprint terpasang"""
+    try:
+        import weasyprint  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def render_report_pdf(snapshot) -> bytes:
+    """Render laporan PDF dari HTML yang sama, di-cache di disk per version"""
+    import weasyprint
+
+    path = os.path.join(REPORT_DIR, f"{snapshot['version']}.pdf")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    pdf = weasyprint.HTML(string=render_report_html(snapshot).decode("utf-8")).write_pdf()
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp_path, path)
+    return pdf
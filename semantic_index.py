@@ -0,0 +1,112 @@
+"""
+INDEX SEMANTIK PADAT (LSA, CPU-ONLY)
+TF-IDF kata + bigram -> TruncatedSVD -> vektor padat ternormalisasi.
+
+SVD di-fit pada korpus PON + teks talenta, jadi kata yang sering muncul
+bersama (mis. "analisis data" & "data analyst", istilah Indonesia & Inggris)
+berdekatan di ruang laten walau tidak sama persis.
+
+Nearest-neighbour: dot product vektor ternormalisasi (= cosine), top-k via argpartition.
+Model & vektor dipersist di CACHE_DIR/semantic/, kunci = hash korpus + parameter.
+"""
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from config import CACHE_DIR
+from pon_index import BasePonIndex, build_pon_corpus, top_k_from_scores
+from text_analyzer import analyze_bigrams
+
+SEMANTIC_DIR = os.path.join(CACHE_DIR, "semantic")
+
+# Dimensi ruang laten (dibatasi ukuran korpus)
+N_COMPONENTS = 128
+
+RANDOM_STATE = 42
+
+# Naikkan bila aturan text_analyzer berubah, supaya model tersimpan di-fit ulang
+ANALYZER_VERSION = 3
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class LsaPonIndex(BasePonIndex):
+    """Index okupasi PON dalam ruang LSA"""
+
+    metode = "lsa"
+
+    def __init__(self, df_pon, vectorizer, svd, pon_vectors):
+        super().__init__(df_pon)
+        self.vectorizer = vectorizer
+        self.svd = svd
+        self.pon_vectors = pon_vectors
+
+    @staticmethod
+    def corpus_key(pon_corpus, talent_corpus):
+        h = hashlib.sha1()
+        h.update(f"lsa|{N_COMPONENTS}|{RANDOM_STATE}|{ANALYZER_VERSION}".encode())
+        for doc in list(pon_corpus) + ["\x00"] + list(talent_corpus):
+            h.update(str(doc).encode("utf-8"))
+            h.update(b"\x1f")
+        return h.hexdigest()[:16]
+
+    @classmethod
+    def fit(cls, df_pon, talent_corpus=None):
+        """Fit TF-IDF + SVD pada korpus PON + talenta"""
+        pon_corpus = list(build_pon_corpus(df_pon))
+        corpus = pon_corpus + [t for t in (talent_corpus or []) if str(t).strip()]
+
+        vectorizer = TfidfVectorizer(analyzer=analyze_bigrams, sublinear_tf=True, min_df=1)
+        tfidf = vectorizer.fit_transform(corpus)
+
+        n_components = max(1, min(N_COMPONENTS, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=RANDOM_STATE)
+        svd.fit(tfidf)
+
+        pon_vectors = _normalize_rows(svd.transform(tfidf[:len(pon_corpus)]))
+        return cls(df_pon, vectorizer, svd, pon_vectors)
+
+    @classmethod
+    def load_or_fit(cls, df_pon, talent_corpus=None):
+        """Pakai model tersimpan jika korpus tidak berubah, selain itu fit & simpan"""
+        talent_corpus = [t for t in (talent_corpus or []) if str(t).strip()]
+        key = cls.corpus_key(build_pon_corpus(df_pon), talent_corpus)
+        path = os.path.join(SEMANTIC_DIR, f"lsa_{key}.pkl")
+
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    state = pickle.load(f)
+                return cls(df_pon, state["vectorizer"], state["svd"], state["pon_vectors"])
+            except Exception:
+                pass  # file rusak / versi sklearn beda: fit ulang
+
+        index = cls.fit(df_pon, talent_corpus)
+
+        os.makedirs(SEMANTIC_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "vectorizer": index.vectorizer,
+                "svd": index.svd,
+                "pon_vectors": index.pon_vectors,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return index
+
+    def embed(self, texts):
+        """Teks -> vektor padat ternormalisasi"""
+        return _normalize_rows(self.svd.transform(self.vectorizer.transform(texts)))
+
+    def search_batch(self, profile_texts, top_k=1):
+        scores = self.embed(profile_texts) @ self.pon_vectors.T
+        return top_k_from_scores(scores, top_k)
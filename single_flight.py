@@ -0,0 +1,102 @@
+"""
+SINGLE-FLIGHT
+Gabungkan panggilan identik yang sedang berjalan menjadi satu.
+
+Saat satu angkatan peserta mulai asesmen bersamaan, puluhan sesi dengan
+okupasi yang sama mengirim prompt soal yang persis sama dalam hitungan
+detik. Dengan SingleFlight, pemanggil pertama untuk sebuah kunci
+menjalankan fungsi (leader); pemanggil lain dengan kunci yang sama
+menunggu dan menerima hasil/exception yang sama. Setelah selesai kunci
+dilepas, jadi panggilan berikutnya kembali ke upstream (bukan cache).
+
+Pemanggil yang menumpang menunggu paling lama sisa `deadline` miliknya
+sendiri; jika leader macet, DeadlineExceeded di-raise tanpa ikut menunggu.
+
+Hasil dibagi apa adanya ke semua pemanggil: kembalikan objek immutable
+(mis. string respons mentah) dan lakukan pengolahan per pemanggil
+(parsing, acak urutan soal) setelahnya.
+"""
+
+import hashlib
+import re
+import threading
+
+import metrics
+from deadline import DeadlineExceeded, remaining
+
+_SPASI_RE = re.compile(r"\s+")
+
+
+def prompt_key(prompt: str) -> str:
+    """Kunci stabil untuk prompt: whitespace dirapikan lalu di-hash"""
+    normal = _SPASI_RE.sub(" ", prompt).strip()
+    return hashlib.sha1(normal.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Tabel panggilan yang sedang berjalan, per kunci"""
+
+    def __init__(self, name="singleflight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, deadline=None, **kwargs):
+        """
+        Jalankan fn(*args, **kwargs) sekali untuk semua pemanggil serentak dengan `key`.
+        `deadline` (opsional) membatasi waktu tunggu pemanggil yang menumpang, dan
+        diteruskan ke fn sebagai deadline= jika diisi. Raise DeadlineExceeded bila
+        hasil leader belum ada saat deadline habis.
+        Return: (hasil, shared); shared=True jika hasil didapat dari panggilan pemanggil lain.
+        """
+        if deadline is not None:
+            kwargs["deadline"] = deadline
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    break
+                call.waiters += 1
+
+            metrics.incr(f"{self.name}_shared")
+            if not call.done.wait(remaining(deadline)):
+                with self._lock:
+                    call.waiters -= 1
+                metrics.incr(f"{self.name}_timeout")
+                raise DeadlineExceeded("Deadline habis saat menunggu panggilan yang sama")
+            if call.error is None:
+                return call.result, True
+            if isinstance(call.error, Exception):
+                raise call.error
+            # Leader dihentikan dari luar (mis. rerun Streamlit), bukan gagal: coba jadi leader
+
+        metrics.incr(f"{self.name}_leader")
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        """Jumlah kunci yang sedang berjalan dan pemanggil yang menumpang"""
+        with self._lock:
+            return {
+                "kunci": len(self._calls),
+                "menumpang": sum(c.waiters for c in self._calls.values()),
+            }
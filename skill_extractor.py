@@ -0,0 +1,274 @@
+"""
+SKILL EXTRACTOR (AHO-CORASICK)
+Semua Kuk_Keywords & Unit_Kompetensi (PON), Keterampilan_Dibutuhkan (lowongan),
+dan nama skill/sertifikasi talenta dikompilasi jadi satu automaton.
+Satu kali scan linear atas teks CV menemukan semua penyebutan skill,
+termasuk frasa multi-kata ("machine learning", "power bi").
+
+Dipakai oleh:
+- extract_profile_entities (halaman Profil Talenta) sebagai input mapping
+- skill gap okupasi (skill PON yang belum ada di CV)
+- pencocokan lowongan (halaman Rekomendasi Karier)
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+import pandas as pd
+
+from config import EXCEL_PATH, SHEET_LOWONGAN, SHEET_PON, SHEET_SKILL
+from data_loader import read_sheet_cached, source_signature, text_of
+from text_analyzer import TECH_WHITELIST, stem
+
+# Kolom sumber vocabulary per sheet
+KOLOM_SKILL_PON = ("Unit_Kompetensi", "Kuk_Keywords")
+KOLOM_SKILL_LOWONGAN = ("Keterampilan_Dibutuhkan",)
+KOLOM_SKILL_SERTIFIKASI = ("Nama_Skill_Sertifikasi",)
+
+# Frasa vocabulary terpanjang (kata) yang masih masuk akal sebagai skill
+MAX_KATA_SKILL = 5
+
+_PEMISAH_RE = re.compile(r"[,;()\n]|\s+(?:dan|and|&)\s+")
+_NORMAL_RE = re.compile(r"[^a-z0-9+#./]+")
+_TITIK_RE = re.compile(r"\.(?![a-z0-9])")
+
+
+def normalize_skill(text: str) -> str:
+    """Lowercase, simbol selain + # . / jadi spasi, titik akhir kalimat dibuang"""
+    text = _TITIK_RE.sub(" ", str(text).lower())
+    return " ".join(_NORMAL_RE.sub(" ", text).split())
+
+
+def split_skill_list(text: str) -> list:
+    """
+    "Python (Pandas), Selenium/Cypress, CI/CD" -> ["Python", "Pandas", "Selenium", "Cypress", "CI/CD"]
+    Garis miring hanya memisah jika kedua sisi >= 3 huruf (CI/CD, UI/UX tetap utuh).
+    """
+    hasil = []
+    for bagian in _PEMISAH_RE.split(str(text)):
+        bagian = bagian.strip(" .-")
+        if not bagian or bagian.lower() in ("(null)", "nan"):
+            continue
+        sisi = [s.strip() for s in bagian.split("/")]
+        if len(sisi) > 1 and all(len(s) >= 3 for s in sisi):
+            hasil.extend(s for s in sisi if s)
+        else:
+            hasil.append(bagian)
+    return hasil
+
+
+def _buang_kata_kerja(frasa: str) -> str:
+    """'membuat REST API' -> 'REST API': kata kerja berimbuhan di awal frasa KUK dibuang"""
+    kata = frasa.split()
+    if len(kata) > 1:
+        pertama = kata[0].lower()
+        if pertama.startswith(("me", "ber", "di")) and stem(pertama) != pertama:
+            return " ".join(kata[1:])
+    return frasa
+
+
+class AhoCorasick:
+    """Automaton multi-pattern: goto (dict per state), fail link, dan output per state"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pid, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].append((pid, len(pattern)))
+
+        # BFS: fail link ke suffix terpanjang yang juga prefix pattern lain
+        antrian = list(self.goto[0].values())
+        for state in antrian:
+            for ch, nxt in self.goto[state].items():
+                antrian.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, pattern_id) untuk semua kemunculan, satu pass"""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid, panjang in output[state]:
+                yield i + 1 - panjang, i + 1, pid
+
+
+class SkillExtractor:
+    """
+    Vocabulary skill -> automaton. Pattern diberi spasi di kedua sisi
+    supaya hanya cocok per kata utuh ("sql" tidak cocok di "nosql").
+    """
+
+    def __init__(self, entries):
+        # entries: {kunci_normal: [nama_kanonik, set sumber]}
+        self.entries = entries
+        self.aliases = {}
+        for key in entries:
+            for varian in skill_variants(key):
+                self.aliases.setdefault(varian, key)
+        self.keys = list(self.aliases)
+        self.automaton = AhoCorasick([f" {k} " for k in self.keys])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def extract_counts(self, text) -> Counter:
+        """Nama skill kanonik -> jumlah penyebutan (urut kemunculan pertama)"""
+        teks = f" {normalize_skill(text)} "
+        matches = sorted(self.automaton.iter_matches(teks), key=lambda m: (m[0], m[0] - m[1]))
+
+        # Leftmost-longest, tanpa tumpang tindih (spasi pembatas boleh dipakai bersama)
+        counts = Counter()
+        batas = 0
+        for start, end, pid in matches:
+            if start < batas - 1:
+                continue
+            counts[self.entries[self.aliases[self.keys[pid]]][0]] += 1
+            batas = end
+        return counts
+
+    def extract(self, text) -> list:
+        """Skill terstruktur: [{'skill', 'jumlah', 'sumber'}], terbanyak dulu"""
+        counts = self.extract_counts(text)
+        sumber = {nama: src for nama, src in self.entries.values()}
+        return [
+            {"skill": nama, "jumlah": jumlah, "sumber": sorted(sumber[nama])}
+            for nama, jumlah in counts.most_common()
+        ]
+
+    def skill_set(self, text) -> set:
+        return set(self.extract_counts(text))
+
+
+def skill_variants(key: str) -> list:
+    """
+    Variasi penulisan satu skill: "power bi" <-> "powerbi", "reactjs" -> "react js" / "react.js"
+    """
+    varian = [key]
+    kata = key.split()
+    if len(kata) > 1:
+        varian.append("".join(kata))
+        if len(kata) == 2 and kata[1] in TECH_WHITELIST:
+            varian.append(".".join(kata))
+    else:
+        for n in (2, 3):
+            depan, akhir = key[:-n], key[-n:]
+            if len(depan) >= 3 and depan.isalpha() and akhir in TECH_WHITELIST:
+                varian += [f"{depan} {akhir}", f"{depan}.{akhir}"]
+                break
+    return varian
+
+
+def build_skill_vocabulary(df_pon=None, df_lowongan=None, df_skill=None) -> dict:
+    """
+    Kumpulkan vocabulary dari ketiga sheet: {kunci_normal: [nama_kanonik, set sumber]}.
+    Nama kanonik = penulisan pertama, diganti penulisan berhuruf kapital bila ada.
+    """
+    entries = {}
+    sumber_kolom = [
+        ("pon", df_pon, KOLOM_SKILL_PON),
+        ("lowongan", df_lowongan, KOLOM_SKILL_LOWONGAN),
+        ("sertifikasi", df_skill, KOLOM_SKILL_SERTIFIKASI),
+    ]
+    for sumber, df, kolom in sumber_kolom:
+        if df is None:
+            continue
+        for col in kolom:
+            if col not in df.columns:
+                continue
+            for sel in df[col].dropna().astype(str):
+                for frasa in split_skill_list(sel):
+                    frasa = _buang_kata_kerja(frasa)
+                    key = normalize_skill(frasa)
+                    if not key or len(key.split()) > MAX_KATA_SKILL:
+                        continue
+                    if len(key) <= 2 and key not in TECH_WHITELIST:
+                        continue
+                    entry = entries.setdefault(key, [frasa, set()])
+                    if entry[0].islower() and not frasa.islower():
+                        entry[0] = frasa
+                    entry[1].add(sumber)
+    return entries
+
+
+def build_skill_extractor(df_pon=None, df_lowongan=None, df_skill=None) -> SkillExtractor:
+    return SkillExtractor(build_skill_vocabulary(df_pon, df_lowongan, df_skill))
+
+
+@lru_cache(maxsize=2)
+def _load_cached(file_path, signature):
+    frames = {}
+    for sheet in (SHEET_PON, SHEET_LOWONGAN, SHEET_SKILL):
+        try:
+            frames[sheet] = read_sheet_cached(file_path, sheet)
+        except Exception:
+            frames[sheet] = None
+    return build_skill_extractor(frames[SHEET_PON], frames[SHEET_LOWONGAN], frames[SHEET_SKILL])
+
+
+def load_skill_extractor(file_path=EXCEL_PATH) -> SkillExtractor:
+    """Automaton dibangun sekali per versi workbook / folder dataset (kunci = source_signature)"""
+    return _load_cached(file_path, source_signature(file_path))
+
+
+# ========================================
+# GAP & PENCOCOKAN LOWONGAN
+# ========================================
+def required_skills(extractor, row, kolom=KOLOM_SKILL_PON) -> list:
+    """Skill yang dituntut satu baris PON / lowongan, urut kemunculan"""
+    teks = " , ".join(text_of(row.get(c)) for c in kolom)
+    return list(extractor.extract_counts(teks))
+
+
+def skill_gap(extractor, pon_row, cv_text, limit=5) -> list:
+    """Skill okupasi yang belum disebut di CV"""
+    dimiliki = extractor.skill_set(cv_text)
+    return [s for s in required_skills(extractor, pon_row) if s not in dimiliki][:limit]
+
+
+def match_vacancies(extractor, df_lowongan, cv_text, top_k=3) -> list:
+    """
+    Urutkan lowongan berdasarkan cakupan skill CV terhadap Keterampilan_Dibutuhkan.
+    Return: [(row_dict, skor 0-1, skill_cocok, skill_kurang)], skor > 0 saja
+    """
+    dimiliki = extractor.skill_set(cv_text)
+    hasil = []
+    for row in df_lowongan.to_dict("records"):
+        # NA -> None supaya baris aman di-serialisasi JSON / ditampilkan
+        row = {k: (None if pd.isna(v) else v) for k, v in row.items()}
+        dibutuhkan = required_skills(extractor, row, KOLOM_SKILL_LOWONGAN)
+        if not dibutuhkan:
+            continue
+        cocok = [s for s in dibutuhkan if s in dimiliki]
+        if cocok:
+            kurang = [s for s in dibutuhkan if s not in dimiliki]
+            hasil.append((row, len(cocok) / len(dibutuhkan), cocok, kurang))
+    hasil.sort(key=lambda h: (-h[1], -len(h[2])))
+    return hasil[:top_k]
+
+
+def skills_frame(skills) -> pd.DataFrame:
+    """Hasil extract() -> DataFrame untuk ditampilkan"""
+    return pd.DataFrame(
+        [{"Skill": s["skill"], "Jumlah": s["jumlah"], "Sumber": ", ".join(s["sumber"])} for s in skills],
+        columns=["Skill", "Jumlah", "Sumber"],
+    )
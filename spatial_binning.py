@@ -0,0 +1,75 @@
+"""
+BINNING SPASIAL UNTUK PETA TALENTA
+Agregasi titik (lat, lon) ke grid sesuai level zoom di sisi server,
+sehingga browser hanya menerima centroid bin + jumlah, bukan satu titik per talenta.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Jumlah sel grid per lebar tile peta (tile web-mercator = 360 / 2**zoom derajat)
+SEL_PER_TILE = 4
+
+# Batas atas jumlah bin yang dikirim ke browser
+MAX_BIN = 2000
+
+# Kira-kira meter per derajat di khatulistiwa
+METER_PER_DERAJAT = 111_320
+
+
+def cell_size_for_zoom(zoom: float) -> float:
+    """Ukuran sel grid (derajat) yang pas untuk level zoom peta"""
+    return 360.0 / (2 ** zoom) / SEL_PER_TILE
+
+
+def _bin_once(lat, lon, cell):
+    """Satu pass binning: return (kode_bin_unik, inverse)"""
+    iy = np.floor((lat + 90.0) / cell).astype(np.int64)
+    ix = np.floor((lon + 180.0) / cell).astype(np.int64)
+    kolom = int(np.ceil(360.0 / cell)) + 1
+    return np.unique(iy * kolom + ix, return_inverse=True)
+
+
+def bin_points(lat, lon, weight=None, zoom: float = 4, max_bins: int = MAX_BIN) -> pd.DataFrame:
+    """
+    Agregasi titik ke grid.
+
+    Args:
+        lat, lon: array koordinat (NaN diabaikan)
+        weight: bobot per titik (mis. jumlah talenta per lokasi), default 1
+        zoom: level zoom peta, menentukan resolusi grid
+        max_bins: jika bin melebihi batas ini, grid dikasarkan 2x sampai muat
+
+    Return: DataFrame (lat, lon, Jumlah, size) satu baris per bin,
+            lat/lon = centroid berbobot, size = radius lingkaran (meter)
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    weight = np.ones_like(lat) if weight is None else np.asarray(weight, dtype=float)
+
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    lat, lon, weight = lat[valid], lon[valid], weight[valid]
+
+    if lat.size == 0:
+        return pd.DataFrame(columns=["lat", "lon", "Jumlah", "size"])
+
+    cell = cell_size_for_zoom(zoom)
+    kode, inverse = _bin_once(lat, lon, cell)
+    while kode.size > max_bins:
+        cell *= 2
+        kode, inverse = _bin_once(lat, lon, cell)
+
+    jumlah = np.bincount(inverse, weights=weight)
+    centroid_lat = np.bincount(inverse, weights=lat * weight) / jumlah
+    centroid_lon = np.bincount(inverse, weights=lon * weight) / jumlah
+
+    # Radius maksimum setengah sel agar lingkaran antar bin tidak saling menutupi
+    radius_max = cell * METER_PER_DERAJAT / 2
+    size = radius_max * np.sqrt(jumlah / jumlah.max())
+
+    return pd.DataFrame({
+        "lat": centroid_lat,
+        "lon": centroid_lon,
+        "Jumlah": jumlah.astype(np.int64),
+        "size": size,
+    })
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import cat_engine
+from cat_engine import (
+    calibrate, estimate_theta, fit_item, information, prob_correct, result_for, select_item,
+    should_stop, theta_to_score,
+)
+
+
+def _simulasi(params, n_sesi, seed=0):
+    """Jawaban [(sesi, item_id, benar)] dari kemampuan ~ N(0, 1) dan parameter sebenarnya"""
+    rng = np.random.default_rng(seed)
+    thetas = rng.normal(size=n_sesi)
+    responses = []
+    for s, theta in enumerate(thetas):
+        for item_id, (a, b) in params.items():
+            responses.append((f"s{s}", item_id, bool(rng.random() < prob_correct(theta, a, b))))
+    return thetas, responses
+
+
+def test_prob_correct_dan_informasi():
+    assert prob_correct(1.0, 1.5, 1.0) == pytest.approx(0.5)
+    assert prob_correct(3.0, 1.0, 0.0) > prob_correct(-3.0, 1.0, 0.0)
+    assert information(0.0, 2.0, 0.0) == pytest.approx(1.0)
+    assert information(0.0, 1.0, 0.0) > information(2.0, 1.0, 0.0)
+
+
+def test_estimate_theta_eap():
+    assert estimate_theta([]) == (0.0, 1.0)
+    benar, se_benar = estimate_theta([(1.0, 0.0, True)] * 5)
+    salah, _ = estimate_theta([(1.0, 0.0, False)] * 5)
+    assert benar > 0 and se_benar < 1.0
+    assert salah == pytest.approx(-benar, abs=1e-6)
+    assert np.isfinite(benar) and benar < 4.0
+
+
+def test_select_item_informasi_terbesar_di_theta():
+    items = [{"item_id": i, "a": 1.0, "b": b} for i, b in (("mudah", -2.0), ("sedang", 0.0), ("sulit", 2.0))]
+    assert select_item(items, 1.8)["item_id"] == "sulit"
+    assert select_item(items, 0.1, answered=["sedang"])["item_id"] in ("mudah", "sulit")
+    assert select_item(items, 0.0, answered=["mudah", "sedang", "sulit"]) is None
+
+
+def test_should_stop():
+    assert not should_stop(2, 0.1, 10, se_target=0.45, min_items=5, max_items=20)
+    assert should_stop(5, 0.4, 10, se_target=0.45, min_items=5, max_items=20)
+    assert not should_stop(5, 0.5, 10, se_target=0.45, min_items=5, max_items=20)
+    assert should_stop(20, 0.9, 10, se_target=0.45, min_items=5, max_items=20)
+    assert should_stop(1, 0.9, 0, se_target=0.45, min_items=5, max_items=20)
+
+
+def test_skor_dan_level():
+    assert theta_to_score(0.0) == 50
+    assert theta_to_score(-4.0) == 0 and theta_to_score(4.0) == 100
+    assert result_for(2.0) == (98, "Ahli")
+
+
+def test_fit_item_memulihkan_parameter():
+    rng = np.random.default_rng(1)
+    thetas = rng.normal(size=4000)
+    benar = rng.random(4000) < prob_correct(thetas, 1.6, 0.8)
+    a, b = fit_item(thetas, benar)
+    assert a == pytest.approx(1.6, abs=0.25)
+    assert b == pytest.approx(0.8, abs=0.2)
+
+
+def test_calibrate_em_memulihkan_urutan_kesulitan():
+    params = {"q1": (1.2, -1.5), "q2": (1.0, 0.0), "q3": (1.5, 1.2), "q4": (0.8, 0.5)}
+    _, responses = _simulasi(params, 800)
+    awal = {i: (cat_engine.DEFAULT_A, cat_engine.DEFAULT_B) for i in params}
+    hasil = calibrate(awal, responses)
+
+    assert {i: n for i, (_, _, n) in hasil.items()} == {i: 800 for i in params}
+    for item_id, (a, b) in params.items():
+        assert hasil[item_id][1] == pytest.approx(b, abs=0.35)
+    urut = sorted(params, key=lambda i: hasil[i][1])
+    assert urut == ["q1", "q2", "q4", "q3"]
+
+
+def test_calibrate_lewati_soal_dengan_jawaban_sedikit():
+    awal = {"q1": (1.0, 0.0), "baru": (1.0, 0.0)}
+    _, responses = _simulasi({"q1": (1.0, 1.0)}, 100)
+    responses += [("x", "baru", True)] * 3 + [("y", "asing", False)]
+    hasil = calibrate(awal, responses, min_responses=20)
+    assert hasil["baru"] == (1.0, 0.0, 3)
+    assert "asing" not in hasil
+    assert calibrate(awal, []) == {"q1": (1.0, 0.0, 0), "baru": (1.0, 0.0, 0)}
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from config import SHEET_TALENTA
+from cv_dedup import CvDuplicateIndex, LshIndex, MinHasher, shingles, similarity
+from profile_store import ProfileStore
+
+CV = (
+    "Data scientist dengan pengalaman lima tahun membangun model machine learning "
+    "menggunakan python pandas dan scikit learn untuk analisis churn pelanggan telekomunikasi "
+    "serta membuat dashboard power bi bagi tim manajemen di Jakarta"
+)
+CV_EDIT = CV.replace("lima tahun", "enam tahun")
+CV_LAIN = (
+    "Network engineer berpengalaman mengelola routing switching firewall dan vpn "
+    "pada jaringan kantor cabang bank nasional, sertifikasi CCNA dan CCNP"
+)
+
+
+def _jaccard(a, b):
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+def test_shingles():
+    assert len(shingles("satu dua tiga empat")) == 2
+    assert len(shingles("satu dua")) == 2
+    assert shingles("...") == set()
+    assert shingles("Python  Pandas SQL") == shingles("python pandas sql")
+
+
+def test_signature_deterministik_dan_mendekati_jaccard():
+    hasher = MinHasher()
+    sig = hasher.signature(CV)
+    assert sig.dtype == np.uint32 and len(sig) == 128
+    assert np.array_equal(sig, MinHasher().signature(CV))
+    assert hasher.signature("!!!") is None
+
+    estimasi = similarity(sig, hasher.signature(CV_EDIT))
+    assert estimasi == pytest.approx(_jaccard(CV, CV_EDIT), abs=0.15)
+    assert similarity(sig, hasher.signature(CV_LAIN)) < 0.2
+
+
+def test_lsh_query_add_remove():
+    hasher = MinHasher()
+    lsh = LshIndex()
+    lsh.add("A", hasher.signature(CV))
+    lsh.add("B", hasher.signature(CV_LAIN))
+    assert len(lsh) == 2
+
+    hasil = lsh.query(hasher.signature(CV_EDIT))
+    assert [k for k, _ in hasil] == ["A"]
+    assert lsh.query(hasher.signature(CV_EDIT), exclude="A") == []
+
+    lsh.remove("A")
+    assert lsh.query(hasher.signature(CV)) == []
+    assert all("A" not in isi for b in lsh._buckets for isi in b.values())
+
+
+def test_index_store_simpan_dan_muat_ulang(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.sqlite"))
+    store.upsert(SHEET_TALENTA, [
+        {"TalentID": "TAL-001", "Email": "a@x.id", "Raw_CV_Text": CV},
+        {"TalentID": "TAL-002", "Email": "b@x.id", "Raw_CV_Text": CV_LAIN},
+    ])
+    index = CvDuplicateIndex(store)
+    talent_id, skor = index.find(CV_EDIT)
+    assert talent_id == "TAL-001" and skor >= 0.7
+    assert index.find(CV_EDIT, exclude="TAL-001") is None
+    assert index.find("teks yang sama sekali berbeda tentang memasak rendang") is None
+
+    index.add("TAL-003", "Frontend developer react typescript tailwind untuk aplikasi e-commerce")
+    dimuat = CvDuplicateIndex(store)
+    assert len(dimuat.lsh) == 3
+    assert dimuat.find("Frontend developer react typescript tailwind untuk aplikasi e-commerce")[0] == "TAL-003"
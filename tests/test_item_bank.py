@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from item_bank import ItemBank, item_id_for
+from jobs import JobRunner
+
+SOAL = [
+    {"teks": f"Soal nomor {i}?", "opsi": ["A", "B", "C", "D"], "jawaban_benar": "A"}
+    for i in range(3)
+]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    bank = ItemBank(str(tmp_path / "item_bank.sqlite"))
+    bank.add_items("OK-1", SOAL)
+    return bank
+
+
+def _jawab(bank, n, okupasi_id="OK-1"):
+    items = bank.items_for(okupasi_id)
+    for s in range(n):
+        for k, item in enumerate(items):
+            bank.record_response(f"s{s}", item, (s + k) % 3 != 0)
+
+
+def test_item_id_abaikan_spasi_dan_huruf_besar():
+    assert item_id_for("OK-1", "Apa  itu SQL?") == item_id_for("OK-1", "apa itu sql?")
+    assert item_id_for("OK-1", "x") != item_id_for("OK-2", "x")
+
+
+def test_add_items_tanpa_duplikat(bank):
+    assert bank.add_items("OK-1", SOAL + [{"teks": "Soal baru?", "opsi": ["A", "B", "C", "D"],
+                                           "jawaban_benar": "B"}]) == 1
+    assert bank.count("OK-1") == 4 and bank.count() == 4
+    item = bank.items_for("OK-1")[0]
+    assert item["opsi"] == ["A", "B", "C", "D"] and item["n_respon_window"] == 0
+
+
+def test_calibrate_dari_jendela_jawaban_terbaru(bank):
+    _jawab(bank, 40)
+    assert bank.pending_responses("OK-1") == 120
+    assert bank.calibrate("OK-1", window=30) == 3
+    assert {it["n_respon_window"] for it in bank.items_for("OK-1")} == {10}
+    assert bank.pending_responses("OK-1") == 0
+
+
+def test_calibrate_tidak_menimpa_kalibrasi_lebih_baru(bank):
+    _jawab(bank, 30)
+    bank.calibrate("OK-1")
+    sebelum = bank.items_for("OK-1")
+    with bank._connect() as con:
+        con.execute("UPDATE calibration SET last_response_id = last_response_id + 1000")
+    assert bank.calibrate("OK-1") == 0
+    assert bank.items_for("OK-1") == sebelum
+
+
+def test_calibration_due(bank):
+    _jawab(bank, 5)
+    assert bank.calibration_due("OK-1", every=15, interval=300)
+    assert not bank.calibration_due("OK-1", every=16, interval=300)
+    bank.calibrate("OK-1")
+    _jawab(bank, 10)
+    assert not bank.calibration_due("OK-1", every=15, interval=300)
+    assert bank.calibration_due("OK-1", every=15, interval=0)
+
+
+def test_schedule_calibration_satu_job_per_okupasi(bank, monkeypatch):
+    runner = JobRunner(max_workers=1)
+    mulai, lepas = threading.Event(), threading.Event()
+    asli = bank.calibrate
+
+    def calibrate_lambat(okupasi_id, *args):
+        mulai.set()
+        lepas.wait(5)
+        return asli(okupasi_id, *args)
+
+    monkeypatch.setattr(bank, "calibrate", calibrate_lambat)
+    assert bank.schedule_calibration("OK-1", runner) is None  # belum cukup jawaban
+
+    _jawab(bank, 20)
+    job_id = bank.schedule_calibration("OK-1", runner)
+    assert job_id is not None
+    assert mulai.wait(5)
+    assert bank.schedule_calibration("OK-1", runner) is None
+
+    lepas.set()
+    batas = time.monotonic() + 5
+    while not runner.get(job_id).done:
+        assert time.monotonic() < batas
+        time.sleep(0.01)
+    assert runner.get(job_id).result == 3
+    assert bank.schedule_calibration("OK-1", runner) is None  # baru saja dikalibrasi
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from jobs import (
+    STATUS_CANCELLED, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED, Job, JobCancelled, JobRunner,
+)
+
+
+def _tunggu(runner, job_id, timeout=5):
+    batas = time.monotonic() + timeout
+    job = runner.get(job_id)
+    while not job.done:
+        assert time.monotonic() < batas, f"job {job_id} belum selesai"
+        time.sleep(0.005)
+    return job
+
+
+def _macet(job, lepas, mulai=None):
+    """Job yang berjalan sampai `lepas` di-set, sambil mengecek pembatalan"""
+    if mulai is not None:
+        mulai.set()
+    while not lepas.is_set():
+        job.report(message="bekerja")
+        time.sleep(0.005)
+    return "selesai"
+
+
+def test_report_membatasi_progress():
+    job = Job("1", "uji")
+    job.report(1.7, "hampir")
+    assert (job.progress, job.message) == (1.0, "hampir")
+    job.report(-1)
+    assert job.progress == 0.0
+
+
+def test_job_selesai_dan_gagal():
+    runner = JobRunner(max_workers=2)
+    ok = _tunggu(runner, runner.submit("uji", lambda job, x: x * 2, 21))
+    assert (ok.status, ok.result, ok.progress) == (STATUS_DONE, 42, 1.0)
+
+    def gagal(job):
+        raise ValueError("rusak")
+
+    err = _tunggu(runner, runner.submit("uji", gagal))
+    assert err.status == STATUS_FAILED
+    assert err.error == "rusak" and isinstance(err.exception, ValueError)
+    assert "ValueError" in err.traceback
+
+
+def test_cancel_job_berjalan_berhenti_di_report():
+    runner = JobRunner(max_workers=1)
+    lepas, mulai = threading.Event(), threading.Event()
+    job_id = runner.submit("uji", _macet, lepas, mulai)
+    assert mulai.wait(5)
+    assert runner.cancel(job_id)
+    assert _tunggu(runner, job_id).status == STATUS_CANCELLED
+    assert not runner.cancel(job_id)
+
+
+def test_cancel_job_antre_langsung_dibatalkan():
+    runner = JobRunner(max_workers=1)
+    lepas, mulai = threading.Event(), threading.Event()
+    pertama = runner.submit("uji", _macet, lepas, mulai)
+    assert mulai.wait(5)
+    kedua = runner.submit("uji", lambda job: "tidak jalan")
+    assert runner.get(kedua).status == STATUS_QUEUED
+
+    assert runner.cancel(kedua)
+    assert runner.get(kedua).status == STATUS_CANCELLED
+    assert runner.get(kedua).started is None
+    lepas.set()
+    assert _tunggu(runner, pertama).status == STATUS_DONE
+
+
+def test_reap_batalkan_job_ditinggal_dan_buang_job_lama():
+    runner = JobRunner(max_workers=1, abandon_after=60, retention=60)
+    lepas, mulai = threading.Event(), threading.Event()
+    aktif = runner.submit("uji", _macet, lepas, mulai)
+    assert mulai.wait(5)
+    assert runner.reap() == (0, 0)
+
+    # Tidak di-polling lebih lama dari abandon_after
+    runner.get(aktif, touch=False).last_seen -= 61
+    assert runner.reap() == (1, 0)
+    job = _tunggu(runner, aktif)
+    assert job.status == STATUS_CANCELLED
+
+    # Selesai lebih lama dari retention -> dibuang
+    job.finished -= 61
+    assert runner.reap() == (0, 1)
+    assert runner.get(aktif) is None
+
+
+def test_job_cancelled_bukan_exception_biasa():
+    with pytest.raises(JobCancelled):
+        try:
+            raise JobCancelled("x")
+        except Exception:
+            pytest.fail("JobCancelled tertangkap except Exception")
@@ -0,0 +1,130 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pon_index import (
+    BasePonIndex, HashingPonIndex, MappingCache, TfidfPonIndex, refresh_pon_index, top_k_from_scores,
+)
+
+
+def _pon(rows):
+    return pd.DataFrame(rows, columns=["OkupasiID", "Okupasi", "Unit_Kompetensi", "Kuk_Keywords"])
+
+
+PON = _pon([
+    ("PON-DS", "Data Scientist", "Analisis data", "python pandas machine learning"),
+    ("PON-WEB", "Web Developer", "Pengembangan web", "javascript react html css"),
+    ("PON-NET", "Network Engineer", "Jaringan komputer", "routing switching firewall"),
+])
+
+
+def test_top_k_from_scores_urut_menurun():
+    scores = np.array([[0.1, 0.9, 0.5], [0.3, 0.2, 0.8]])
+    assert top_k_from_scores(scores, 2) == [[(1, 0.9), (2, 0.5)], [(2, 0.8), (0, 0.3)]]
+    assert top_k_from_scores(scores, 10)[0][-1] == (0, 0.1)
+
+
+def test_apply_delta_tanpa_perubahan_tidak_naik_versi():
+    index = HashingPonIndex(PON)
+    ringkasan = index.apply_delta(PON.copy())
+    assert ringkasan == {"ditambah": [], "diubah": [], "dihapus": [], "version": 0}
+    assert index.changes_since(0) == set()
+
+
+def test_apply_delta_sama_dengan_index_baru():
+    index = HashingPonIndex(PON)
+    baru = pd.concat([
+        PON.iloc[[0]],
+        _pon([("PON-WEB", "Web Developer", "Pengembangan web", "typescript vue")]),
+        _pon([("PON-QA", "QA Engineer", "Pengujian", "selenium cypress")]),
+    ])
+    ringkasan = index.apply_delta(baru)
+
+    assert ringkasan["ditambah"] == ["PON-QA"]
+    assert ringkasan["diubah"] == ["PON-WEB"]
+    assert ringkasan["dihapus"] == ["PON-NET"]
+    assert index.version == 1
+    assert index.changes_since(0) == {"PON-QA", "PON-WEB", "PON-NET"}
+    assert index.changes_since(1) == set()
+
+    segar = HashingPonIndex(baru)
+    teks = "pengalaman selenium dan vue"
+    assert index.search_ids(teks, 3) == pytest.approx(segar.search_ids(teks, 3))
+
+
+def test_changes_since_versi_di_luar_log():
+    index = HashingPonIndex(PON)
+    assert index.changes_since(-5) is None
+
+
+def test_mapping_cache_hit_dan_revalidasi():
+    index = HashingPonIndex(PON)
+    cache = MappingCache()
+    teks = "python pandas machine learning"
+    hasil = cache.lookup(index, teks)
+    assert hasil[0][0] == "PON-DS"
+    assert cache.lookup(index, teks) == hasil
+    assert cache.stats["miss"] == 1 and cache.stats["hit"] == 1
+
+    # Okupasi lain berubah tanpa melampaui skor hasil cache -> entri tetap dipakai
+    index.apply_delta(pd.concat([PON.iloc[:2], _pon([("PON-NET", "Network", "Jaringan", "vpn dns")])]))
+    assert cache.lookup(index, teks) == hasil
+    assert cache.stats["revalidated"] == 1
+
+
+def test_mapping_cache_invalid_jika_okupasi_hasil_berubah():
+    index = HashingPonIndex(PON)
+    cache = MappingCache()
+    teks = "python pandas machine learning"
+    cache.lookup(index, teks)
+    index.apply_delta(pd.concat([_pon([("PON-DS", "Data Analyst", "Analisis", "excel")]), PON.iloc[1:]]))
+    cache.lookup(index, teks)
+    assert cache.stats["invalidated"] == 1
+
+
+class _IndexTetap(BasePonIndex):
+    """Index statis dengan hasil tetap, untuk menguji kunci MappingCache"""
+
+    metode = "tetap"
+
+    def __init__(self, df_pon, hasil):
+        super().__init__(df_pon)
+        self.hasil = hasil
+
+    def search_ids(self, profile_text, top_k=1):
+        return self.hasil[:top_k]
+
+
+def test_mapping_cache_index_dibangun_ulang_tidak_memakai_hasil_lama():
+    # id() objek yang sudah dibebaskan dipakai ulang CPython; kunci cache tidak boleh ikut
+    cache = MappingCache()
+    for i in range(200):
+        index = _IndexTetap(PON, [(f"PON-{i}", 0.5)])
+        assert cache.lookup(index, "teks") == [(f"PON-{i}", 0.5)]
+        del index
+    assert cache.stats["hit"] == 0
+
+
+def _tulis_pon(folder, df):
+    path = folder / "PON_TIK_Master.csv"
+    df.to_csv(path, index=False)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.parametrize("metode", ["tfidf", "hashing"])
+def test_refresh_pon_index_mengikuti_perubahan_sheet(tmp_path, metode):
+    _tulis_pon(tmp_path, PON)
+    index, delta = refresh_pon_index(str(tmp_path), metode)
+    assert delta is None
+    assert refresh_pon_index(str(tmp_path), metode) == (index, None)
+
+    _tulis_pon(tmp_path, pd.concat([PON, _pon([("PON-QA", "QA Engineer", "Pengujian", "selenium")])]))
+    index2, delta = refresh_pon_index(str(tmp_path), metode)
+    assert "PON-QA" in list(index2.okupasi_ids)
+    if metode == "hashing":
+        assert index2 is index and delta["ditambah"] == ["PON-QA"]
+    else:
+        assert index2.generation != index.generation and delta is None
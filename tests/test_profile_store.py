@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from config import EXCEL_PATH, SHEET_HASIL, SHEET_TALENTA
+from profile_store import ProfileStore, _id_number
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path / "profiles.sqlite"))
+
+
+def _simpan(store, email, nama="Uji"):
+    return store.save_mapping({"Email": email, "Nama": nama}, "PON-DS", 0.5, "")
+
+
+def test_id_number():
+    assert _id_number("TAL-021", "TAL") == 21
+    assert _id_number("HASIL-007", "TAL") is None
+    assert _id_number("TAL-x1", "TAL") is None
+    assert _id_number(None, "TAL") is None
+
+
+def test_save_mapping_id_berurutan_dan_email_dipakai_ulang(store):
+    assert _simpan(store, "a@x.id") == ("TAL-001", "HASIL-001")
+    assert _simpan(store, "b@x.id") == ("TAL-002", "HASIL-002")
+    assert _simpan(store, "a@x.id", nama="") == ("TAL-001", "HASIL-003")
+    assert store.get_talent("TAL-001")["Nama"] == "Uji"
+    assert store.latest_result("TAL-001")["HasilID"] == "HASIL-003"
+
+
+def test_upsert_id_eksplisit_memajukan_sequence(store):
+    _simpan(store, "a@x.id")
+    store.upsert(SHEET_TALENTA, [{"TalentID": "TAL-050", "Email": "lama@x.id"}])
+    assert _simpan(store, "b@x.id")[0] == "TAL-051"
+
+    # Id eksplisit yang lebih kecil tidak memundurkan sequence
+    store.upsert(SHEET_TALENTA, [{"TalentID": "TAL-010", "Email": "c@x.id"}])
+    assert _simpan(store, "d@x.id")[0] == "TAL-052"
+
+
+def test_append_results_id_berurutan(store):
+    _simpan(store, "a@x.id")
+    assert store.append_results([{"TalentID": "TAL-001", "OkupasiID_Mapped": o} for o in ("A", "B", "C")]) == 3
+    assert [r["HasilID"] for r in store.children(SHEET_HASIL, "TAL-001")] == [
+        "HASIL-001", "HASIL-002", "HASIL-003", "HASIL-004",
+    ]
+    assert store.append_results([]) == 0
+
+
+def test_store_lama_tanpa_sequence_di_seed_dari_tabel(store):
+    store.upsert(SHEET_TALENTA, [{"TalentID": f"TAL-{i:03d}", "Email": f"{i}@x.id"} for i in (3, 17, 9)])
+    store._connect().execute("DELETE FROM id_sequence")
+    assert _simpan(store, "baru@x.id")[0] == "TAL-018"
+
+
+def test_save_mapping_serentak_id_unik(store):
+    hasil = []
+
+    def kerja(i):
+        hasil.append(_simpan(store, f"{i}@x.id"))
+
+    threads = [threading.Thread(target=kerja, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({t for t, _ in hasil}) == 20
+    assert sorted(h for _, h in hasil) == [f"HASIL-{i:03d}" for i in range(1, 21)]
+
+
+def test_version_naik_hanya_untuk_tabel_yang_ditulis(store):
+    awal = store.version(SHEET_TALENTA, SHEET_HASIL)
+    _, hasil_id = _simpan(store, "a@x.id")
+    setelah = store.version(SHEET_TALENTA, SHEET_HASIL)
+    assert all(b > a for a, b in zip(awal, setelah))
+
+    store.record_assessment(hasil_id, 80, "Menengah")
+    assert store.version(SHEET_TALENTA, SHEET_HASIL) == (setelah[0], setelah[1] + 1)
+
+
+def test_result_meta(store):
+    _, hasil_id = store.save_mapping({"Email": "a@x.id"}, "PON-DS", 0.5, "", meta=("tfidf", "abc"))
+    assert store.result_meta(hasil_id) == ("tfidf", "abc")
+    assert store.result_meta("HASIL-999") is None
+
+
+def test_import_if_empty_hanya_sekali(store):
+    hasil = store.import_if_empty(EXCEL_PATH)
+    assert hasil[SHEET_TALENTA] == store.count(SHEET_TALENTA) > 0
+    assert store.import_if_empty(EXCEL_PATH) is None
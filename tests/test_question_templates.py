@@ -0,0 +1,87 @@
+import random
+
+import pandas as pd
+import pytest
+
+from assessment import normalize_questions
+from config import EXCEL_PATH, JUMLAH_SOAL
+from question_templates import (
+    SUMBER_LOKAL, LocalQuestionGenerator, keywords_for_unit, load_local_generator, split_terms,
+)
+from skill_extractor import normalize_skill
+
+PON = pd.DataFrame([
+    ("PON-QA", "Quality Assurance", "QA Engineer", "Pengujian Perangkat Lunak, Dokumentasi",
+     "menguji API, pengujian regresi, selenium, dokumentasi test case"),
+    ("PON-DS", "Data", "Data Scientist", "Analisis Data, Pemodelan Statistik",
+     "analisis eksplorasi data, regresi logistik, python, visualisasi"),
+    ("PON-NET", "Infrastruktur", "Network Engineer", "Konfigurasi Jaringan, Keamanan Jaringan",
+     "routing, firewall, vpn, konfigurasi switch"),
+    ("PON-WEB", "Software Development", "Web Developer", "Pemrograman Web, Basis Data",
+     "html, css, javascript, query sql"),
+], columns=["OkupasiID", "Area_Fungsi", "Okupasi", "Unit_Kompetensi", "Kuk_Keywords"])
+
+
+@pytest.fixture(scope="module")
+def gen():
+    return LocalQuestionGenerator(PON)
+
+
+def test_split_terms_buang_kosong_dan_duplikat():
+    assert split_terms("HTML, CSS;  html , \nJavascript.") == ["HTML", "CSS", "Javascript"]
+    assert split_terms(None) == []
+
+
+def test_keywords_for_unit_lewat_kata_dasar():
+    keywords = ["Selenium", "testing otomatis", "menguji API", "pengujian regresi", "Docker"]
+    assert keywords_for_unit("Pengujian Perangkat Lunak", keywords) == ["menguji API", "pengujian regresi"]
+    assert keywords_for_unit("Manajemen Proyek", keywords) == []
+
+
+def test_soal_valid_satu_jawaban_benar(gen):
+    for okupasi_id, ok in gen.okupasi.items():
+        for kode, soal_list in gen.candidates(okupasi_id, random.Random(1)).items():
+            for q in soal_list:
+                kunci = [normalize_skill(o) for o in q["opsi"]]
+                assert len(set(kunci)) == 4
+                assert q["jawaban_benar"] in q["opsi"]
+                assert q["sumber"] == SUMBER_LOKAL
+                if kode in ("unit", "kuk"):
+                    milik = [o for o in q["opsi"] if normalize_skill(o) in ok.kunci]
+                    assert milik == [q["jawaban_benar"]]
+
+
+def test_soal_kuk_dijawab_dari_unit_yang_ditanyakan(gen):
+    soal = gen.candidates("PON-QA", random.Random(2))["kuk"]
+    unit = {q["teks"].split('"')[1]: q["jawaban_benar"] for q in soal}
+    assert set(unit) == {"Pengujian Perangkat Lunak", "Dokumentasi"}
+    assert unit["Pengujian Perangkat Lunak"] in ("menguji API", "pengujian regresi")
+    assert unit["Dokumentasi"] == "dokumentasi test case"
+
+
+def test_questions_bergilir_antar_template_dan_teks_stabil(gen):
+    soal = gen.questions("PON-DS", 5, random.Random(3))
+    assert [q["id"] for q in soal] == [f"q{i}" for i in range(1, 6)]
+    assert all(q["tipe"] == "pilihan_ganda" for q in soal)
+    assert len({q["teks"].split(" ")[0] for q in soal}) > 1
+
+    teks = {q["teks"] for q in gen.questions("PON-DS", 50, random.Random(4))}
+    assert teks == {q["teks"] for q in gen.questions("PON-DS", 50, random.Random(5))}
+    assert gen.questions("PON-TIDAK-ADA") == []
+
+
+def test_workbook_cukup_soal_per_okupasi():
+    gen = load_local_generator(EXCEL_PATH)
+    for okupasi_id in gen.okupasi:
+        soal = gen.questions(okupasi_id, JUMLAH_SOAL, random.Random(0))
+        assert len(soal) == JUMLAH_SOAL
+        assert normalize_questions(soal, okupasi_id, JUMLAH_SOAL)
+
+
+def test_normalize_questions_menyalin_cadangan(gen):
+    cadangan = gen.questions("PON-NET", 4, random.Random(6))[::-1]
+    asli = [dict(q) for q in cadangan]
+    hasil = normalize_questions([], "Network Engineer", 4, cadangan)
+    assert [q["id"] for q in hasil] == ["q1", "q2", "q3", "q4"]
+    assert cadangan == asli
+    assert not any(h is c for h in hasil for c in cadangan)
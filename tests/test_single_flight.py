@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from deadline import Deadline, DeadlineExceeded
+from single_flight import SingleFlight, prompt_key
+
+
+def _mulai_leader(sf, fn, **kwargs):
+    """Jalankan leader di thread lain; tunggu sampai kuncinya terdaftar"""
+    hasil = {}
+
+    def jalan():
+        try:
+            hasil["nilai"] = sf.do("k", fn, **kwargs)
+        except Exception as e:
+            hasil["error"] = e
+
+    t = threading.Thread(target=jalan)
+    t.start()
+    while not sf.in_flight()["kunci"]:
+        time.sleep(0.001)
+    return t, hasil
+
+
+def test_prompt_key_abaikan_whitespace():
+    assert prompt_key("buat  soal\n python ") == prompt_key("buat soal python")
+    assert prompt_key("a") != prompt_key("b")
+
+
+def test_follower_menerima_hasil_leader():
+    sf = SingleFlight("uji")
+    lepas = threading.Event()
+    panggilan = []
+
+    def fn():
+        panggilan.append(1)
+        lepas.wait(5)
+        return "respons"
+
+    t, hasil = _mulai_leader(sf, fn)
+    follower = {}
+    f = threading.Thread(target=lambda: follower.update(nilai=sf.do("k", fn)))
+    f.start()
+    while not sf.in_flight()["menumpang"]:
+        time.sleep(0.001)
+    lepas.set()
+    t.join()
+    f.join()
+
+    assert hasil["nilai"] == ("respons", False)
+    assert follower["nilai"] == ("respons", True)
+    assert len(panggilan) == 1
+    assert sf.in_flight() == {"kunci": 0, "menumpang": 0}
+
+
+def test_follower_menerima_error_leader():
+    sf = SingleFlight("uji")
+    lepas = threading.Event()
+
+    def gagal():
+        lepas.wait(5)
+        raise ValueError("upstream")
+
+    t, hasil = _mulai_leader(sf, gagal)
+    threading.Timer(0.05, lepas.set).start()
+    with pytest.raises(ValueError):
+        sf.do("k", gagal)
+    t.join()
+    assert isinstance(hasil["error"], ValueError)
+
+
+def test_follower_berhenti_saat_deadline_habis():
+    sf = SingleFlight("uji")
+    lepas = threading.Event()
+
+    def macet(deadline=None):
+        lepas.wait(5)
+        return "telat"
+
+    t, _ = _mulai_leader(sf, macet, deadline=Deadline(5))
+    mulai = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        sf.do("k", macet, deadline=Deadline(0.1))
+    assert time.monotonic() - mulai < 1
+    assert sf.in_flight()["menumpang"] == 0
+    lepas.set()
+    t.join()
+
+
+def test_deadline_diteruskan_ke_fungsi():
+    deadline = Deadline(5)
+    assert SingleFlight().do("k", lambda deadline=None: deadline, deadline=deadline) == (deadline, False)
+    assert SingleFlight().do("k", lambda: "tanpa deadline") == ("tanpa deadline", False)
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from skill_extractor import AhoCorasick, build_skill_extractor, skill_variants, split_skill_list
+
+
+def _extractor():
+    df_pon = pd.DataFrame({
+        "Unit_Kompetensi": ["Machine Learning"],
+        "Kuk_Keywords": ["Python, SQL, Power BI, membuat REST API, Machine"],
+    })
+    df_lowongan = pd.DataFrame({"Keterampilan_Dibutuhkan": ["ReactJS, NoSQL"]})
+    return build_skill_extractor(df_pon, df_lowongan)
+
+
+def test_aho_corasick_semua_kemunculan():
+    ac = AhoCorasick(["he", "she", "his", "hers"])
+    assert sorted(ac.iter_matches("ushers")) == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+    assert list(ac.iter_matches("xyz")) == []
+
+
+def test_vocabulary_buang_kata_kerja_dan_nama_kanonik():
+    ex = _extractor()
+    assert "rest api" in ex.entries
+    assert ex.entries["power bi"][0] == "Power BI"
+    assert ex.entries["nosql"][1] == {"lowongan"}
+
+
+def test_leftmost_longest_tanpa_tumpang_tindih():
+    counts = _extractor().extract_counts("machine learning dan machine")
+    assert counts == {"Machine Learning": 1, "Machine": 1}
+
+
+def test_kata_utuh_dan_varian_penulisan():
+    counts = _extractor().extract_counts("Ahli nosql, powerbi, react.js. Python, python lagi")
+    assert counts == {"NoSQL": 1, "Power BI": 1, "ReactJS": 1, "Python": 2}
+    assert "SQL" not in counts
+
+
+def test_extract_terbanyak_dulu():
+    hasil = _extractor().extract("python sql python")
+    assert hasil[0] == {"skill": "Python", "jumlah": 2, "sumber": ["pon"]}
+    assert [h["skill"] for h in hasil] == ["Python", "SQL"]
+
+
+def test_split_skill_list():
+    assert split_skill_list("Python (Pandas), Selenium/Cypress, CI/CD dan Git; nan") == [
+        "Python", "Pandas", "Selenium", "Cypress", "CI/CD", "Git",
+    ]
+
+
+def test_skill_variants():
+    assert skill_variants("power bi") == ["power bi", "powerbi", "power.bi"]
+    assert skill_variants("reactjs") == ["reactjs", "react js", "react.js"]
@@ -0,0 +1,49 @@
+import pytest
+
+from text_analyzer import analyze, analyze_bigrams, kata_dasar, stem, tokenize
+
+
+@pytest.mark.parametrize("kata, dasar", [
+    ("diturunkan", "turun"),
+    ("pemrograman", "program"),
+    ("menulis", "tulis"),
+    ("mengelola", "kelola"),
+    ("menyusun", "susun"),
+    ("membangun", "bangun"),
+    ("mendesain", "desain"),
+    ("memakai", "pakai"),
+    ("berbagi", "bagi"),
+    ("belajar", "ajar"),
+    ("bekerja", "kerja"),
+    ("kebutuhan", "butuh"),
+    ("perancangan", "rancang"),
+    ("dianalisis", "analisis"),
+])
+def test_stem_kata_berimbuhan(kata, dasar):
+    assert stem(kata) == dasar
+
+
+@pytest.mark.parametrize("kata", ["server", "selenium", "kubernetes", "sql", "c++", "node.js"])
+def test_stem_istilah_asing_tidak_diubah(kata):
+    assert stem(kata) == kata
+
+
+def test_kamus_tanpa_komentar_file():
+    kamus = kata_dasar()
+    assert {"turun", "program", "kerja"} <= kamus
+    # Kata di header komentar data/kata_dasar_indonesia.txt bukan kata dasar
+    assert not {"diturunkan", "tambahkan", "baris;", "diabaikan.", "#"} & kamus
+
+
+def test_tokenize_stopword_dan_whitelist():
+    assert tokenize("Pengalaman dengan CI/CD, SQL dan Go untuk the web") == [
+        "pengalaman", "ci", "cd", "sql", "go", "web",
+    ]
+    assert tokenize("node.js dan pl/sql") == ["node.js", "pl/sql"]
+
+
+def test_analyze_dan_bigram():
+    assert analyze("membangun aplikasi") == ["bangun", "aplikasi"]
+    assert analyze_bigrams("membangun aplikasi web") == [
+        "bangun", "aplikasi", "web", "bangun aplikasi", "aplikasi web",
+    ]
@@ -0,0 +1,234 @@
+"""
+TEXT ANALYZER INDONESIA + INGGRIS
+Tokenizer bersama untuk index PON, lowongan, dan talenta.
+
+- Stopword Indonesia + Inggris dibuang ("dengan", "untuk", "the", ...)
+- Token teknis pendek tetap dipakai lewat whitelist ("sql", "aws", "go", "ui", "ci")
+- Kata Indonesia di-stem dengan aturan afiks yang divalidasi kamus kata dasar
+  (mis. "pemrograman" -> "program"); kata di luar kamus (istilah Inggris,
+  nama) tidak diubah. Hasil stem di-memo di cache LRU berukuran tetap
+
+Dipakai sebagai `analyzer=` di TfidfVectorizer / HashingVectorizer.
+"""
+
+import re
+from functools import lru_cache
+
+from config import KATA_DASAR_PATH
+from metrics import register_cache
+
+# Ukuran maksimum cache hasil stem
+STEM_CACHE_SIZE = 50_000
+
+# Panjang minimum kata dasar hasil stem
+MIN_STEM = 3
+
+STOPWORDS_ID = frozenset("""
+ada adalah adanya agak agar akan akankah akhir akhirnya aku akulah amat anda andalah
+antar antara apa apabila apakah apalagi atas atau ataukah ataupun bagai bagaimana
+bagaimanakah bagaimanapun bagi bagian bahkan bahwa bahwasanya baik banyak baru
+bawah beberapa begini beginilah begitu begitulah belum benar berapa berbagai
+berikut berikutnya berkali bersama besar betul biasa biasanya bila bilamana bisa
+boleh bukan bukankah bukanlah bukannya cara cukup dahulu dalam dan dapat dari
+daripada datang dekat demi demikian dengan depan di dia diri dirinya dua dulu
+empat enggak entah guna hal hampir hanya hanyalah harus haruslah hingga ia ialah
+ibarat ikut ingin ini inilah itu itulah jadi jangan jauh jika jikalau juga jumlah
+justru kala kalau kalaulah kalaupun kali kami kamilah kamu kan kapan karena
+karenanya kata ke kecil kedua keluar kembali kemudian kenapa kepada ketika
+khususnya kini kita kitalah kurang lagi lain lainnya lalu lama lebih maka
+makin malah mampu mana manakala manalagi masih masing maupun melainkan melalui
+memang mereka merekalah meski meskipun mungkin namun nanti nya oleh olehnya pada
+padahal paling para pasti pernah pula pun punya saat saja sama sambil sampai
+sana sangat satu saya seakan seandainya sebab sebagai sebagaimana sebaiknya
+sebanyak sebelum sebelumnya sebenarnya seberapa sebuah secara sedang sedangkan
+sedikit segala sehingga sejak sekali sekarang sekitar selain selalu selama
+seluruh semakin semua semuanya sendiri seorang seperti sering serta sesuai
+sesuatu setelah setiap siapa sini situ suatu sudah supaya tadi tahu tak tanpa
+tapi telah tentang tentu tersebut tetapi tiap tiga tidak toh turut untuk
+waktu walau walaupun ya yaitu yakni yang
+""".split())
+
+
+@lru_cache(maxsize=1)
+def stopwords():
+    """
+    Stopword Indonesia + Inggris (daftar sklearn).
+    sklearn baru di-import saat pertama dipakai, bukan saat modul di-import.
+    """
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    return STOPWORDS_ID | frozenset(ENGLISH_STOP_WORDS)
+
+
+# Token teknis pendek / bersimbol yang tidak boleh dibuang maupun di-stem
+TECH_WHITELIST = frozenset("""
+ai ml dl nlp cv llm bi etl elt sql nosql db dba aws gcp go r c c++ c# f# .net
+js ts ui ux qa qc ci cd api rest grpc git svn css html php vb ios k8s vm vpn
+lan wan dns tcp ip http https ssl tls ssh seo sem crm erp sap hr it ict iot
+ar vr bim gis os sdk ide orm mvc oop ocr rpa mq ldap saas paas iaas devops
+node.js vue.js react.js next.js d3.js tf pl/sql t-sql dax
+""".split())
+
+_TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#./\-]*")
+_ALPHA_RE = re.compile(r"^[a-z]+$")
+
+
+def _split_token(raw):
+    """Pecah token bersimbol ('ci/cd', 'front-end') kecuali ada di whitelist"""
+    raw = raw.rstrip(".-/")
+    if raw in TECH_WHITELIST:
+        return [raw]
+    raw = raw.lstrip(".")
+    return [p for p in re.split(r"[/\-]", raw) if p]
+
+
+def tokenize(text):
+    """
+    Lowercase -> token -> buang stopword & token pendek non-teknis (tanpa stem).
+    Urutan kemunculan dipertahankan.
+    """
+    stop = stopwords()
+    tokens = []
+    for raw in _TOKEN_RE.findall(str(text).lower()):
+        for tok in _split_token(raw):
+            if tok in TECH_WHITELIST:
+                tokens.append(tok)
+            elif len(tok) >= 3 and tok not in stop and not tok.isdigit():
+                tokens.append(tok)
+    return tokens
+
+
+# ========================================
+# STEMMER INDONESIA (AFIKS + KAMUS KATA DASAR)
+# ========================================
+_PARTIKEL = ("lah", "kah", "tah", "pun")
+_POSESIF = ("nya", "ku", "mu")
+_SUFIKS = ("kan", "an", "i")
+_VOKAL = "aeiou"
+
+# Maksimum awalan bertumpuk (memper-, diper-, keber-, berpe-)
+MAX_AWALAN = 2
+
+
+@lru_cache(maxsize=1)
+def kata_dasar():
+    """
+    Kamus kata dasar: data/kata_dasar_indonesia.txt, ditambah kamus Sastrawi
+    jika paket itu terpasang. Dibaca sekali saat stem pertama dipakai.
+    """
+    kata = set()
+    try:
+        with open(KATA_DASAR_PATH, encoding="utf-8") as f:
+            for baris in f:
+                baris = baris.strip()
+                if baris and not baris.startswith("#"):
+                    kata.add(baris)
+    except OSError:
+        pass
+    try:
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+        kata.update(StemmerFactory().get_words_from_file())
+    except Exception:
+        pass
+    return frozenset(kata)
+
+
+def _tanpa_sufiks(word):
+    """
+    Kandidat kata setelah sufiks dibuang, urut prioritas:
+    partikel -> posesif -> sufiks derivasi, lalu mundur ke bentuk yang lebih utuh.
+    """
+    hasil = []
+    for w1 in (word, *(word[:-len(s)] for s in _PARTIKEL if word.endswith(s))):
+        for w2 in (w1, *(w1[:-len(s)] for s in _POSESIF if w1.endswith(s))):
+            hasil.extend(w2[:-len(s)] for s in _SUFIKS if w2.endswith(s))
+            hasil.append(w2)
+    hasil = sorted(dict.fromkeys(hasil), key=len)
+    return [w for w in hasil if len(w) >= MIN_STEM]
+
+
+def _lepas_awalan(word):
+    """Semua kemungkinan sisa kata setelah satu awalan dibuang (dengan perubahan bunyi)"""
+    hasil = []
+    if word.startswith(("di", "ke", "se")):
+        hasil.append(word[2:])
+    if word.startswith(("ber", "ter", "per")):
+        hasil.append(word[3:])                                 # berbagi -> bagi
+    if word.startswith(("bel", "pel")):
+        hasil.append(word[3:])                                 # belajar -> ajar
+    if word.startswith(("be", "te", "pe")) and word[2:3] not in ("", *_VOKAL):
+        hasil.append(word[2:])                                 # bekerja -> kerja
+    if word.startswith(("me", "pe")):
+        sisa = word[2:]
+        if sisa.startswith("ng"):
+            hasil += [sisa[2:], "k" + sisa[2:]]                # mengukur -> ukur, mengelola -> kelola
+        elif sisa.startswith("ny"):
+            hasil += ["s" + sisa[2:], sisa]                    # menyusun -> susun
+        elif sisa.startswith("n"):
+            if sisa[1:2] in _VOKAL:
+                hasil += ["t" + sisa[1:], sisa]                # menulis -> tulis
+            else:
+                hasil.append(sisa[1:])                         # mendesain -> desain
+        elif sisa.startswith("m"):
+            if sisa[1:2] in _VOKAL or sisa[1:2] == "r":
+                hasil += ["p" + sisa[1:], sisa]                # memakai -> pakai, pemrograman -> program
+            else:
+                hasil.append(sisa[1:])                         # membangun -> bangun
+        elif sisa[:1] in ("l", "r", "w", "y"):
+            hasil.append(sisa)                                 # merawat -> rawat
+    return [h for h in hasil if len(h) >= MIN_STEM]
+
+
+def _cari_dasar(word, kamus, sisa_awalan=MAX_AWALAN):
+    """Kata dasar di kamus yang bisa dicapai dengan membuang awalan, atau None"""
+    for kandidat in _lepas_awalan(word):
+        if kandidat in kamus:
+            return kandidat
+        if sisa_awalan > 1:
+            dasar = _cari_dasar(kandidat, kamus, sisa_awalan - 1)
+            if dasar:
+                return dasar
+    return None
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word):
+    """
+    Stem kata Indonesia yang divalidasi kamus kata dasar (gaya Nazief-Adriani):
+    sufiks dan awalan dicoba dengan backtracking, hasil hanya dipakai jika ada
+    di kamus. Kata yang tidak bisa diturunkan ke kata dasar (istilah Inggris /
+    teknis seperti "server", "selenium", nama orang) dikembalikan apa adanya.
+    """
+    if word in TECH_WHITELIST or len(word) <= MIN_STEM + 1 or not _ALPHA_RE.match(word):
+        return word
+
+    kamus = kata_dasar()
+    if word in kamus:
+        return word
+    kandidat_sufiks = _tanpa_sufiks(word)
+    for kandidat in kandidat_sufiks:
+        if kandidat in kamus:
+            return kandidat
+    for kandidat in kandidat_sufiks:
+        dasar = _cari_dasar(kandidat, kamus)
+        if dasar:
+            return dasar
+    return word
+
+
+def stem_cache_info():
+    """Statistik cache stem (hits, misses, maxsize, currsize)"""
+    return stem.cache_info()
+
+
+register_cache("stem", lambda: stem_cache_info()[:2])
+
+
+def analyze(text):
+    """Analyzer unigram: tokenize + stem"""
+    return [stem(tok) for tok in tokenize(text)]
+
+
+def analyze_bigrams(text):
+    """Analyzer unigram + bigram (untuk LSA)"""
+    stems = analyze(text)
+    return stems + [f"{a} {b}" for a, b in zip(stems, stems[1:])]
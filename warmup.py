@@ -0,0 +1,190 @@
+"""
+WARMUP & ENTRY POINT SERVER
+Siapkan replica sebelum menerima request: import modul berat, isi cache
+sheet workbook, import awal profile store (jika masih kosong), bangun
+index PON & automaton skill, buka koneksi Gemini, lalu jalankan satu
+mapping contoh. Semua di proses yang sama dengan server
+Streamlit, jadi cache per proses sudah terisi saat user pertama datang.
+Health check Streamlit (/_stcore/health) baru hidup setelah warmup selesai.
+
+Waktu import & time-to-first-mapping dicetak, disimpan ke metrik
+(tahap startup.*, terlihat di halaman admin & export Prometheus),
+dan opsional ke JSON.
+
+Pemakaian:
+    python warmup.py                              # warmup lalu streamlit run home.py
+    python warmup.py --metode tfidf hashing       # index yang disiapkan
+    python warmup.py --check --output warmup.json # warmup saja (exit 1 jika gagal)
+    python warmup.py -- --server.port 8502        # argumen setelah -- untuk streamlit run
+Dataset mengikuti EXCEL_PATH (override: DTP_EXCEL_PATH), sama dengan halaman.
+"""
+
+import metrics  # paling awal: titik nol metrics.STARTED_AT
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from datetime import datetime
+
+from config import (
+    EXCEL_PATH, SHEET_HASIL, SHEET_LOWONGAN, SHEET_PEKERJAAN, SHEET_PENDIDIKAN,
+    SHEET_PON, SHEET_SKILL, SHEET_TALENTA
+)
+
+# Dependensi berat yang di-import lazy oleh modul aplikasi
+HEAVY_MODULES = (
+    "pandas", "scipy.sparse", "sklearn.feature_extraction.text",
+    "sklearn.metrics.pairwise", "pypdf", "docx", "requests", "streamlit",
+)
+
+APP_MODULES = ("data_loader", "cv_parser", "pon_index", "skill_extractor", "gemini_client")
+
+SEMUA_SHEET = (
+    SHEET_TALENTA, SHEET_PENDIDIKAN, SHEET_PEKERJAAN, SHEET_SKILL,
+    SHEET_PON, SHEET_LOWONGAN, SHEET_HASIL,
+)
+
+SAMPLE_CV = """Talenta Warmup
+warmup@contoh.id
+Data analyst berpengalaman mengolah data dengan Python, SQL dan Power BI.
+Membangun dashboard dan pipeline ETL, analisis statistik untuk tim bisnis."""
+
+
+def import_modules(modules):
+    """Import berurutan; waktu per modul tidak termasuk dependensi yang sudah termuat (ms)"""
+    hasil = {}
+    for nama in modules:
+        t0 = time.perf_counter()
+        importlib.import_module(nama)
+        hasil[nama] = round((time.perf_counter() - t0) * 1000, 1)
+    return hasil
+
+
+def warmup(file_path=EXCEL_PATH, metode=("tfidf",), gemini=True, modules=HEAVY_MODULES + APP_MODULES, log=print):
+    """
+    Jalankan semua tahap warmup. Tahap yang gagal dicatat, tahap lain tetap jalan.
+    `modules`: modul yang di-import lebih dulu (proses tanpa UI bisa melewatkan streamlit).
+    Return: laporan {imports_ms, steps_ms, errors, time_to_first_mapping_s, ok}
+    """
+    laporan = {"imports_ms": {}, "steps_ms": {}, "errors": {}, "time_to_first_mapping_s": None}
+
+    def step(nama, fn, wajib=True):
+        t0 = time.perf_counter()
+        try:
+            info = fn()
+        except Exception as e:
+            laporan["errors"][nama] = str(e)
+            if not wajib:
+                laporan["errors"][nama] += " (opsional)"
+            log(f"  {nama:<41} GAGAL: {e}")
+            return None
+        ms = (time.perf_counter() - t0) * 1000
+        laporan["steps_ms"][nama] = round(ms, 1)
+        log(f"  {nama:<41} {ms:>9.1f} ms" + (f"  ({info})" if info else ""))
+        return info
+
+    log(f"Warmup dataset: {file_path}")
+
+    # 1. Import
+    t0 = time.perf_counter()
+    laporan["imports_ms"] = import_modules(modules)
+    import_s = time.perf_counter() - t0
+    metrics.record_startup("import", import_s)
+    for nama, ms in laporan["imports_ms"].items():
+        log(f"  import {nama:<34} {ms:>9.1f} ms")
+    log(f"  {'import (total)':<41} {import_s * 1000:>9.1f} ms")
+
+    from cv_parser import extract_profile_entities
+    from data_loader import read_sheet_cached, sheet_memory
+    from gemini_client import warmup as warmup_gemini
+    from pon_index import load_pon_index
+    from profile_store import get_profile_store
+    from skill_extractor import load_skill_extractor
+
+    # 2. Cache data
+    for sheet in SEMUA_SHEET:
+        def baca_sheet(s=sheet):
+            df = read_sheet_cached(file_path, s)
+            return f"{len(df):,} baris, {sheet_memory(df) / 2**20:.1f} MB"
+        step(f"sheet {sheet}", baca_sheet)
+
+    # Import awal profile store: sekali saat store kosong, bukan di request pertama user
+    def import_profil():
+        hasil = get_profile_store().import_if_empty(file_path)
+        return "sudah berisi" if hasil is None else f"{sum(hasil.values()):,} baris diimport"
+    step("profile_store", import_profil)
+
+    # 3. Automaton skill & index PON
+    step("skill_extractor", lambda: f"{len(load_skill_extractor(file_path)):,} skill")
+    for m in metode:
+        step(f"index {m}", lambda m=m: f"{len(load_pon_index(file_path, m).okupasi_ids):,} okupasi")
+
+    # 4. Pool koneksi Gemini (gagal = tidak fatal, mis. replica tanpa akses keluar)
+    if gemini:
+        def buka_koneksi():
+            ok, pesan = warmup_gemini()
+            if not ok:
+                raise RuntimeError(pesan)
+            return pesan
+        step("gemini_pool", buka_koneksi, wajib=False)
+
+    # 5. Mapping pertama (analyzer, cache stem, transform + similarity)
+    def mapping_pertama():
+        index = load_pon_index(file_path, metode[0])
+        okupasi_id, skor = index.search_ids(extract_profile_entities(SAMPLE_CV, file_path), 1)[0]
+        return f"{okupasi_id} skor {skor:.3f}"
+
+    if step("first_mapping", mapping_pertama):
+        laporan["time_to_first_mapping_s"] = round(time.perf_counter() - metrics.STARTED_AT, 3)
+        metrics.record_startup("first_mapping")
+        log(f"  {'time-to-first-mapping':<41} {laporan['time_to_first_mapping_s'] * 1000:>9.1f} ms")
+
+    total = time.perf_counter() - metrics.STARTED_AT
+    metrics.record_startup("warmup", total)
+    laporan["total_s"] = round(total, 3)
+    laporan["ok"] = not any(not e.endswith("(opsional)") for e in laporan["errors"].values())
+    log(f"Warmup {'selesai' if laporan['ok'] else 'SELESAI DENGAN ERROR'} dalam {total:.2f} s")
+    return laporan
+
+
+def run_server(script="home.py", streamlit_args=()):
+    """`streamlit run` di proses ini, supaya cache hasil warmup ikut terpakai"""
+    from streamlit.web import cli
+
+    cli.main(args=["run", script, *streamlit_args], prog_name="streamlit")
+
+
+def main():
+    argv = sys.argv[1:]
+    streamlit_args = []
+    if "--" in argv:
+        pos = argv.index("--")
+        argv, streamlit_args = argv[:pos], argv[pos + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metode", nargs="+", default=["tfidf"], choices=["tfidf", "lsa", "hashing"],
+                        help="Index PON yang disiapkan (default: tfidf)")
+    parser.add_argument("--no-gemini", action="store_true", help="Lewati pembukaan koneksi Gemini")
+    parser.add_argument("--check", action="store_true", help="Warmup & laporan saja, tanpa server")
+    parser.add_argument("--output", help="Simpan laporan JSON ke file ini")
+    parser.add_argument("--script", default="home.py", help="Script Streamlit (default: home.py)")
+    args = parser.parse_args(argv)
+
+    laporan = warmup(EXCEL_PATH, tuple(args.metode), gemini=not args.no_gemini)
+    laporan["timestamp"] = datetime.now().isoformat(timespec="seconds")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(laporan, f, indent=2)
+        print(f"Laporan disimpan ke {args.output}")
+
+    if args.check:
+        sys.exit(0 if laporan["ok"] else 1)
+
+    run_server(args.script, streamlit_args)
+
+
+if __name__ == "__main__":
+    main()